@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""Row JSON vs columnar JSON vs the binary file: time to a usable dataset.
+
+Node runs the page's own loaders (decodeColumns, decodeBinary) on each file
+and the first pass init() makes over every row, and checks the three agree.
+Load and first-pass times are measured here; the last three columns are
+modelled, not measured: --rtt plus the gzip bytes at --mbps, and the
+measured CPU times --cpu-slowdown.
+
+Run:
+  python bench_binary.py
+  python bench_binary.py --size 100000 --mbps 1.6384 --rtt 150 --cpu-slowdown 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+
+import rrf
+from rrf_stub import synthetic_records
+
+NODE_SCRIPT = """
+const fs = require("fs");
+%(loaders)s
+const [repeat, ...paths] = process.argv.slice(2);
+const buffers = paths.map(p => { const b = fs.readFileSync(p); return b.buffer.slice(b.byteOffset, b.byteOffset + b.byteLength); });
+const loaders = [
+  buf => JSON.parse(new TextDecoder().decode(buf)),
+  buf => decodeColumns(JSON.parse(new TextDecoder().decode(buf))),
+  buf => decodeBinary(buf).rows,
+];
+// What init() reads from every row before the first draw.
+function firstPass(rows) {
+  let n = 0;
+  for (const r of rows) {
+    const seen = [r.licensee, r.locationDistrictCodes, r.bandCodes, r.bandCode, r.commencementDate, r.expiryDate];
+    if (Number.isFinite(Number(r.lat)) && Number.isFinite(Number(r.lon)) && seen.length) n++;
+  }
+  return n;
+}
+const out = [];
+let reference = null;
+buffers.forEach((buf, k) => {
+  let load = Infinity, pass = Infinity, rows;
+  for (let i = 0; i < +repeat; i++) {
+    let t0 = process.hrtime.bigint();
+    rows = loaders[k](buf);
+    load = Math.min(load, Number(process.hrtime.bigint() - t0) / 1e6);
+    t0 = process.hrtime.bigint();
+    firstPass(rows);
+    pass = Math.min(pass, Number(process.hrtime.bigint() - t0) / 1e6);
+  }
+  const plain = JSON.parse(JSON.stringify(rows));
+  let same = true;
+  if (reference === null) {
+    reference = plain;
+  } else {
+    same = plain.length === reference.length && plain.every((r, i) => Object.keys(r).every(key =>
+      key === "lat" || key === "lon"
+        ? (r[key] === null) === (reference[i][key] === null) && Math.abs(r[key] - reference[i][key]) < 1e-5
+        : JSON.stringify(r[key]) === JSON.stringify(reference[i][key])));
+  }
+  out.push({ load, pass, same });
+});
+console.log(JSON.stringify(out));
+"""
+
+
+def page_loaders() -> str:
+    """isoDay, decodeColumns, decodeBinary and helpers as the generated page defines them."""
+    html = rrf.build_html()
+    return html[html.index("    // Epoch days -> ") : html.index("    async function loadDataWithFallback(")]
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--size", type=int, default=30000, help="Synthetic licences")
+    ap.add_argument("--mbps", type=float, default=1.6384, help="Modelled downlink, Mbit/s")
+    ap.add_argument("--rtt", type=float, default=150.0, help="Modelled round trip, ms")
+    ap.add_argument("--cpu-slowdown", type=float, default=4.0, help="Modelled phone CPU vs this machine")
+    ap.add_argument("--repeat", type=int, default=5, help="Timings keep the best of N")
+    args = ap.parse_args()
+
+    node = shutil.which("node")
+    if node is None:
+        print("node is needed to run the page's loaders.")
+        return 2
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = [os.path.join(tmp, name) for name in ("rrf_licences.json", "rrf_licences.columns.json", "rrf_licences.bin")]
+        count = rrf.write_json_array(paths[0], rrf.iter_normalised(synthetic_records(args.size)))
+        table, version = rrf.read_table(paths[0]), rrf.file_version(paths[0])
+        rrf.write_columnar(paths[1], table, version)
+        rrf.write_binary(paths[2], table, version)
+
+        script = os.path.join(tmp, "load.js")
+        with open(script, "w", encoding="utf-8") as f:
+            f.write(NODE_SCRIPT % {"loaders": page_loaders()})
+        out = subprocess.run([node, script, str(args.repeat), *paths], capture_output=True, text=True, check=True)
+        timings = json.loads(out.stdout)
+
+        print(
+            f"{count} rows; modelled phone (not measured): {args.rtt:g} ms RTT, {args.mbps:g} Mbit/s, "
+            f"{args.cpu_slowdown:g}x CPU"
+        )
+        print(
+            f"{'format':<9} {'raw':>9} {'gzip':>9} {'load':>8} {'1st pass':>8}"
+            f" {'modelled: transfer':>18} {'cpu':>8} {'total':>8}"
+        )
+        for name, path, t in zip(("rows", "columnar", "binary"), paths, timings):
+            if not t["same"]:
+                print(f"MISMATCH: {name} rows differ from rrf_licences.json")
+                return 1
+            with open(path, "rb") as f:
+                data = f.read()
+            gz = len(gzip.compress(data, compresslevel=6, mtime=0))
+            transfer = args.rtt + gz * 8 / (args.mbps * 1e6) * 1000
+            cpu = (t["load"] + t["pass"]) * args.cpu_slowdown
+            print(
+                f"{name:<9} {len(data) / 2**20:>7.2f}MB {gz / 2**20:>7.2f}MB {t['load']:>6.0f}ms {t['pass']:>6.0f}ms"
+                f" {transfer:>16.0f}ms {cpu:>6.0f}ms {(transfer + cpu) / 1000:>7.2f}s"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""Site clusters: rrf.site_clusters (--clusters-out) against the page's buildClusters.
+
+Spreads each licensee's licences at a site --spacing metres apart, so
+clusters span several spots, then checks that rrf.site_clusters, the page's
+buildClusters and its clustersFromSiteIds over the write_clusters file put
+the same licences together. Also times each of the three (best of --repeat).
+
+Run:
+  python bench_clusters.py
+  python bench_clusters.py --size 100000 --spacing 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+from typing import Any, Dict, FrozenSet, Iterable, List, Set
+
+import rrf
+from rrf_stub import synthetic_records
+
+NODE_SCRIPT = """
+const fs = require("fs");
+let SITE_CLUSTERS = null;
+%(page)s
+const [rowsPath, clustersPath, repeat] = [process.argv[2], process.argv[3], +process.argv[4]];
+// The marker groups refresh() builds from DATA.
+const rows = JSON.parse(fs.readFileSync(rowsPath, "utf8")).filter(r => carrierKeyFromLicensee(r.licensee) !== "uber");
+const groups = new Map();
+for (const r of rows) {
+  const lat = Number(r.lat), lon = Number(r.lon);
+  if (!Number.isFinite(lat) || !Number.isFinite(lon)) continue;
+  const ck = carrierKeyFromLicensee(r.licensee);
+  const key = `${ck}|${lat.toFixed(6)}|${lon.toFixed(6)}`;
+  if (!groups.has(key)) groups.set(key, { key, carrierKey: ck, lat, lon, items: [] });
+  groups.get(key).items.push(r);
+}
+const groupList = [...groups.values()];
+function partition(result) {
+  return result.clusters.map(c => c.items.map(r => r.id));
+}
+function best(fn) {
+  let t = Infinity, out;
+  for (let i = 0; i < repeat; i++) {
+    const t0 = process.hrtime.bigint();
+    out = fn();
+    t = Math.min(t, Number(process.hrtime.bigint() - t0) / 1e6);
+  }
+  return [t, out];
+}
+const [tBuild, built] = best(() => buildClusters(groupList));
+const doc = JSON.parse(fs.readFileSync(clustersPath, "utf8"));
+const [tLoad] = best(() => {
+  const clusterById = new Map();
+  doc.clusters.forEach((ids, index) => ids.forEach(id => clusterById.set(id, index)));
+  SITE_CLUSTERS = clusterById;
+});
+const [tReuse, reused] = best(() => clustersFromSiteIds(groupList));
+console.log(JSON.stringify({
+  groups: groupList.length, build: tBuild, load: tLoad, reuse: tReuse,
+  built: partition(built), reused: partition(reused),
+}));
+"""
+
+
+def page_clustering() -> str:
+    """carrierKeyFromLicensee, safe and the clustering functions as the generated page defines them."""
+    html = rrf.build_html()
+
+    def function(name: str) -> str:
+        start = html.index(f"    function {name}(")
+        return html[start : html.index("\n    }\n", start) + 7]
+
+    clustering = html[html.index("    const GRID_REF_LAT") : html.index("    function renderActiveFilters(")]
+    return function("carrierKeyFromLicensee") + function("safe") + clustering
+
+
+def shared_sites(rows: Iterable[Dict[str, Any]], spacing: float) -> Iterable[Dict[str, Any]]:
+    """Rows with each licensee's licences at a spot moved `spacing` metres apart (west to east)."""
+    licensees: Dict[str, int] = {}
+    for row in rows:
+        if row.get("lat") is not None and row.get("lon") is not None:
+            k = licensees.setdefault(row.get("licensee") or "", len(licensees))
+            row = dict(row, lon=round(row["lon"] + k * spacing / rrf.GRID_METERS_PER_DEG_LON, 7))
+        yield row
+
+
+def as_sets(clusters: List[List[Any]]) -> Set[FrozenSet[Any]]:
+    return {frozenset(ids) for ids in clusters}
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--size", type=int, default=30000, help="Synthetic licences")
+    ap.add_argument("--spacing", type=float, default=15.0, help="Metres between licensees' masts at a site")
+    ap.add_argument("--repeat", type=int, default=5, help="Timings keep the best of N")
+    args = ap.parse_args()
+
+    node = shutil.which("node")
+    if node is None:
+        print("node is needed to run the page's buildClusters.")
+        return 2
+
+    with tempfile.TemporaryDirectory() as tmp:
+        rows_path = os.path.join(tmp, "rrf_licences.json")
+        clusters_path = os.path.join(tmp, "rrf_clusters.json")
+        rows = list(rrf.iter_normalised(synthetic_records(args.size)))
+        count = rrf.write_json_array(rows_path, shared_sites(rows, args.spacing))
+        table = rrf.read_table(rows_path)
+
+        t_python = float("inf")
+        for _ in range(args.repeat):
+            t0 = time.perf_counter()
+            clusters = rrf.site_clusters(table)
+            t_python = min(t_python, time.perf_counter() - t0)
+        t0 = time.perf_counter()
+        doc = rrf.write_clusters(clusters_path, table, rrf.file_version(rows_path))
+        t_write = time.perf_counter() - t0
+
+        script = os.path.join(tmp, "clusters.js")
+        with open(script, "w", encoding="utf-8") as f:
+            f.write(NODE_SCRIPT % {"page": page_clustering()})
+        out = subprocess.run([node, script, rows_path, clusters_path, str(args.repeat)], capture_output=True, text=True, check=True)
+        result = json.loads(out.stdout)
+
+        python_sets = as_sets(clusters)
+        for name in ("built", "reused"):
+            if as_sets(result[name]) != python_sets:
+                print(f"MISMATCH: the page's {name} clusters differ from site_clusters")
+                return 1
+
+        multi = len(doc["clusters"])
+        print(
+            f"{count} rows, {result['groups']} marker groups, {len(clusters)} site clusters "
+            f"({multi} spanning several spots); all three agree"
+        )
+        print(f"{os.path.getsize(clusters_path) / 1024:.0f}KB rrf_clusters.json, written in {t_write:.2f}s")
+        print(f"python site_clusters (build, once)      {t_python * 1000:>7.0f}ms")
+        print(f"page buildClusters (every refresh)      {result['build']:>7.1f}ms")
+        print(f"page clusters file -> map (once)        {result['load']:>7.1f}ms")
+        print(f"page clustersFromSiteIds (every refresh){result['reuse']:>7.1f}ms")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""Row JSON vs columnar JSON (--columnar-out): size, download and parse time.
+
+Checks the columnar file decodes back to rrf_licences.json's rows, then
+reports each file's raw and gzip size, the gzip transfer time at each of
+--links Mbit/s, and parse time: JSON.parse in node (plus the page's
+decodeColumns for the columnar file) and json.loads.
+
+Run:
+  python bench_columnar.py
+  python bench_columnar.py --size 100000 --links 5,20,100
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+from typing import Dict, Optional
+
+import rrf
+from rrf_stub import synthetic_records
+
+NODE_SCRIPT = """
+const fs = require("fs");
+%(decoder)s
+const [path, columnar, repeat] = [process.argv[2], process.argv[3] === "1", +process.argv[4]];
+const text = fs.readFileSync(path, "utf8");
+let parse = Infinity, decode = Infinity, rows = 0;
+for (let i = 0; i < repeat; i++) {
+  let t0 = process.hrtime.bigint();
+  const obj = JSON.parse(text);
+  parse = Math.min(parse, Number(process.hrtime.bigint() - t0) / 1e6);
+  if (columnar) {
+    t0 = process.hrtime.bigint();
+    rows = decodeColumns(obj).length;
+    decode = Math.min(decode, Number(process.hrtime.bigint() - t0) / 1e6);
+  } else {
+    rows = obj.length;
+  }
+}
+console.log(JSON.stringify({ parse, decode: columnar ? decode : 0, rows }));
+"""
+
+
+def page_decoder() -> str:
+    """decodeColumns and its helpers as the generated page defines them."""
+    html = rrf.build_html()
+    start = html.index("    // Epoch days -> ")  # isoDay, which decodeColumn uses
+    end = html.index("    async function loadDataWithFallback(")
+    return html[start:end]
+
+
+def node_times(path: str, columnar: bool, repeat: int, script: str) -> Optional[Dict[str, float]]:
+    node = shutil.which("node")
+    if node is None:
+        return None
+    out = subprocess.run(
+        [node, script, path, "1" if columnar else "0", str(repeat)], capture_output=True, text=True, check=True
+    )
+    return json.loads(out.stdout)
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--size", type=int, default=30000, help="Synthetic licences")
+    ap.add_argument("--links", default="5,20,100", help="Comma-separated link speeds in Mbit/s")
+    ap.add_argument("--repeat", type=int, default=5, help="Parse timings keep the best of N")
+    args = ap.parse_args()
+    links = [float(s) for s in args.links.split(",") if s.strip()]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        rows_path = os.path.join(tmp, "rrf_licences.json")
+        cols_path = os.path.join(tmp, "rrf_licences.columns.json")
+        count = rrf.write_json_array(rows_path, rrf.iter_normalised(synthetic_records(args.size)))
+        t0 = time.perf_counter()
+        rrf.write_columnar(cols_path, rrf.read_table(rows_path), rrf.file_version(rows_path))
+        t_write = time.perf_counter() - t0
+
+        with open(cols_path, "r", encoding="utf-8") as f:
+            decoded = list(rrf.decode_columns(json.load(f)))
+        if decoded != rrf.read_json(rows_path):
+            print("MISMATCH: columnar file does not decode to the rows")
+            return 1
+
+        script = os.path.join(tmp, "parse.js")
+        with open(script, "w", encoding="utf-8") as f:
+            f.write(NODE_SCRIPT % {"decoder": page_decoder()})
+
+        print(f"{count} rows; columnar file written in {t_write:.2f}s")
+        header = f"{'format':<9} {'raw':>9} {'gzip':>9}"
+        header += "".join(f" {f'@{link:g}Mbit/s':>11}" for link in links)
+        header += f" {'JSON.parse':>10} {'decode':>8} {'json.loads':>10}"
+        print(header)
+        for name, path, columnar in (("rows", rows_path, False), ("columnar", cols_path, True)):
+            with open(path, "rb") as f:
+                data = f.read()
+            gz = len(gzip.compress(data, compresslevel=6, mtime=0))
+            best = float("inf")
+            for _ in range(args.repeat):
+                t0 = time.perf_counter()
+                json.loads(data)
+                best = min(best, time.perf_counter() - t0)
+            node = node_times(path, columnar, args.repeat, script)
+            line = f"{name:<9} {len(data) / 2**20:>7.2f}MB {gz / 2**20:>7.2f}MB"
+            line += "".join(f" {gz * 8 / (link * 1e6) * 1000:>9.0f}ms" for link in links)
+            if node is None:
+                line += f" {'(no node)':>10} {'':>8}"
+            else:
+                line += f" {node['parse']:>8.0f}ms {node['decode']:>6.0f}ms"
+            line += f" {best * 1000:>8.0f}ms"
+            print(line)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""Delta patches vs full downloads for a returning visitor.
+
+Simulates --days daily runs, each adding, changing and removing a few
+licences, and writes rrf_licences.json and rrf_delta/ as `rrf.py --fetch`
+does. Per day it reports the manifest plus delta a visitor from the day
+before downloads against the full file, raw and gzipped, and checks that
+patching the previous day's rows gives the new file.
+
+Run:
+  python bench_delta.py
+  python bench_delta.py --size 100000 --days 7 --churn 0.002
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import json
+import os
+import random
+import tempfile
+import time
+from typing import Any, Dict, List
+
+import rrf
+from rrf_stub import synthetic_records
+
+
+def next_day(records: List[Dict[str, Any]], churn: float, rnd: random.Random, day: int) -> List[Dict[str, Any]]:
+    """A copy of `records` with about `churn` of them changed, as many added, half as many removed and a few moved."""
+    n = max(1, int(len(records) * churn))
+    out = [dict(r) for r in records]
+    for r in rnd.sample(out, n):
+        r["lastUpdatedDate"] = f"2026-01-{day:02d}T09:30:00"
+        r["licenceStatus"] = rnd.choice(["Current", "Expired", "Cancelled"])
+    gone = set(rnd.sample(range(len(out)), n // 2))
+    out = [r for i, r in enumerate(out) if i not in gone]
+    for _ in range(max(1, n // 10)):
+        out.insert(rnd.randrange(len(out)), out.pop(rnd.randrange(len(out))))
+    top = max(r["id"] for r in out)
+    fresh = [dict(r, id=top + n - k, licenceNo=f"N{day}-{k}") for k, r in enumerate(rnd.sample(out, n))]
+    return fresh + out
+
+
+def gz(data: bytes) -> int:
+    return len(gzip.compress(data, mtime=0))
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--size", type=int, default=30000, help="Licences on day 0")
+    ap.add_argument("--days", type=int, default=5)
+    ap.add_argument("--churn", type=float, default=0.001, help="Fraction of licences changed per day")
+    ap.add_argument("--seed", type=int, default=1)
+    args = ap.parse_args()
+
+    rnd = random.Random(args.seed)
+    records = synthetic_records(args.size)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "rrf_licences.json")
+        delta_dir = os.path.join(tmp, "rrf_delta")
+        count = rrf.write_json_array(path, rrf.iter_normalised(records))
+        rrf.write_delta(delta_dir, path, count, None)
+
+        print(f"{'day':>3}  {'rows':>6}  {'+/~/-':>14}  {'full':>9}  {'full gz':>9}  {'delta+manifest':>14}  {'gz':>8}  {'saved':>6}  {'diff s':>6}")
+        for day in range(1, args.days + 1):
+            previous = rrf.read_json(path)
+            records = next_day(records, args.churn, rnd, day)
+            t0 = time.perf_counter()
+            before = rrf.snapshot_rows(path)
+            seconds = time.perf_counter() - t0
+            count = rrf.write_json_array(path, rrf.iter_normalised(records))
+            t0 = time.perf_counter()
+            entry = rrf.write_delta(delta_dir, path, count, before)
+            seconds += time.perf_counter() - t0
+            if entry is None:
+                print(f"{day:>3}  unchanged")
+                continue
+
+            with open(path, "rb") as f:
+                full = f.read()
+            with open(os.path.join(delta_dir, entry["path"]), "rb") as f:
+                delta = f.read()
+            with open(os.path.join(delta_dir, "manifest.json"), "rb") as f:
+                manifest = f.read()
+            if rrf.apply_delta(previous, json.loads(delta)) != json.loads(full):
+                print(f"MISMATCH: patched rows differ from the day {day} file")
+                return 1
+
+            sent, sent_gz = len(delta) + len(manifest), gz(delta) + gz(manifest)
+            change = f"{entry['added']}/{entry['changed']}/{entry['removed']}"
+            print(
+                f"{day:>3}  {count:>6}  {change:>14}  {len(full) / 1024:>7.0f}KB  {gz(full) / 1024:>7.0f}KB"
+                f"  {sent / 1024:>12.1f}KB  {sent_gz / 1024:>6.1f}KB  {gz(full) / sent_gz:>5.0f}x  {seconds:>6.2f}"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""Coordinate cache (--geo-cache): hit rate and measured time saved.
+
+Times normalisation without a cache, with an empty one (day 1) and with day
+1's saved cache after --churn of the licences moved to new sites (day 2),
+and checks all give the same rows. The saved column is measured against the
+uncached run; the summary is TransformCache.summary(), as rrf.py prints it.
+
+Run:
+  python bench_geo_cache.py
+  python bench_geo_cache.py --size 100000 --churn 0.05 --transform builtin
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import rrf
+from rrf_stub import synthetic_records
+
+
+def normalise(
+    records: List[Dict[str, Any]], cache: Optional[rrf.TransformCache], mode: str
+) -> Tuple[float, List[Dict[str, Any]]]:
+    t0 = time.perf_counter()
+    rows = rrf.normalise_records(records, cache=cache, mode=mode)
+    return time.perf_counter() - t0, rows
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--size", type=int, default=50000, help="Synthetic licences")
+    ap.add_argument("--churn", type=float, default=0.02, help="Share of licences at new sites on the warm run")
+    ap.add_argument("--transform", choices=rrf.TRANSFORM_MODES, default="auto")
+    args = ap.parse_args()
+
+    first = synthetic_records(args.size)
+    # Another seed puts licences at sites the first run never saw.
+    n = int(len(first) * args.churn)
+    second = synthetic_records(n, seed=2) + first[n:] if n else first
+
+    print(f"{args.size} licences, {rrf.resolve_transform_mode(args.transform)} transforms, {n} at new sites on day 2")
+    print(f"{'run':<16} {'time':>8} {'saved':>8}  summary")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "geo_cache.json.gz")
+        for day, records in (("day 1", first), ("day 2", second)):
+            t_plain, expected = normalise(records, None, args.transform)
+            cache = rrf.TransformCache()
+            cache.load(path)  # nothing there yet on day 1
+            label = "warm" if cache.loaded else "cold"
+            t_cached, rows = normalise(records, cache, args.transform)
+            if rows != expected:
+                print(f"MISMATCH: {day} rows differ with the cache")
+                return 1
+            cache.save(path)
+            print(f"{day} {'no cache':<10} {t_plain:>7.2f}s")
+            print(
+                f"{day} {label:<10} {t_cached:>7.2f}s {t_plain - t_cached:>+7.2f}s  {cache.summary()}"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""Multi licence-type fetch (--licence-type A B): every page of every type.
+
+Runs `rrf.py --fetch --licence-type 178 179` against rrf_stub with fixed,
+concurrent and auto page sizes, and checks rrf_licences.json holds exactly
+the non-RCV licences the stub serves for both types, in id order, as one
+type at a time would. Exits non-zero on a mismatch.
+
+Run:
+  python bench_licence_types.py
+  python bench_licence_types.py --items 20000 --page-size 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from typing import List
+
+import rrf
+from rrf_stub import API_PATH, StubConfig, serve
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+TYPES = (178, 179)
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--items", type=int, default=6000, help="Synthetic licences per type")
+    ap.add_argument("--page-size", type=int, default=1000)
+    args = ap.parse_args()
+
+    cfg = StubConfig(records=None, items=args.items)
+    expected = sorted(
+        (r["id"] for t in TYPES for r in cfg.dataset([t]) if (r.get("configType") or "").upper() != "RCV"),
+        reverse=True,
+    )
+    server = serve(cfg, port=0)
+    url = f"http://127.0.0.1:{server.server_address[1]}{API_PATH}"
+    runs: List[List[str]] = [
+        ["--page-size", str(args.page_size)],
+        ["--page-size", str(args.page_size), "--concurrency", "2"],
+        ["--page-size", "auto"],
+    ]
+    print(f"{len(TYPES)} types x {args.items} licences, {len(expected)} expected rows")
+    try:
+        for extra in runs:
+            with tempfile.TemporaryDirectory() as tmp:
+                cmd = [
+                    sys.executable, os.path.join(HERE, "rrf.py"), "--fetch", "--api-url", url,
+                    "--licence-type", *map(str, TYPES), "--geo-cache", "",
+                    "--no-precompress", *extra,
+                ]
+                t0 = time.perf_counter()
+                subprocess.run(cmd, cwd=tmp, check=True, stdout=subprocess.DEVNULL)
+                wall = time.perf_counter() - t0
+                ids = [r["id"] for r in rrf.iter_json_array(os.path.join(tmp, "rrf_licences.json"))]
+            label = " ".join(extra)
+            if ids != expected:
+                print(f"MISMATCH: {label}: {len(ids)} rows, expected {len(expected)}")
+                return 1
+            print(f"{label:<32} {len(ids):>7} rows {wall:>6.1f}s")
+    finally:
+        server.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
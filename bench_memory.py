@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""Streaming fetch -> normalise -> write: peak RSS as the page count grows.
+
+Serves synthetic licences from rrf_stub on a free port and, for each size,
+runs `rrf.py --fetch` against it in a child process, reading the child's
+peak RSS from os.wait4. For comparison the same fetch also runs the
+pre-streaming way in a child: fetch_all into one list, normalise_records
+into a second, then json.dump(indent=2). The streamed run should stay
+roughly flat while the whole-list run grows with the data.
+
+A third run adds the outputs the daily build writes (--columnar-out,
+--binary-out, --tile-dir, --clusters-out). Those are built from the whole
+file read back as a LicenceTable, so that run grows with the data, at a
+fraction of the whole-list cost.
+
+The streamed runs have the coordinate cache off (--geo-cache ''), since that
+LRU grows with the sites seen up to --geo-cache-size, whatever the page count.
+
+Needs a Unix (os.wait4 / ru_maxrss).
+
+Run:
+  python bench_memory.py
+  python bench_memory.py --sizes 10000,50000,200000 --page-size 5000
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from typing import List, Tuple
+
+from rrf_stub import API_PATH, StubConfig, serve
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+WHOLE_LISTS = """
+import json, sys
+sys.path.insert(0, sys.argv[1])
+import rrf
+payload = {"searchText": "", "suppressed": False, "orderBy": "id desc", "licenceType": [178]}
+records = rrf.fetch_all(payload, int(sys.argv[3]), api_url=sys.argv[2])
+rows = rrf.normalise_records(records)
+with open(sys.argv[4], "w", encoding="utf-8") as f:
+    json.dump(rows, f, ensure_ascii=False, indent=2)
+"""
+
+
+def peak_rss(cmd: List[str], cwd: str) -> Tuple[float, float]:
+    """(peak RSS in MB, wall seconds) of one child process."""
+    t0 = time.perf_counter()
+    proc = subprocess.Popen(cmd, cwd=cwd, stdout=subprocess.DEVNULL)
+    _, status, usage = os.wait4(proc.pid, 0)
+    proc.returncode = os.waitstatus_to_exitcode(status)
+    if proc.returncode:
+        raise RuntimeError(f"{' '.join(cmd[:3])} ... exited with {proc.returncode}")
+    # ru_maxrss is in KB on Linux and bytes on macOS.
+    scale = 1 if sys.platform == "darwin" else 1024
+    return usage.ru_maxrss * scale / 2**20, time.perf_counter() - t0
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sizes", default="10000,40000,160000", help="Comma-separated licence counts")
+    ap.add_argument("--page-size", type=int, default=2000)
+    args = ap.parse_args()
+
+    print(f"{'licences':>9} {'pages':>6} {'streamed':>10} {'+outputs':>10} {'whole lists':>12}")
+    streamed: List[float] = []
+    for size in [int(s) for s in args.sizes.split(",") if s.strip()]:
+        server = serve(StubConfig(records=None, items=size), port=0)
+        url = f"http://127.0.0.1:{server.server_address[1]}{API_PATH}"
+        try:
+            with tempfile.TemporaryDirectory() as tmp:
+                fetch = [
+                    sys.executable, os.path.join(HERE, "rrf.py"), "--fetch",
+                    "--api-url", url, "--page-size", str(args.page_size),
+                    "--raw-dir", "", "--geo-cache", "",
+                    "--json-out", "rrf_licences.json", "--html-out", "index.html",
+                ]
+                rss, wall = peak_rss(fetch, tmp)
+                outputs, _ = peak_rss(
+                    fetch + [
+                        "--columnar-out", "rrf_licences.columns.json", "--binary-out", "rrf_licences.bin",
+                        "--tile-dir", "rrf_tiles", "--clusters-out", "rrf_clusters.json",
+                    ],
+                    tmp,
+                )
+                whole, whole_wall = peak_rss(
+                    [sys.executable, "-c", WHOLE_LISTS, HERE, url, str(args.page_size), "whole.json"], tmp
+                )
+        finally:
+            server.shutdown()
+        streamed.append(rss)
+        pages = -(-size // args.page_size)
+        print(
+            f"{size:>9} {pages:>6} {rss:>8.0f}MB {outputs:>8.0f}MB {whole:>10.0f}MB"
+            f"   ({wall:.1f}s / {whole_wall:.1f}s)"
+        )
+    if len(streamed) > 1:
+        print(f"streamed peak grew {streamed[-1] - streamed[0]:+.0f}MB from the smallest to the largest run")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""NDJSON stream (--ndjson-out): bytes before the first markers vs a whole file.
+
+Checks the stream holds rrf_licences.json's rows (each line's index puts its
+row back in place) with districts in NDJSON_DISTRICT_ORDER, then reports the
+gzip bytes the page needs before it can draw: the whole file, or the stream
+up to its first --batch rows and up to each of the busiest districts. Byte
+counts are measured; the transfer column is modelled, not measured: --rtt
+plus those bytes at --mbps.
+
+Run:
+  python bench_ndjson.py
+  python bench_ndjson.py --size 100000 --batch 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import json
+import os
+import tempfile
+from typing import Dict, List
+
+import rrf
+from rrf_stub import synthetic_records
+
+
+def gz_size(data: bytes) -> int:
+    return len(gzip.compress(data, compresslevel=6, mtime=0))
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--size", type=int, default=30000, help="Synthetic licences")
+    ap.add_argument("--batch", type=int, default=1000, help="Rows in the first drawn batch")
+    ap.add_argument("--districts", type=int, default=4, help="Busiest districts to time")
+    ap.add_argument("--mbps", type=float, default=1.6384, help="Modelled downlink, Mbit/s")
+    ap.add_argument("--rtt", type=float, default=150.0, help="Modelled round trip, ms")
+    args = ap.parse_args()
+
+    def transfer_ms(gz: int) -> float:
+        return args.rtt + gz * 8 / (args.mbps * 1e6) * 1000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        rows_path = os.path.join(tmp, "rrf_licences.json")
+        cols_path = os.path.join(tmp, "rrf_licences.columns.json")
+        ndjson_path = os.path.join(tmp, "rrf_licences.ndjson")
+        count = rrf.write_json_array(rows_path, rrf.iter_normalised(synthetic_records(args.size)))
+        table, version = rrf.read_table(rows_path), rrf.file_version(rows_path)
+        rrf.write_columnar(cols_path, table, version)
+        rrf.write_ndjson(ndjson_path, table, version)
+
+        with open(ndjson_path, "rb") as f:
+            lines = f.read().splitlines(keepends=True)
+        header = json.loads(lines[0])
+        indexed = [json.loads(line) for line in lines[1:]]
+        streamed = [row for _, row in indexed]
+        in_file_order: List[dict] = [{}] * header["rows"]
+        for index, row in indexed:
+            in_file_order[index] = row
+        if header["rows"] != count or in_file_order != rrf.read_json(rows_path):
+            print("MISMATCH: the stream's rows by index are not rrf_licences.json")
+            return 1
+        firsts = [rrf.shard_key(r) for r in streamed]
+        rank = {code: i for i, code in enumerate(rrf.NDJSON_DISTRICT_ORDER)}
+        ranks = [rank.get(code, len(rank)) for code in firsts]
+        if ranks != sorted(ranks):
+            print("MISMATCH: the stream's districts are not in NDJSON_DISTRICT_ORDER")
+            return 1
+
+        # Line index after which each district's last row has arrived.
+        last_line: Dict[str, int] = {}
+        for i, code in enumerate(firsts):
+            last_line[code] = i + 1
+        order: List[str] = list(dict.fromkeys(firsts))
+
+        def prefix_gz(rows: int) -> int:
+            return gz_size(b"".join(lines[: rows + 1]))
+
+        print(f"{count} rows; modelled phone link (not measured): {args.rtt:g} ms RTT, {args.mbps:g} Mbit/s")
+        print(f"{'first markers after':<28} {'rows':>6} {'gzip':>8} {'modelled':>9}")
+        for name, path in (("rrf_licences.json", rows_path), ("rrf_licences.columns.json", cols_path)):
+            with open(path, "rb") as f:
+                gz = gz_size(f.read())
+            print(f"{name:<28} {count:>6} {gz / 1024:>6.0f}KB {transfer_ms(gz):>7.0f}ms")
+        batch = min(args.batch, len(streamed))
+        gz = prefix_gz(batch)
+        print(f"{'rrf_licences.ndjson batch 1':<28} {batch:>6} {gz / 1024:>6.0f}KB {transfer_ms(gz):>7.0f}ms")
+        for code in order[: args.districts]:
+            gz = prefix_gz(last_line[code])
+            label = f"  ... {code} complete"
+            print(f"{label:<28} {last_line[code]:>6} {gz / 1024:>6.0f}KB {transfer_ms(gz):>7.0f}ms")
+        gz = gz_size(b"".join(lines))
+        print(f"{'  ... all rows':<28} {count:>6} {gz / 1024:>6.0f}KB {transfer_ms(gz):>7.0f}ms")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""Normalisation: time per size, and scaling with --workers.
+
+Times coordinate resolution alone and full normalisation at each size, each
+the best of --repeat, run in turn so neither gets a warmer run.
+
+Run:
+  python bench_normalise.py                       # 10k, 100k, 1M
+  python bench_normalise.py --sizes 10000,50000 --transform builtin
+  python bench_normalise.py --sizes 1000000 --workers 8   # process-pool scaling
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import hashlib
+import itertools
+import os
+import tempfile
+import time
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Tuple
+
+import rrf
+from rrf_stub import synthetic_records
+
+
+def resolve_geo(records: Iterable[Dict[str, Any]], mode: str) -> Iterator[Any]:
+    transformers = rrf.build_transformers(mode=mode)
+    for r in records:
+        yield rrf.pick_lat_lon(r.get("locationGeoReferences") or [], *transformers)
+
+
+def best_of(repeat: int, *fns: Callable[[], Iterator[Any]]) -> List[Tuple[int, float]]:
+    """(items, best seconds) per function, running them in turn `repeat` times."""
+    best = [(0, float("inf"))] * len(fns)
+    for _ in range(repeat):
+        for k, fn in enumerate(fns):
+            gc.collect()
+            t0 = time.perf_counter()
+            n = sum(1 for _ in fn())
+            best[k] = (n, min(best[k][1], time.perf_counter() - t0))
+    return best
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sizes", default="10000,100000,1000000", help="Comma-separated record counts")
+    ap.add_argument("--base", type=int, default=50000, help="Distinct synthetic records to cycle")
+    ap.add_argument("--batch-size", type=int, default=rrf.NORMALISE_BATCH)
+    ap.add_argument("--transform", choices=rrf.TRANSFORM_MODES, default="auto")
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument(
+        "--workers",
+        type=int,
+        default=0,
+        help="Also time normalise+write with --workers 1..N on the largest size (default: skip)",
+    )
+    args = ap.parse_args()
+
+    print(f"Transforms: {rrf.resolve_transform_mode(args.transform)}, best of {args.repeat}")
+    base = synthetic_records(args.base)
+
+    print(f"{'records':>9}  {'geo':>8}  {'normalise':>9}  {'us/record':>9}")
+    for size in (int(s) for s in args.sizes.split(",") if s.strip()):
+        def records() -> Iterator[Dict[str, Any]]:
+            return itertools.islice(itertools.cycle(base), size)
+
+        (_, t_geo), (_, t_norm) = best_of(
+            args.repeat,
+            lambda: resolve_geo(records(), args.transform),
+            lambda: rrf.iter_normalised(records(), batch_size=args.batch_size, mode=args.transform),
+        )
+        print(f"{size:>9}  {t_geo:>7.2f}s  {t_norm:>8.2f}s  {1e6 * t_norm / size:>9.2f}")
+
+    if args.workers:
+        # Normalise + render + write, as `rrf.py --fetch --workers N` does.
+        size = max(int(s) for s in args.sizes.split(",") if s.strip())
+        print(f"\nnormalise+write {size} records with --workers N ({os.cpu_count()} CPUs here)")
+        print(f"{'workers':>9}  {'wall':>8}  {'main cpu':>8}  speed-up")
+        with tempfile.TemporaryDirectory() as tmp:
+            expected = None
+            t_one = None
+            for workers in range(1, args.workers + 1):
+                path = os.path.join(tmp, f"w{workers}.json")
+                rows = rrf.iter_normalised(
+                    itertools.islice(itertools.cycle(base), size),
+                    batch_size=args.batch_size,
+                    mode=args.transform,
+                    workers=workers,
+                    render=True,
+                )
+                t0, c0 = time.perf_counter(), time.process_time()
+                rrf.write_json_array(path, rows)
+                wall, cpu = time.perf_counter() - t0, time.process_time() - c0
+                with open(path, "rb") as f:
+                    digest = hashlib.sha1(f.read()).hexdigest()
+                if expected is None:
+                    expected = digest
+                elif digest != expected:
+                    print(f"MISMATCH: {workers} workers wrote different bytes")
+                    return 1
+                t_one = t_one or wall
+                print(f"{workers:>9}  {wall:>7.2f}s  {cpu:>7.2f}s  {t_one / wall:.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""Row reuse between runs: normalise only new or changed licences.
+
+Writes rrf_licences.json with its .digests and .stamp as `rrf.py --fetch`
+does, then runs a day later with --churn of the licences changed. Half of
+those get a new lastUpdatedDate; the rest keep theirs and change only their
+licenceStatus, suppressed flag or geo-reference, as the register sometimes
+does. It times the second run with and without reuse, checks both write the
+same file, and checks that every changed licence was normalised again
+rather than reused.
+
+Run:
+  python bench_reuse.py
+  python bench_reuse.py --size 150000 --churn 0.01
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import tempfile
+import time
+from typing import Any, Dict, List, Optional
+
+import rrf
+from rrf_stub import synthetic_records
+
+
+def run(path: str, records: List[Dict[str, Any]], mode: str, reuse: bool) -> Optional[rrf.PreviousRows]:
+    """One run's normalise and write, as main does it; returns the PreviousRows it reused from."""
+    tag = rrf.normaliser_tag(rrf.resolve_transform_mode(mode))
+    previous = rrf.PreviousRows(path) if reuse and rrf.rows_stamp_matches(path, tag) else None
+    digests = rrf.RowDigestWriter(path)
+    rows = rrf.iter_normalised(records, mode=mode, render=True, previous=previous, digests=digests)
+    rrf.write_json_array(path, rows)
+    digests.commit()
+    rrf.write_rows_stamp(path, tag)
+    return previous
+
+
+def next_day(records: List[Dict[str, Any]], churn: float, rnd: random.Random) -> Dict[str, List[int]]:
+    """Changes about `churn` of the non-RCV records in place; returns the indices changed, by kind."""
+    rows = [i for i, r in enumerate(records) if (r.get("configType") or "").upper() != "RCV"]
+    picked = rnd.sample(rows, max(4, int(len(rows) * churn)))
+    kinds: Dict[str, List[int]] = {"date": [], "status": [], "suppressed": [], "geo": []}
+    for k, i in enumerate(picked):
+        r = records[i]
+        kind = "date" if k % 2 == 0 else ("status", "suppressed", "geo")[k // 2 % 3]
+        if kind == "date":
+            r["lastUpdatedDate"] = "2026-02-01T09:30:00"
+            r["licenceStatus"] = "Expired"
+        elif kind == "status":
+            r["licenceStatus"] = "Cancelled"
+        elif kind == "suppressed":
+            r["suppressed"] = not r["suppressed"]
+        else:
+            r["locationGeoReferences"] = [dict(g, easting=g["easting"] + 0.01) for g in r["locationGeoReferences"]]
+        kinds[kind].append(i)
+    return kinds
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--size", type=int, default=30000, help="Synthetic licences")
+    ap.add_argument("--churn", type=float, default=0.01, help="Fraction of licences changed on day 1")
+    ap.add_argument("--transform", default="auto", choices=["auto", "pyproj", "builtin", "none"])
+    ap.add_argument("--seed", type=int, default=1)
+    args = ap.parse_args()
+
+    engine = rrf.resolve_transform_mode(args.transform)
+    records = synthetic_records(args.size)
+    with tempfile.TemporaryDirectory() as tmp:
+        reused_path = os.path.join(tmp, "reused", "rrf_licences.json")
+        fresh_path = os.path.join(tmp, "fresh", "rrf_licences.json")
+        for path in (reused_path, fresh_path):
+            os.makedirs(os.path.dirname(path))
+        run(reused_path, records, args.transform, reuse=False)
+
+        kinds = next_day(records, args.churn, random.Random(args.seed))
+        t0 = time.perf_counter()
+        run(fresh_path, records, args.transform, reuse=False)
+        t_fresh = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        previous = run(reused_path, records, args.transform, reuse=True)
+        t_reused = time.perf_counter() - t0
+
+        if previous is None or previous.stopped:
+            print("MISMATCH: the second run did not reuse rows")
+            return 1
+        with open(reused_path, "rb") as f, open(fresh_path, "rb") as g:
+            if f.read() != g.read():
+                print("MISMATCH: reusing rows wrote a different file than normalising every record")
+                return 1
+        changed = sum(len(v) for v in kinds.values())
+        if (previous.changed, previous.added, previous.removed) != (changed, 0, 0):
+            print(
+                f"MISMATCH: {changed} licences changed, but reuse counted {previous.changed} changed, "
+                f"{previous.added} added and {previous.removed} removed"
+            )
+            return 1
+
+        rows = previous.reused + previous.changed
+        print(
+            f"{rows} rows, {changed} changed ("
+            + ", ".join(f"{len(v)} {k}" for k, v in kinds.items())
+            + f"); engine {engine}"
+        )
+        print(f"normalise every record  {t_fresh:6.2f}s")
+        print(f"reuse unchanged rows    {t_reused:6.2f}s  ({previous.reused} reused)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""District shards (--shard-dir): what the page fetches for a given map view.
+
+Checks the shards decode back to rrf_licences.json's rows. Then, for a few
+--width x --height phone views, it picks the shards loadShards would fetch
+(bounding box meets the view padded by 25%) and compares their gzip bytes
+with the whole columnar file. Views are sized in Web Mercator degrees, so
+they are only roughly right away from the equator.
+
+Run:
+  python bench_shards.py
+  python bench_shards.py --size 100000 --mbps 1.6384
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import json
+import math
+import os
+import tempfile
+from typing import List, Tuple
+
+import rrf
+from rrf_stub import synthetic_records
+
+VIEWS = [
+    ("Auckland", -36.85, 174.76, 10),
+    ("Wellington", -41.29, 174.78, 11),
+    ("Christchurch", -43.53, 172.64, 9),
+    ("Southland", -46.2, 168.4, 8),
+    ("New Zealand", -41.2, 174.7, 5),
+]
+
+
+def view_box(lat: float, lon: float, zoom: int, width: int, height: int) -> Tuple[float, float, float, float]:
+    """[south, west, north, east] of the view, padded by 25% on each side like loadShards."""
+    per_px = 360.0 / (256 * 2**zoom)
+    half_w = width * per_px / 2 * 1.5
+    half_h = height * per_px * math.cos(math.radians(lat)) / 2 * 1.5
+    return lat - half_h, lon - half_w, lat + half_h, lon + half_w
+
+
+def intersects(a: List[float], b: Tuple[float, float, float, float]) -> bool:
+    return a[0] <= b[2] and b[0] <= a[2] and a[1] <= b[3] and b[1] <= a[3]
+
+
+def gz(path: str) -> int:
+    with open(path, "rb") as f:
+        return len(gzip.compress(f.read(), compresslevel=6, mtime=0))
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--size", type=int, default=30000, help="Synthetic licences")
+    ap.add_argument("--width", type=int, default=412, help="View width in CSS pixels")
+    ap.add_argument("--height", type=int, default=823, help="View height in CSS pixels")
+    ap.add_argument("--mbps", type=float, default=1.6384, help="Modelled downlink, Mbit/s")
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        rows_path = os.path.join(tmp, "rrf_licences.json")
+        cols_path = os.path.join(tmp, "rrf_licences.columns.json")
+        shard_dir = os.path.join(tmp, "rrf_shards")
+        count = rrf.write_json_array(rows_path, rrf.iter_normalised(synthetic_records(args.size)))
+        table, version = rrf.read_table(rows_path), rrf.file_version(rows_path)
+        rrf.write_columnar(cols_path, table, version)
+        manifest = rrf.write_shards(shard_dir, table, version, precompress=False)
+
+        rows: List[dict] = []
+        sizes = {}
+        for shard in manifest["shards"]:
+            path = os.path.join(shard_dir, shard["path"])
+            with open(path, "r", encoding="utf-8") as f:
+                rows.extend(rrf.decode_columns(json.load(f)))
+            sizes[shard["key"]] = gz(path)
+        expected = rrf.read_json(rows_path)
+        key = lambda r: json.dumps(r, sort_keys=True)  # noqa: E731
+        if sorted(map(key, rows)) != sorted(map(key, expected)):
+            print("MISMATCH: the shards do not hold the same rows as rrf_licences.json")
+            return 1
+
+        manifest_gz = gz(os.path.join(shard_dir, rrf.SHARD_MANIFEST))
+        full_gz = gz(cols_path)
+        print(
+            f"{count} rows in {len(manifest['shards'])} shards; manifest {manifest_gz / 1024:.1f}KB gz, "
+            f"whole columnar file {full_gz / 1024:.0f}KB gz ({args.mbps:g} Mbit/s)"
+        )
+        print(f"{'view':<13} {'zoom':>4} {'shards':>6} {'rows':>7} {'gzip':>8} {'of all':>6} {'transfer':>9}")
+        for name, lat, lon, zoom in VIEWS:
+            box = view_box(lat, lon, zoom, args.width, args.height)
+            picked = [s for s in manifest["shards"] if s["bbox"] and intersects(s["bbox"], box)]
+            sent = manifest_gz + sum(sizes[s["key"]] for s in picked)
+            print(
+                f"{name:<13} {zoom:>4} {len(picked):>6} {sum(s['rows'] for s in picked):>7}"
+                f" {sent / 1024:>6.0f}KB {sent / full_gz:>5.0%} {sent * 8 / (args.mbps * 1e6) * 1000:>7.0f}ms"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
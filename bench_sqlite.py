@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""SQLite export (--sqlite-out): ad-hoc queries against a scan of the rows.
+
+Upserts two snapshots into a fresh database with write_sqlite, the second
+with --churn of the licences changed, removed or new. It then times each
+query in SQL against the same filter over the rows in Python, and checks
+they return the same licences:
+
+  bbox      licences inside a box around Auckland (R*Tree)
+  nearest   the 10 licences closest to a point (R*Tree box, then exact order)
+  text      location or licensee words (FTS5)
+  district  one carrier's licences in one district and band (B-tree indexes)
+
+Run:
+  python bench_sqlite.py
+  python bench_sqlite.py --size 100000 --churn 0.02
+"""
+
+from __future__ import annotations
+
+import argparse
+import math
+import os
+import random
+import sqlite3
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+import rrf
+from rrf_stub import synthetic_records
+
+BOX = (-36.95, 174.65, -36.75, 174.9)  # south, west, north, east
+POINT = (-41.29, 174.78)
+NEAREST = 10
+WORDS = ("SPARK", "SITE")
+
+
+def best(fn: Callable[[], Any], repeat: int) -> Tuple[float, Any]:
+    t, out = float("inf"), None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        t = min(t, time.perf_counter() - t0)
+    return t, out
+
+
+def nearest_sql(con: sqlite3.Connection, lat: float, lon: float, k: int) -> List[Any]:
+    """The k closest licences: grow an R*Tree box until it holds k, then order exactly."""
+    pad = 0.05
+    while True:
+        found = con.execute(
+            "SELECT l.id, l.lat, l.lon FROM licences_rtree r JOIN licences l ON l.rowId = r.id "
+            "WHERE r.min_lat >= ? AND r.max_lat <= ? AND r.min_lon >= ? AND r.max_lon <= ? "
+            "AND l.lastSeen = (SELECT max(id) FROM snapshots)",
+            (lat - pad, lat + pad, lon - pad, lon + pad),
+        ).fetchall()
+        # The box's inscribed circle holds every licence closer than `pad` degrees of latitude.
+        radius = pad * rrf.GRID_METERS_PER_DEG_LAT * math.cos(math.radians(abs(lat) + pad))
+        near = sorted((rrf.distance_meters(lat, lon, a, b), i) for i, a, b in found)
+        if (len(near) >= k and near[k - 1][0] <= radius) or pad > 180:
+            return [i for _, i in near[:k]]
+        pad *= 2
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--size", type=int, default=30000, help="Synthetic licences")
+    ap.add_argument("--churn", type=float, default=0.01, help="Share of licences changed, gone and new in snapshot 2")
+    ap.add_argument("--repeat", type=int, default=5, help="Timings keep the best of N")
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        rows_path = os.path.join(tmp, "rrf_licences.json")
+        db_path = os.path.join(tmp, "rrf_licences.sqlite")
+        first = list(rrf.iter_normalised(synthetic_records(args.size)))
+        # One licence type's results repeat ids: every row of an id is kept.
+        first += [dict(r, licenceNo=f"{r['licenceNo']}-2") for r in first[-20:]]
+        rrf.write_json_array(rows_path, first)
+        t0 = time.perf_counter()
+        rrf.write_sqlite(db_path, rows_path, rrf.file_version(rows_path))
+        t_first = time.perf_counter() - t0
+
+        rng = random.Random(1)
+        n = max(1, int(len(first) * args.churn))
+        top = max(r["id"] for r in first)
+        kept = first[n:]
+        second = [dict(r, licenceStatus="Expired") if k < n else r for k, r in enumerate(kept)]
+        second += [dict(r, id=top + 1 + k) for k, r in enumerate(rng.sample(first, n))]
+        rrf.write_json_array(rows_path, second)
+        t0 = time.perf_counter()
+        stats = rrf.write_sqlite(db_path, rows_path, rrf.file_version(rows_path))
+        t_second = time.perf_counter() - t0
+
+        t_load, rows = best(lambda: rrf.read_json(rows_path), 1)
+        con = sqlite3.connect(db_path)
+        current = "l.lastSeen = (SELECT max(id) FROM snapshots)"
+        south, west, north, east = BOX
+        words = " ".join(WORDS)
+        district, band = rows[0]["locationDistrictCodes"][0], rrf._row_bands(rows[0])[0]
+        carrier = rrf.carrier_key(rows[0]["licensee"])
+
+        def located(r: Dict[str, Any]) -> bool:
+            return r["lat"] is not None and r["lon"] is not None
+
+        queries = [
+            (
+                "bbox",
+                lambda: sorted(
+                    r["id"] for r in rows if located(r) and south <= r["lat"] <= north and west <= r["lon"] <= east
+                ),
+                lambda: sorted(
+                    i
+                    for (i,) in con.execute(
+                        "SELECT l.id FROM licences_rtree r JOIN licences l ON l.rowId = r.id "
+                        "WHERE r.min_lat >= ? AND r.max_lat <= ? AND r.min_lon >= ? AND r.max_lon <= ? "
+                        f"AND l.lat BETWEEN ? AND ? AND l.lon BETWEEN ? AND ? AND {current}",
+                        (south - 1e-4, north + 1e-4, west - 1e-4, east + 1e-4, south, north, west, east),
+                    )
+                ),
+            ),
+            (
+                "nearest",
+                lambda: [
+                    r["id"]
+                    for r in sorted(
+                        (r for r in rows if located(r)),
+                        key=lambda r: (rrf.distance_meters(*POINT, r["lat"], r["lon"]), r["id"]),
+                    )[:NEAREST]
+                ],
+                lambda: nearest_sql(con, *POINT, NEAREST),
+            ),
+            (
+                "text",
+                lambda: sorted(
+                    r["id"]
+                    for r in rows
+                    if all(w in f"{r['location']} {r['licensee']}".upper().split() for w in WORDS)
+                ),
+                lambda: sorted(
+                    i
+                    for (i,) in con.execute(
+                        "SELECT l.id FROM licences_fts f JOIN licences l ON l.rowId = f.rowid "
+                        f"WHERE licences_fts MATCH ? AND {current}",
+                        (words,),
+                    )
+                ),
+            ),
+            (
+                "district",
+                lambda: sorted(
+                    r["id"]
+                    for r in rows
+                    if district in rrf._district_codes(r)
+                    and band in rrf._row_bands(r)
+                    and rrf.carrier_key(r["licensee"]) == carrier
+                ),
+                lambda: sorted(
+                    i
+                    for (i,) in con.execute(
+                        "SELECT l.id FROM licence_districts d "
+                        "JOIN licence_bands b ON b.licence_row = d.licence_row "
+                        "JOIN licences l ON l.rowId = d.licence_row "
+                        f"WHERE d.district = ? AND b.band = ? AND l.carrier = ? AND {current}",
+                        (district, band, carrier),
+                    )
+                ),
+            ),
+        ]
+
+        print(
+            f"{len(second)} rows; {os.path.getsize(db_path) / 2**20:.1f}MB database; first upsert {t_first:.2f}s, "
+            f"snapshot 2 {t_second:.2f}s ({stats['added']} added, {stats['changed']} changed, {stats['removed']} gone)"
+        )
+        print(f"rrf_licences.json -> rows {t_load * 1000:.0f}ms before any scan")
+        print(f"{'query':<9} {'found':>6} {'scan':>9} {'sqlite':>9}")
+        for name, scan, query in queries:
+            t_scan, expected = best(scan, args.repeat)
+            t_sql, got = best(query, args.repeat)
+            if got != expected:
+                print(f"MISMATCH: {name} found {len(got)} licences in SQL, {len(expected)} in the rows")
+                return 1
+            print(f"{name:<9} {len(got):>6} {t_scan * 1000:>7.1f}ms {t_sql * 1000:>7.2f}ms")
+        con.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
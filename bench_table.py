@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""LicenceTable vs list-of-dicts: memory and scan speed.
+
+Loads rrf_licences.json both ways and compares resident size (tracemalloc)
+and two whole-dataset scans, then checks the table writes back
+byte-identical JSON:
+
+  bbox   licences inside an Auckland box that include band b3
+  since  licences commencing from 2020, counted per licensee
+
+Run:
+  python bench_table.py
+  python bench_table.py --sizes 50000,200000
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import os
+import tempfile
+import time
+import tracemalloc
+from collections import Counter
+from datetime import date
+from typing import Any, Callable, Dict, List, Tuple
+
+import rrf
+from rrf_stub import synthetic_records
+
+BBOX = (-37.2, -36.6, 174.4, 175.2)  # lat0, lat1, lon0, lon1
+SINCE = "2020-01-01"
+
+
+def loaded(load: Callable[[], Any]) -> Tuple[Any, float]:
+    """The loaded object and the memory it keeps, in MiB."""
+    gc.collect()
+    tracemalloc.start()
+    obj = load()
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return obj, size / 2**20
+
+
+def scan_dicts(rows: List[Dict[str, Any]]) -> Tuple[int, Counter]:
+    lat0, lat1, lon0, lon1 = BBOX
+    inside = 0
+    for r in rows:
+        lat, lon = r["lat"], r["lon"]
+        if lat is not None and lat0 <= lat <= lat1 and lon0 <= lon <= lon1 and "b3" in r["bandCodes"]:
+            inside += 1
+    since = Counter(r["licensee"] for r in rows if (r["commencementDate"] or "") >= SINCE)
+    return inside, since
+
+
+def scan_table(table: rrf.LicenceTable) -> Tuple[int, Counter]:
+    lat0, lat1, lon0, lon1 = BBOX
+    band_codes, band_values = table.codes("bandCodes")
+    with_b3 = {i for i, v in enumerate(band_values) if "b3" in v}
+    inside = 0
+    for lat, lon, code in zip(table.floats("lat"), table.floats("lon"), band_codes):
+        # NaN (no coordinates) fails every comparison.
+        if lat0 <= lat <= lat1 and lon0 <= lon <= lon1 and code in with_b3:
+            inside += 1
+
+    cutoff = date.fromisoformat(SINCE).toordinal() - date(1970, 1, 1).toordinal()
+    licensee_codes, licensees = table.codes("licensee")
+    comm = table.column("commencementDate")
+    counts: Counter = Counter()
+    for day, kind, code in zip(comm.days, comm.kinds, licensee_codes):
+        if day >= cutoff and kind == 0:
+            counts[code] += 1
+    return inside, Counter({licensees[c]: n for c, n in counts.items()})
+
+
+def timed(fn: Callable[[], Any], repeat: int = 3) -> Tuple[Any, float]:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - t0)
+    return out, best
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sizes", default="10000,100000,300000", help="Comma-separated licence counts")
+    args = ap.parse_args()
+
+    print(f"{'rows':>8}  {'dicts MiB':>9}  {'table MiB':>9}  {'ratio':>5}  {'dict scan':>9}  {'table scan':>10}  {'speed-up':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in (int(s) for s in args.sizes.split(",") if s.strip()):
+            path = os.path.join(tmp, "rrf_licences.json")
+            rrf.write_json_array(path, rrf.iter_normalised(synthetic_records(size)))
+
+            rows, dict_mib = loaded(lambda: rrf.read_json(path))
+            table, table_mib = loaded(lambda: rrf.read_table(path))
+
+            want, t_dicts = timed(lambda: scan_dicts(rows))
+            got, t_table = timed(lambda: scan_table(table))
+            if want != got:
+                print(f"MISMATCH in scan results at {size} rows")
+                return 1
+
+            copy = os.path.join(tmp, "copy.json")
+            rrf.write_json_array(copy, table)
+            with open(path, "rb") as a, open(copy, "rb") as b:
+                if a.read() != b.read():
+                    print(f"MISMATCH: table JSON differs at {size} rows")
+                    return 1
+
+            print(
+                f"{len(rows):>8}  {dict_mib:>9.1f}  {table_mib:>9.1f}  {dict_mib / table_mib:>4.1f}x"
+                f"  {t_dicts:>8.3f}s  {t_table:>9.3f}s  {t_dicts / t_table:>7.1f}x"
+            )
+            del rows, table
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""Tile pyramid (--tile-dir): what the page fetches for a given map view.
+
+Checks the pyramid against the rows: the detail tiles hold every row with
+coordinates, and each lower zoom's cell counts add up to the same rows.
+For a few map views it lists the tiles Leaflet would request and compares
+their gzip bytes, and the rows or cells drawn, with the whole columnar
+file. --scale repeats the dataset to show how a view grows with the
+licence count.
+
+Run:
+  python bench_tiles.py
+  python bench_tiles.py --size 100000 --scale 1,4
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import json
+import math
+import os
+import tempfile
+from typing import Any, Dict, Iterator, List, Tuple
+
+import rrf
+from rrf_stub import synthetic_records
+
+VIEWS = [
+    ("Auckland", -36.85, 174.76, 13),
+    ("Auckland", -36.85, 174.76, 10),
+    ("Wellington", -41.29, 174.78, 11),
+    ("Canterbury", -43.53, 172.64, 8),
+    ("New Zealand", -41.2, 174.7, 5),
+]
+
+
+def visible_tiles(lat: float, lon: float, zoom: int, width: int, height: int, manifest: Dict[str, Any]) -> Tuple[int, List[str]]:
+    """The tile zoom and the listed tiles a width x height view at `zoom` needs."""
+    z = max(manifest["minZoom"], min(zoom, manifest["detailZoom"]))
+    x, y = rrf.tile_position(lat, lon, z)
+    scale = 2 ** (z - zoom)  # tiles per screen tile; below 1 when over-zoomed
+    half_w = width / 2 / manifest["tileSize"] * scale
+    half_h = height / 2 / manifest["tileSize"] * scale
+    listed = set(manifest["tiles"][str(z)])
+    keys = [
+        f"{tx}/{ty}"
+        for tx in range(math.floor(x - half_w), math.floor(x + half_w) + 1)
+        for ty in range(math.floor(y - half_h), math.floor(y + half_h) + 1)
+    ]
+    return z, [k for k in keys if k in listed]
+
+
+def scaled(records: List[Dict[str, Any]], times: int) -> Iterator[Dict[str, Any]]:
+    """`records` `times` over, with fresh ids (a country with more licences at the same sites)."""
+    top = max(r["id"] for r in records)
+    for k in range(times):
+        for r in records:
+            yield dict(r, id=r["id"] + k * top)
+
+
+def gz(path: str) -> int:
+    with open(path, "rb") as f:
+        return len(gzip.compress(f.read(), compresslevel=6, mtime=0))
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--size", type=int, default=30000, help="Synthetic licences")
+    ap.add_argument("--scale", default="1,4", help="Comma-separated multiples of the dataset")
+    ap.add_argument("--width", type=int, default=412, help="View width in CSS pixels")
+    ap.add_argument("--height", type=int, default=823, help="View height in CSS pixels")
+    args = ap.parse_args()
+
+    base = synthetic_records(args.size)
+    for times in (int(s) for s in args.scale.split(",") if s.strip()):
+        with tempfile.TemporaryDirectory() as tmp:
+            rows_path = os.path.join(tmp, "rrf_licences.json")
+            cols_path = os.path.join(tmp, "rrf_licences.columns.json")
+            tile_dir = os.path.join(tmp, "rrf_tiles")
+            count = rrf.write_json_array(rows_path, rrf.iter_normalised(scaled(base, times)))
+            table, version = rrf.read_table(rows_path), rrf.file_version(rows_path)
+            rrf.write_columnar(cols_path, table, version)
+            manifest = rrf.write_tiles(tile_dir, table, version, precompress=False)
+
+            def tile_path(z: int, key: str) -> str:
+                return os.path.join(tile_dir, str(z), *key.split("/")) + ".json"
+
+            located = [r for r in rrf.read_json(rows_path) if r["lat"] is not None and r["lon"] is not None]
+            detail_zoom = manifest["detailZoom"]
+            detail: List[Dict[str, Any]] = []
+            for key in manifest["tiles"][str(detail_zoom)]:
+                with open(tile_path(detail_zoom, key), "r", encoding="utf-8") as f:
+                    detail.extend(rrf.decode_columns(json.load(f)))
+            as_text = lambda r: json.dumps(r, sort_keys=True)  # noqa: E731
+            if sorted(map(as_text, detail)) != sorted(map(as_text, located)):
+                print("MISMATCH: the detail tiles do not hold the rows with coordinates")
+                return 1
+            for z in range(manifest["minZoom"], detail_zoom):
+                total = 0
+                for key in manifest["tiles"][str(z)]:
+                    with open(tile_path(z, key), "r", encoding="utf-8") as f:
+                        total += sum(n for cell in json.load(f)["cells"] for _, _, n in cell["counts"])
+                if total != len(located):
+                    print(f"MISMATCH: zoom {z} cells count {total} rows, not {len(located)}")
+                    return 1
+
+            full_gz = gz(cols_path)
+            files = sum(len(v) for v in manifest["tiles"].values())
+            print(
+                f"\n{count} rows ({times}x); {files} tiles, zoom {manifest['minZoom']}-{detail_zoom}; "
+                f"whole columnar file {full_gz / 1024:.0f}KB gz"
+            )
+            print(f"{'view':<12} {'zoom':>4} {'tiles':>5} {'draws':>13} {'gzip':>8} {'of all':>6}")
+            for name, lat, lon, zoom in VIEWS:
+                z, keys = visible_tiles(lat, lon, zoom, args.width, args.height, manifest)
+                sent = sum(gz(tile_path(z, key)) for key in keys)
+                if z >= detail_zoom:
+                    drawn = 0
+                    for key in keys:
+                        with open(tile_path(z, key), "r", encoding="utf-8") as f:
+                            drawn += json.load(f)["rows"]
+                    what = f"{drawn} rows"
+                else:
+                    cells = 0
+                    for key in keys:
+                        with open(tile_path(z, key), "r", encoding="utf-8") as f:
+                            cells += len(json.load(f)["cells"])
+                    what = f"{cells} cells"
+                print(f"{name:<12} {zoom:>4} {len(keys):>5} {what:>13} {sent / 1024:>6.0f}KB {sent / full_gz:>5.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
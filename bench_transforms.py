@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""Built-in vs pyproj coordinate transforms: accuracy and speed.
+
+For each CRS rrf.py converts (EPSG:2193 NZTM2000, EPSG:4167 NZGD2000 and
+EPSG:4272 NZGD49 -> EPSG:4326), random points over mainland New Zealand and
+the Chathams go through both engines. The script reports the worst and mean
+disagreement in metres and the per-point cost, scalar and over buffers, and
+exits non-zero if any CRS disagrees by more than --tolerance.
+
+Run:
+  python bench_transforms.py
+  python bench_transforms.py --points 200000 --tolerance 0.001
+"""
+
+from __future__ import annotations
+
+import argparse
+import math
+import random
+import time
+from array import array
+from typing import Any, Callable, List, Tuple
+
+import rrf
+
+CRS = ("EPSG:2193", "EPSG:4167", "EPSG:4272")
+
+# Sampling boxes: NZTM metres, or lon/lat degrees for the geographic CRSs.
+NZTM_BOX = (1000000.0, 2200000.0, 4700000.0, 6250000.0)
+DEGREE_BOXES = ((166.0, 179.0, -47.5, -34.0), (-177.0, -176.0, -44.5, -43.5))
+
+
+def sample(crs: str, count: int, rnd: random.Random) -> Tuple[array, array]:
+    xs, ys = array("d"), array("d")
+    for i in range(count):
+        if crs == "EPSG:2193":
+            x0, x1, y0, y1 = NZTM_BOX
+        else:
+            x0, x1, y0, y1 = DEGREE_BOXES[i % 10 == 0]
+        xs.append(rnd.uniform(x0, x1))
+        ys.append(rnd.uniform(y0, y1))
+    return xs, ys
+
+
+def metres(lon1: float, lat1: float, lon2: float, lat2: float) -> float:
+    """Great-circle distance; plenty for sub-metre differences."""
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    dp = p2 - p1
+    dl = math.radians((lon2 - lon1 + 180) % 360 - 180)
+    h = math.sin(dp / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dl / 2) ** 2
+    return 2 * 6371008.8 * math.asin(math.sqrt(h))
+
+
+def per_point_us(fn: Callable[[], Any], points: int) -> float:
+    t0 = time.perf_counter()
+    fn()
+    return (time.perf_counter() - t0) / points * 1e6
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--points", type=int, default=50000, help="Random points per CRS")
+    ap.add_argument("--tolerance", type=float, default=0.01, help="Largest acceptable error, metres")
+    ap.add_argument("--seed", type=int, default=1)
+    args = ap.parse_args()
+
+    t0 = time.perf_counter()
+    builtin = rrf.build_transformers(mode="builtin")
+    t_builtin = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    if rrf.resolve_transform_mode("pyproj") != "pyproj":
+        print("pyproj is not installed; nothing to compare the built-in transforms against.")
+        return 2
+    pyproj = rrf.build_transformers(mode="pyproj")
+    t_pyproj = time.perf_counter() - t0
+    print(f"setup: builtin {t_builtin * 1000:.1f} ms, pyproj {t_pyproj * 1000:.1f} ms (import + from_crs)")
+
+    rnd = random.Random(args.seed)
+    failed: List[str] = []
+    print(
+        f"{'crs':<10} {'max err m':>11} {'mean err m':>11}"
+        f" {'builtin us/pt':>14} {'(buffer)':>9} {'pyproj us/pt':>13} {'(buffer)':>9}"
+    )
+    for crs, b, p in zip(CRS, builtin, pyproj):
+        xs, ys = sample(crs, args.points, rnd)
+        b_lon, b_lat = b.transform(xs, ys)
+        p_lon, p_lat = p.transform(xs, ys)
+        errors = [metres(*pt) for pt in zip(b_lon, b_lat, p_lon, p_lat)]
+        worst = max(errors)
+        mean = sum(errors) / len(errors)
+
+        n = min(args.points, 20000)
+        b_scalar = per_point_us(lambda: [b.transform(x, y) for x, y in zip(xs[:n], ys[:n])], n)
+        b_buffer = per_point_us(lambda: b.transform(xs, ys), len(xs))
+        p_scalar = per_point_us(lambda: [p.transform(x, y) for x, y in zip(xs[:n], ys[:n])], n)
+        p_buffer = per_point_us(lambda: p.transform(xs, ys), len(xs))
+        print(
+            f"{crs:<10} {worst:>11.2e} {mean:>11.2e}"
+            f" {b_scalar:>14.2f} {b_buffer:>9.2f} {p_scalar:>13.2f} {p_buffer:>9.2f}"
+        )
+        if not worst <= args.tolerance:
+            failed.append(crs)
+
+    if failed:
+        print(f"FAIL: {', '.join(failed)} off by more than {args.tolerance} m")
+        return 1
+    print(f"OK: all within {args.tolerance} m")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -3,11 +3,15 @@
 
 Requirements (only for --fetch):
   pip install requests
-Optional (recommended for TM2000 -> lat/lon conversion):
+Optional (TM2000 -> lat/lon conversion; built-in formulas are used without it):
   pip install pyproj
+Optional (.br siblings of the output files; .gz is always written):
+  pip install brotli
 
 Run:
   python rrf_map.py --page-size 200 --max-pages 50
+  python rrf_map.py --fetch --concurrency 4   # fetch pages 2..N in parallel
+  python rrf_map.py --fetch --workers 4       # normalise + render in 4 processes
 
 HTML-only (no API calls; regenerates ./rrf_map.html from existing JSON):
   python rrf_map.py
@@ -19,31 +23,76 @@ Preview locally (recommended port for browser-container checks):
 Fetch + rebuild JSON/HTML (explicit, since HTML-only is default):
   python rrf_map.py --fetch
 
+Offline against the local stand-in API (see rrf_stub.py):
+  python rrf_stub.py --port 8765 &
+  RRF_API_URL=http://127.0.0.1:8765/api/public_search/licence python rrf_map.py --fetch
+
+Raw API pages are kept in ./.rrf_raw while fetching:
+  python rrf_map.py --fetch --resume   # continue an interrupted fetch
+  python rrf_map.py --from-raw         # re-normalise offline from stored pages
+
 Outputs:
   ./rrf_licences.json
+  ./rrf_delta/manifest.json + one patch per change with --delta-dir rrf_delta (the page patches its cached copy)
+  ./rrf_licences.columns.json with --columnar-out (smaller; the page prefers it)
+  ./rrf_licences.bin with --binary-out (typed arrays; the page tries it first)
+  ./rrf_licences.ndjson with --ndjson-out (one row per line; the page draws it as it arrives)
+  ./rrf_shards/ with --shard-dir rrf_shards (one file per district; the page loads what's on the map)
+  ./rrf_tiles/{z}/{x}/{y}.json with --tile-dir rrf_tiles (the page prefers these over shards)
+  ./rrf_clusters.json with --clusters-out (site clusters the page reuses instead of computing)
+  ./rrf_licences.sqlite with --sqlite-out (upserted each run; R*Tree, FTS5 and field indexes)
   ./index.html
 """
 
 from __future__ import annotations
 
 import argparse
+import bisect
+import codecs
+import filecmp
+import gzip
+import hashlib
+import heapq
+import itertools
 import json
+import math
+import multiprocessing
+import os
+import queue
+import random
+import re
+import sqlite3
+import statistics
 import sys
+import threading
 import time
-from typing import Any, Dict, List, Optional, Tuple
+import zlib
+from array import array
+from collections import Counter, OrderedDict, deque
+from collections.abc import Mapping as MappingABC
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import date
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Deque, Dict, IO, Iterable, Iterator, List, Optional, Tuple, TypeVar
 
 try:
-    import requests
+    import brotli  # optional: .br siblings of the published files
 except Exception:
-    requests = None  # type: ignore[assignment]
+    try:
+        import brotlicffi as brotli  # same API
+    except Exception:
+        brotli = None  # type: ignore[assignment]
 
 try:
-    from pyproj import Transformer  # type: ignore
+    import requests
+    import urllib3  # requests' transport; raised directly by iter_response_text
 except Exception:
-    Transformer = None  # pyproj is optional
+    requests = None  # type: ignore[assignment]
+    urllib3 = None  # type: ignore[assignment]
 
 
-API_URL = "https://rrf.rsm.govt.nz/api/public_search/licence"
+# Override with RRF_API_URL (or --api-url) to point at a stand-in such as rrf_stub.py.
+API_URL = os.environ.get("RRF_API_URL") or "https://rrf.rsm.govt.nz/api/public_search/licence"
 
 
 # ---- Band classification -----------------------------------------------------
@@ -62,13 +111,225 @@ BAND_DEFS = [
 ]
 
 
+class BandIndex:
+    """Interval index over BAND_DEFS: every band a frequency or span falls in.
+
+    Band edges split the axis into elementary slots (each edge itself, and the
+    open gaps between edges); the bands covering each slot are worked out once,
+    so a lookup is a bisect. Codes come back in BAND_DEFS order, which keeps
+    overlaps (B5/B8 at 880-894 MHz) visible instead of first-match-wins.
+    """
+
+    def __init__(self, defs: List[Tuple[str, str, Tuple[float, float]]]) -> None:
+        self.edges = sorted({float(v) for _code, _label, span in defs for v in span})
+        probes = []
+        for i, edge in enumerate(self.edges):
+            below = self.edges[i - 1] if i else edge - 1.0
+            probes.extend(((below + edge) / 2, edge))
+        probes.append(self.edges[-1] + 1.0)
+        self.slots: List[Tuple[str, ...]] = [
+            tuple(code for code, _label, (lo, hi) in defs if lo <= x <= hi) for x in probes
+        ]
+        self.order = {code: i for i, (code, _label, _span) in enumerate(defs)}
+
+    def _slot(self, mhz: float) -> int:
+        i = bisect.bisect_left(self.edges, mhz)
+        if i < len(self.edges) and self.edges[i] == mhz:
+            return 2 * i + 1
+        return 2 * i
+
+    def at(self, mhz: float) -> Tuple[str, ...]:
+        """Bands containing `mhz`."""
+        return self.slots[self._slot(mhz)]
+
+    def overlapping(self, lo: float, hi: float) -> Tuple[str, ...]:
+        """Bands sharing at least one frequency with [lo, hi]."""
+        if lo > hi:
+            lo, hi = hi, lo
+        first, last = self._slot(lo), self._slot(hi)
+        if first == last:
+            return self.slots[first]
+        found = {code for slot in self.slots[first : last + 1] for code in slot}
+        return tuple(sorted(found, key=self.order.__getitem__))
+
+    def classify(
+        self, ref: Optional[float], lower: Optional[float] = None, upper: Optional[float] = None
+    ) -> List[str]:
+        """Band codes for a licence, "unknown" or "other" when there are none.
+
+        Bands containing the reference frequency come first, then any others
+        the lower/upper span reaches into. A licence's bandCode stays
+        classify_band(ref); span-only matches appear here alone. With no band
+        the sentinel is classify_band(ref)'s, so the two never disagree.
+        """
+        codes = list(self.at(ref)) if ref is not None else []
+        if lower is not None and upper is not None:
+            for code in self.overlapping(lower, upper):
+                if code not in codes:
+                    codes.append(code)
+        if codes:
+            return codes
+        return ["unknown" if ref is None else "other"]
+
+    def classify_many(
+        self,
+        refs: Iterable[Optional[float]],
+        lowers: Optional[Iterable[Optional[float]]] = None,
+        uppers: Optional[Iterable[Optional[float]]] = None,
+    ) -> List[List[str]]:
+        """classify() over whole frequency arrays (lowers/uppers optional)."""
+        lowers = itertools.repeat(None) if lowers is None else lowers
+        uppers = itertools.repeat(None) if uppers is None else uppers
+        return [self.classify(r, lo, hi) for r, lo, hi in zip(refs, lowers, uppers)]
+
+
+BAND_INDEX = BandIndex(BAND_DEFS)
+
+
 def classify_band(mhz: Optional[float]) -> str:
     if mhz is None:
         return "unknown"
-    for code, _label, (lo, hi) in BAND_DEFS:
-        if lo <= mhz <= hi:
-            return code
-    return "other"
+    codes = BAND_INDEX.at(mhz)
+    return codes[0] if codes else "other"
+
+
+# ---- Raw page store ----------------------------------------------------------
+# Raw API pages are kept gzipped on disk so an interrupted fetch can resume and
+# normalisation/HTML can be re-run offline (--from-raw). Each fetch is a run:
+# starting one writes run.json.gz and removes the previous run's pages and
+# meta; meta.json.gz is written only once the run's last page is stored, so a
+# store without it holds an interrupted run, the only kind --resume continues.
+
+
+class RawPageStore:
+    """One directory per query, keyed by a hash of the payload (minus `page`)."""
+
+    def __init__(self, root: str, payload: Dict[str, Any]) -> None:
+        query = {k: v for k, v in payload.items() if k != "page"}
+        key = hashlib.sha1(json.dumps(query, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+        self.dir = os.path.join(root, key)
+        self.query = query
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.dir, name)
+
+    def _page_name(self, page: int) -> str:
+        return f"page-{page:05d}.json.gz"
+
+    def _write(self, name: str, obj: Any) -> None:
+        writer = RawPageWriter(self._path(name))
+        writer.write(json.dumps(obj, ensure_ascii=False))
+        writer.commit()
+
+    def _read(self, name: str) -> Any:
+        with gzip.open(self._path(name), "rt", encoding="utf-8") as f:
+            return json.load(f)
+
+    def has(self, page: int) -> bool:
+        return os.path.exists(self._path(self._page_name(page)))
+
+    def save(self, page: int, data: Dict[str, Any]) -> None:
+        self._write(self._page_name(page), data)
+
+    def page_writer(self, page: int) -> "RawPageWriter":
+        """Writer for a page's body text as it streams in (see stream_page)."""
+        return RawPageWriter(self._path(self._page_name(page)))
+
+    def load(self, page: int) -> Dict[str, Any]:
+        return self._read(self._page_name(page))
+
+    def save_meta(self, total_pages: int, total_items: Any) -> None:
+        self._write(
+            "meta.json.gz",
+            {"query": self.query, "totalPages": total_pages, "totalItems": total_items},
+        )
+
+    def load_meta(self) -> Dict[str, Any]:
+        return self._read("meta.json.gz")
+
+    def clear_meta(self) -> None:
+        """Marks the stored run incomplete until save_meta() is called again."""
+        try:
+            os.remove(self._path("meta.json.gz"))
+        except FileNotFoundError:
+            pass
+
+    def interrupted_run(self) -> Optional[Dict[str, Any]]:
+        """The run marker of a started but unfinished run, or None."""
+        if os.path.exists(self._path("meta.json.gz")):
+            return None
+        try:
+            return self._read("run.json.gz")
+        except FileNotFoundError:
+            return None
+
+    def start_run(self, resume: bool = False) -> Optional[Dict[str, Any]]:
+        """Begins a fetch; returns the run marker if it continues an interrupted run.
+
+        Without `resume`, or with nothing to resume, the previous run's pages
+        and meta are removed first so no page of it is read as part of this one.
+        """
+        if resume:
+            run = self.interrupted_run()
+            if run is not None:
+                return run
+        self.clear_meta()
+        if os.path.isdir(self.dir):
+            for name in os.listdir(self.dir):
+                if name.startswith("page-"):
+                    os.remove(self._path(name))
+        self._write("run.json.gz", {"query": self.query, "runId": os.urandom(8).hex(), "started": time.time()})
+        return None
+
+
+class RawPageWriter:
+    """Gzips text into `<path>.tmp`; commit() renames it into place."""
+
+    def __init__(self, path: str) -> None:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self.tmp = path + ".tmp"
+        self._raw = open(self.tmp, "wb")
+        self._gz = gzip.GzipFile(fileobj=self._raw, mode="wb", mtime=0)
+
+    def write(self, text: str) -> None:
+        self._gz.write(text.encode("utf-8"))
+
+    def commit(self) -> None:
+        self._gz.close()
+        self._raw.close()
+        os.replace(self.tmp, self.path)
+
+    def abort(self) -> None:
+        self._gz.close()
+        self._raw.close()
+        try:
+            os.remove(self.tmp)
+        except OSError:
+            pass
+
+
+def open_raw_pages(store: RawPageStore, max_pages: int = 0) -> Iterator[Dict[str, Any]]:
+    """Checks the stored run is complete, then returns an iterator over its pages."""
+    try:
+        meta = store.load_meta()
+    except FileNotFoundError:
+        if store.interrupted_run() is not None:
+            raise RuntimeError(f"Raw store {store.dir} holds an interrupted fetch. Finish it with --fetch --resume.")
+        raise RuntimeError(f"No raw pages stored for this query in {store.dir}. Run --fetch first.")
+    total_pages = int(meta.get("totalPages", 1))
+    if max_pages and max_pages > 0:
+        total_pages = min(total_pages, max_pages)
+
+    missing = [p for p in range(1, total_pages + 1) if not store.has(p)]
+    if missing:
+        raise RuntimeError(
+            f"Raw store {store.dir} is missing {len(missing)} page(s) (first: {missing[0]}). "
+            "Finish the fetch with --fetch --resume."
+        )
+
+    print(f"Reading {total_pages} raw page(s) from {store.dir}")
+    return (store.load(page) for page in range(1, total_pages + 1))
 
 
 # ---- HTTP + pagination -------------------------------------------------------
@@ -81,78 +342,1109 @@ def build_headers() -> Dict[str, str]:
         "Origin": "https://rrf.rsm.govt.nz",
         "Referer": "https://rrf.rsm.govt.nz/ui/app/search/licence",
         "User-Agent": "rrf_map.py (requests)",
+        # Decompressed by iter_response_text, which also counts wire bytes.
+        "Accept-Encoding": "gzip, deflate",
     }
 
 
-def post_page(
+# Transient statuses worth retrying; any other 4xx/5xx fails the page at once.
+RETRYABLE_STATUSES = frozenset({408, 425, 429, 500, 502, 503, 504})
+
+
+class HTTPStatusError(RuntimeError):
+    def __init__(self, status: int, message: str, retry_after: Optional[float] = None) -> None:
+        super().__init__(message)
+        self.status = status
+        self.retry_after = retry_after
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP-date)."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+
+class RetryPolicy:
+    """How post_page retries: capped exponential backoff with jitter.
+
+    The wait before retry `attempt` (1-based) is drawn from
+    [d/2, d] with d = min(base * 2**attempt, cap), so concurrent workers
+    spread out instead of retrying in lockstep. A Retry-After header on a
+    429/503 takes precedence (up to `retry_after_cap`).
+    """
+
+    def __init__(
+        self,
+        retries: int = 5,
+        base: float = 1.0,
+        cap: float = 20.0,
+        retry_after_cap: float = 120.0,
+        max_consecutive_failures: int = 10,
+    ) -> None:
+        self.retries = max(1, retries)
+        self.base = base
+        self.cap = cap
+        self.retry_after_cap = retry_after_cap
+        self.max_consecutive_failures = max_consecutive_failures
+
+    def is_retryable(self, err: Exception) -> bool:
+        """Transient failures only: connection/timeout errors, a cut-off or
+        garbled body, and RETRYABLE_STATUSES. A bad URL, schema or header
+        (requests.InvalidURL, MissingSchema, InvalidHeader, ...; several are
+        also ValueErrors) or a TLS failure fails the same way every time.
+        """
+        if isinstance(err, HTTPStatusError):
+            return err.status in RETRYABLE_STATUSES
+        if requests is not None and isinstance(err, requests.RequestException):
+            if isinstance(err, requests.exceptions.SSLError):
+                return False
+            return isinstance(
+                err,
+                (
+                    requests.ConnectionError,
+                    requests.Timeout,
+                    requests.exceptions.ChunkedEncodingError,
+                    requests.exceptions.ContentDecodingError,
+                ),
+            )
+        if urllib3 is not None and isinstance(err, urllib3.exceptions.HTTPError):
+            # Connection dropped or timed out while streaming the body.
+            return isinstance(
+                err,
+                (
+                    urllib3.exceptions.ProtocolError,
+                    urllib3.exceptions.IncompleteRead,
+                    urllib3.exceptions.TimeoutError,
+                    urllib3.exceptions.DecodeError,
+                ),
+            )
+        # Truncated or garbled body (PageParser).
+        return isinstance(err, ValueError)
+
+    def delay(self, attempt: int, err: Exception) -> float:
+        if isinstance(err, HTTPStatusError) and err.retry_after is not None:
+            return min(err.retry_after, self.retry_after_cap)
+        d = min(self.base * 2**attempt, self.cap)
+        return d / 2 + random.uniform(0, d / 2)
+
+
+class CircuitBreaker:
+    """Run-wide count of consecutive failed requests, shared by all workers.
+
+    Once `threshold` requests in a row have failed (0 disables), every
+    post_page call sharing the breaker gives up instead of retrying. main()
+    passes one breaker to the fetch of every licence type, so the threshold
+    counts failures across the whole run.
+    """
+
+    def __init__(self, threshold: int) -> None:
+        self.threshold = threshold
+        self.failures = 0
+        self._lock = threading.Lock()
+        self._open = threading.Event()
+
+    @property
+    def is_open(self) -> bool:
+        return self._open.is_set()
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.threshold > 0 and self.failures >= self.threshold:
+                self._open.set()
+
+    def sleep(self, seconds: float) -> None:
+        """Backoff sleep that ends early if the breaker opens meanwhile."""
+        self._open.wait(seconds)
+
+
+class PageParser:
+    """Incremental parser for a search response body.
+
+    feed() takes text as it downloads and returns events: ("record", None,
+    record) for each element of the top-level "results" array and ("meta",
+    key, value) for every other top-level key. Only the element currently
+    being decoded is buffered, so a page is never held as one string or one
+    parsed object.
+    """
+
+    _WS = re.compile(r"[ \t\n\r]*")
+
+    def __init__(self) -> None:
+        self._decoder = json.JSONDecoder()
+        self._buf = ""
+        self._pos = 0
+        self._state = "start"
+        self._key: Optional[str] = None
+
+    def _decode(self, final: bool) -> Tuple[bool, Any]:
+        try:
+            value, end = self._decoder.raw_decode(self._buf, self._pos)
+        except json.JSONDecodeError:
+            if final:
+                raise
+            return False, None
+        # A number or literal ending exactly at the buffer end may continue.
+        if end == len(self._buf) and not final:
+            return False, None
+        self._pos = end
+        return True, value
+
+    def _expect(self, chars: str) -> str:
+        c = self._buf[self._pos]
+        if c not in chars:
+            raise ValueError(f"Unexpected {c!r} in response at offset {self._pos}")
+        self._pos += 1
+        return c
+
+    def feed(self, text: str, final: bool = False) -> List[Tuple[str, Optional[str], Any]]:
+        self._buf = self._buf[self._pos :] + text
+        self._pos = 0
+        events: List[Tuple[str, Optional[str], Any]] = []
+        while True:
+            self._pos = self._WS.match(self._buf, self._pos).end()
+            if self._pos >= len(self._buf) or self._state == "done":
+                break
+            state = self._state
+            if state == "start":
+                self._expect("{")
+                self._state = "key_or_end"
+            elif state in ("key", "key_or_end"):
+                if state == "key_or_end" and self._buf[self._pos] == "}":
+                    self._pos += 1
+                    self._state = "done"
+                    continue
+                ok, key = self._decode(final)
+                if not ok:
+                    break
+                self._key = key
+                self._state = "colon"
+            elif state == "colon":
+                self._expect(":")
+                self._state = "value"
+            elif state == "value":
+                if self._key == "results" and self._buf[self._pos] == "[":
+                    self._pos += 1
+                    self._state = "item_or_end"
+                    continue
+                ok, value = self._decode(final)
+                if not ok:
+                    break
+                events.append(("meta", self._key, value))
+                self._state = "after_value"
+            elif state == "after_value":
+                self._state = "key" if self._expect(",}") == "," else "done"
+            elif state in ("item", "item_or_end"):
+                if state == "item_or_end" and self._buf[self._pos] == "]":
+                    self._pos += 1
+                    self._state = "after_value"
+                    continue
+                ok, value = self._decode(final)
+                if not ok:
+                    break
+                events.append(("record", None, value))
+                self._state = "item_sep"
+            elif state == "item_sep":
+                self._state = "item" if self._expect(",]") == "," else "after_value"
+        if final and self._state != "done":
+            raise ValueError("Truncated response body")
+        return events
+
+    def close(self) -> List[Tuple[str, Optional[str], Any]]:
+        return self.feed("", final=True)
+
+
+def iter_response_text(r: Any, stats: Dict[str, Any], chunk_size: int = 65536) -> Iterator[str]:
+    """Decoded body text of a stream=True response, chunk by chunk.
+
+    gzip/deflate are undone here rather than by urllib3 so the compressed
+    size can be counted: stats gets "wire_bytes" and "bytes" (decoded).
+    """
+    encoding = (r.headers.get("Content-Encoding") or "").lower()
+    if "gzip" in encoding:
+        inflater: Optional[Any] = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    elif "deflate" in encoding:
+        inflater = zlib.decompressobj()
+    else:
+        inflater = None
+    text = codecs.getincrementaldecoder("utf-8")()
+    wire = decoded = 0
+    for chunk in r.raw.stream(chunk_size, decode_content=False):
+        wire += len(chunk)
+        if inflater is not None:
+            try:
+                chunk = inflater.decompress(chunk)
+            except zlib.error:
+                if decoded or "deflate" not in encoding:
+                    raise
+                # Some servers send raw deflate without the zlib header.
+                inflater = zlib.decompressobj(-zlib.MAX_WBITS)
+                chunk = inflater.decompress(chunk)
+        decoded += len(chunk)
+        yield text.decode(chunk)
+    tail = inflater.flush() if inflater is not None else b""
+    decoded += len(tail)
+    stats["wire_bytes"] = wire
+    stats["bytes"] = decoded
+    yield text.decode(tail, final=True)
+
+
+def stream_page(
     session: requests.Session,
     headers: Dict[str, str],
     payload: Dict[str, Any],
     timeout: int = 30,
     retries: int = 5,
+    policy: Optional[RetryPolicy] = None,
+    breaker: Optional[CircuitBreaker] = None,
+    api_url: Optional[str] = None,
+    stats: Optional[Dict[str, Any]] = None,
+    tee: Optional[Callable[[], RawPageWriter]] = None,
 ) -> Dict[str, Any]:
-    last_err: Optional[Exception] = None
-    for attempt in range(1, retries + 1):
-        try:
-            r = session.post(
-                API_URL,
-                headers=headers,
-                json=payload,
-                timeout=timeout,
+    """POSTs one search page; page["results"] is a one-shot record iterator.
+
+    Records are parsed as the (compressed) response downloads. The request
+    only goes out when iteration starts, and other top-level keys
+    (totalPages, totalItems, ...) are added to the returned dict as they
+    are parsed, so all of them are present once "results" is exhausted.
+    If a transfer fails mid-page, the page is re-requested and the records
+    already yielded are skipped. `tee` is called once per attempt for a
+    writer that receives the decoded body (used by the raw page store).
+    If `stats` is given it receives "items", "bytes", "wire_bytes" and
+    "attempts".
+    """
+    policy = policy or RetryPolicy(retries=retries)
+    breaker = breaker or CircuitBreaker(policy.max_consecutive_failures)
+    page: Dict[str, Any] = {}
+
+    def records() -> Iterator[Dict[str, Any]]:
+        yielded = 0
+        last_err: Optional[Exception] = None
+        for attempt in range(1, policy.retries + 1):
+            if breaker.is_open:
+                break
+            writer: Optional[RawPageWriter] = None
+            try:
+                with session.post(
+                    api_url or API_URL,
+                    headers=headers,
+                    json=payload,
+                    timeout=timeout,
+                    stream=True,
+                ) as r:
+                    if r.status_code == 401:
+                        raise HTTPStatusError(
+                            401, "401 Unauthorized (endpoint may now require auth or request was blocked)."
+                        )
+                    if r.status_code >= 400:
+                        retry_after = None
+                        if r.status_code in (429, 503):
+                            retry_after = parse_retry_after(r.headers.get("Retry-After"))
+                        raise HTTPStatusError(
+                            r.status_code, f"HTTP {r.status_code}: {r.text[:300]}", retry_after
+                        )
+                    writer = tee() if tee is not None else None
+                    parser = PageParser()
+                    transfer: Dict[str, Any] = {}
+                    skip = yielded
+                    items = 0
+                    for text in itertools.chain(iter_response_text(r, transfer), [None]):
+                        if text is None:
+                            events = parser.close()
+                        else:
+                            if writer is not None:
+                                writer.write(text)
+                            events = parser.feed(text)
+                        for kind, key, value in events:
+                            if kind == "meta":
+                                if key != "results":
+                                    page[key] = value
+                            elif skip:
+                                skip -= 1
+                                items += 1
+                            else:
+                                items += 1
+                                yielded += 1
+                                yield value
+                breaker.record_success()
+                if writer is not None:
+                    writer.commit()
+                    writer = None
+                if stats is not None:
+                    stats.update(transfer, items=items, attempts=attempt)
+                return
+            except Exception as e:
+                last_err = e
+                if not policy.is_retryable(e):
+                    raise RuntimeError(f"Failed (not retryable): {e}") from e
+                breaker.record_failure()
+                if attempt < policy.retries and not breaker.is_open:
+                    breaker.sleep(policy.delay(attempt, e))
+            finally:
+                if writer is not None:
+                    writer.abort()
+        if breaker.is_open:
+            raise RuntimeError(
+                f"Giving up: {breaker.failures} consecutive failed requests (last: {last_err})"
             )
-            if r.status_code == 401:
-                raise RuntimeError("401 Unauthorized (endpoint may now require auth or request was blocked).")
-            if r.status_code >= 400:
-                raise RuntimeError(f"HTTP {r.status_code}: {r.text[:300]}")
-            return r.json()
-        except Exception as e:
-            last_err = e
-            sleep_s = min(2**attempt, 20)
-            time.sleep(sleep_s)
-    raise RuntimeError(f"Failed after retries: {last_err}")
+        raise RuntimeError(f"Failed after retries: {last_err}")
 
+    page["results"] = records()
+    return page
 
-def fetch_all(
+
+def post_page(
+    session: requests.Session,
+    headers: Dict[str, str],
+    payload: Dict[str, Any],
+    timeout: int = 30,
+    retries: int = 5,
+    policy: Optional[RetryPolicy] = None,
+    breaker: Optional[CircuitBreaker] = None,
+    api_url: Optional[str] = None,
+    stats: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """POSTs one search page and returns it with "results" as a list.
+
+    Same retries and `stats` as stream_page; the body is still parsed
+    incrementally, so only the parsed page is ever held, never its text.
+    """
+    page = stream_page(
+        session, headers, payload, timeout, retries, policy, breaker, api_url, stats
+    )
+    page["results"] = list(page["results"])
+    return page
+
+
+def build_session(concurrency: int = 1) -> requests.Session:
+    """Session whose connection pool is large enough for `concurrency` workers."""
+    session = requests.Session()
+    if concurrency > 1:
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=concurrency)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+    return session
+
+
+def iter_pages(
     base_payload: Dict[str, Any],
     page_size: int,
     max_pages: int = 0,
     sleep_between: float = 0.0,
-) -> List[Dict[str, Any]]:
+    concurrency: int = 1,
+    raw_dir: Optional[str] = None,
+    resume: bool = False,
+    policy: Optional[RetryPolicy] = None,
+    api_url: Optional[str] = None,
+    log_prefix: str = "",
+    lazy: bool = True,
+    breaker: Optional[CircuitBreaker] = None,
+) -> Iterator[Dict[str, Any]]:
+    """Yields raw API pages in page order.
+
+    Pages 2..N are fetched with up to `concurrency` requests in flight, and at
+    most that many finished pages are held before being yielded.
+    A `page_size` of 0 picks the size automatically (iter_pages_auto).
+
+    With `lazy`, page 1 and sequential pages stream their records as they
+    download, and the caller must read each page's "results" before asking
+    for the next page (totalPages and the raw store depend on it), as
+    iter_records does. Pass lazy=False when another thread drives the pages
+    (iter_in_background): every page is then read whole before it is yielded.
+
+    Without a `breaker`, the run gets its own from policy.max_consecutive_failures.
+    """
     if requests is None:
         raise RuntimeError("The 'requests' package is required for --fetch. Install with: pip install requests")
-    session = requests.Session()
+
+    def log(msg: str) -> None:
+        print(f"{log_prefix}{msg}")
+
+    if page_size <= 0:
+        if resume:
+            log("NOTE: --resume is ignored with --page-size auto (page boundaries differ per run).")
+        yield from iter_pages_auto(
+            base_payload, max_pages, sleep_between, concurrency, raw_dir, policy, api_url, log_prefix, breaker
+        )
+        return
+    concurrency = max(1, concurrency)
+    session = build_session(concurrency)
     headers = build_headers()
+    policy = policy or RetryPolicy()
+    breaker = breaker or CircuitBreaker(policy.max_consecutive_failures)
 
     payload = dict(base_payload)
     payload["pageSize"] = page_size
     payload["page"] = 1
 
-    first = post_page(session, headers, payload)
+    store = RawPageStore(raw_dir, payload) if raw_dir else None
+    resuming = store.start_run(resume) if store is not None else None
+    if resuming is not None:
+        log(f"Resuming run {resuming.get('runId')} from {store.dir}")
+    elif resume:
+        log("NOTE: no interrupted run to resume; fetching every page.")
+
+    def get_page(page: int, lazy: bool) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
+        """Returns (page data, transfer stats); stats is None if loaded from the store.
+
+        Lazy pages stream their records to the caller as they download (the
+        store gets the body as it arrives); others are fetched whole, which
+        is what the concurrent workers need.
+        """
+        if resuming is not None and store.has(page):
+            return store.load(page), None
+        page_payload = dict(payload)
+        page_payload["page"] = page
+        stats: Dict[str, Any] = {}
+        if lazy:
+            tee = (lambda: store.page_writer(page)) if store is not None else None
+            data = stream_page(
+                session,
+                headers,
+                page_payload,
+                policy=policy,
+                breaker=breaker,
+                api_url=api_url,
+                stats=stats,
+                tee=tee,
+            )
+        else:
+            data = post_page(
+                session,
+                headers,
+                page_payload,
+                policy=policy,
+                breaker=breaker,
+                api_url=api_url,
+                stats=stats,
+            )
+            if store is not None:
+                store.save(page, data)
+        return data, stats
+
+    def describe(page: int, data: Dict[str, Any], stats: Optional[Dict[str, Any]]) -> str:
+        if stats is None:
+            return f"Page {page} loaded from raw store. items={len(data.get('results') or [])}"
+        return (
+            f"Page {page} fetched. items={stats.get('items', 0)} "
+            f"wire={stats.get('wire_bytes', 0) / 1024:.0f} KiB decoded={stats.get('bytes', 0) / 1024:.0f} KiB"
+        )
+
+    # Page 1 streams too; totalPages is read once it has been consumed.
+    first, first_stats = get_page(1, lazy=lazy)
+    yield first
     total_pages = int(first.get("totalPages", 1))
+    total_items = first.get("totalItems")
     if max_pages and max_pages > 0:
         total_pages = min(total_pages, max_pages)
+    accumulated = first_stats.get("items", 0) if first_stats is not None else len(first.get("results") or [])
+    log(
+        f"{describe(1, first, first_stats)} "
+        f"totalPages={first.get('totalPages')} totalItems={first.get('totalItems')}"
+    )
+    del first
 
-    results: List[Dict[str, Any]] = []
-    results.extend(first.get("results") or [])
+    def fetch_page(page: int, lazy: bool = False) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
+        data, stats = get_page(page, lazy)
+        if sleep_between > 0 and stats is not None:
+            time.sleep(sleep_between)
+        return data, stats
+
+    pool = ThreadPoolExecutor(max_workers=concurrency) if concurrency > 1 else None
+    pending: Deque[Tuple[int, Future]] = deque()
+    next_page = 2
+    try:
+        while pending or next_page <= total_pages:
+            if pool is None:
+                page = next_page
+                data, stats = get_page(page, lazy=lazy)
+                next_page += 1
+            else:
+                while next_page <= total_pages and len(pending) < concurrency:
+                    pending.append((next_page, pool.submit(fetch_page, next_page)))
+                    next_page += 1
+                page, future = pending.popleft()
+                data, stats = future.result()
+
+            yield data
+            accumulated += stats.get("items", 0) if stats is not None else len(data.get("results") or [])
+            log(f"{describe(page, data, stats)} total_accumulated={accumulated}")
+            del data
+            if pool is None and sleep_between > 0 and stats is not None and next_page <= total_pages:
+                time.sleep(sleep_between)
+    finally:
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    # The last page's body is committed once its records have been read.
+    if store is not None and all(store.has(p) for p in range(1, total_pages + 1)):
+        store.save_meta(total_pages, total_items)
+
+
+# Candidate sizes probed by --page-size auto, smallest first.
+AUTO_PAGE_SIZES = (500, 1000, 2000, 5000, 10000)
+MIN_AUTO_PAGE_SIZE = 250
+# Halve the page size once the per-item latency EWMA has run this many times
+# over the size's baseline (the median of its first AUTO_BASELINE_PAGES pages)
+# for AUTO_PATIENCE pages in a row, so one slow page doesn't shrink it.
+AUTO_SLOWDOWN_FACTOR = 2.0
+AUTO_BASELINE_PAGES = 3
+AUTO_PATIENCE = 3
+# After this many pages at a halved size, try double again; each time the
+# larger size is still slow and halves back, the wait doubles.
+AUTO_GROW_AFTER = 8
+
+
+def iter_pages_auto(
+    base_payload: Dict[str, Any],
+    max_pages: int = 0,
+    sleep_between: float = 0.0,
+    concurrency: int = 1,
+    raw_dir: Optional[str] = None,
+    policy: Optional[RetryPolicy] = None,
+    api_url: Optional[str] = None,
+    log_prefix: str = "",
+    breaker: Optional[CircuitBreaker] = None,
+) -> Iterator[Dict[str, Any]]:
+    """iter_pages with the page size picked by probing the endpoint.
+
+    Page 1 is requested at each AUTO_PAGE_SIZES entry, stopping once the
+    server caps the page (results < pageSize while totalItems is larger) or
+    throughput stops improving. The size with the best items/s is used. The
+    widest probe response becomes the first page, cut to a whole number of
+    pages at that size, so the items the probes already fetched are not
+    requested again.
+
+    Mid-run, if per-item latency (an EWMA) stays AUTO_SLOWDOWN_FACTOR over
+    the current size's baseline for AUTO_PATIENCE pages, the size is halved.
+    After AUTO_GROW_AFTER pages at a halved size it is doubled again (back up
+    to the chosen size), waiting twice as long each time that fails. Every
+    scheduled offset is a multiple of the size it is fetched at, and a larger
+    size starts only at an offset that is a multiple of it, so page numbers
+    stay exact.
+    """
 
-    print(
-        f"Page 1 fetched. totalPages={first.get('totalPages')} totalItems={first.get('totalItems')}"
+    def log(msg: str) -> None:
+        print(f"{log_prefix}{msg}")
+
+    concurrency = max(1, concurrency)
+    session = build_session(concurrency)
+    headers = build_headers()
+    policy = policy or RetryPolicy()
+    breaker = breaker or CircuitBreaker(policy.max_consecutive_failures)
+    payload = dict(base_payload)
+
+    def fetch(size: int, page: int) -> Tuple[Dict[str, Any], float, int]:
+        page_payload = dict(payload, pageSize=size, page=page)
+        stats: Dict[str, Any] = {}
+        started = time.perf_counter()
+        data = post_page(
+            session, headers, page_payload, policy=policy, breaker=breaker, api_url=api_url, stats=stats
+        )
+        seconds = time.perf_counter() - started
+        if sleep_between > 0:
+            time.sleep(sleep_between)
+        return data, seconds, int(stats.get("wire_bytes", 0))
+
+    best: Optional[Tuple[float, int]] = None  # (items/s, size)
+    widest: Dict[str, Any] = {}  # the probe holding the most of page 1
+    for size in AUTO_PAGE_SIZES:
+        data, seconds, nbytes = fetch(size, 1)
+        n = len(data.get("results") or [])
+        total = int(data.get("totalItems") or 0)
+        rate = n / seconds if seconds > 0 else float("inf")
+        log(
+            f"Probe pageSize={size}: items={n} {seconds:.2f}s {nbytes / 1024:.0f} KiB wire -> {rate:.0f} items/s"
+        )
+        if n >= len(widest.get("results") or []):
+            widest = data
+        capped = n < size and total > n
+        if capped:
+            log(f"Server caps pageSize at {n}")
+            size = n
+        if best is not None and rate < best[0] * 0.9:
+            break
+        if best is None or rate > best[0]:
+            best = (rate, size)
+        if capped or n < size:
+            break
+    assert best is not None
+    rate, size = best
+    chosen = size
+    log(f"Page size auto: using {size} ({rate:.0f} items/s in probe)")
+
+    total_items = int(widest.get("totalItems") or 0)
+    results = widest.get("results") or []
+    complete = len(results) >= total_items
+    # Later pages start at multiples of `size`, so keep whole pages of the probe.
+    keep = len(results) if complete else len(results) // size * size
+    if max_pages and max_pages > 0:
+        keep = min(keep, max_pages * size)
+    first = dict(widest, results=results[:keep]) if keep < len(results) else widest
+    del widest, results
+
+    store = RawPageStore(raw_dir, dict(payload, pageSize="auto")) if raw_dir else None
+    if store is not None:
+        store.start_run()
+        store.save(1, first)
+
+    limit = total_items
+    if max_pages and max_pages > 0:
+        limit = min(limit, max_pages * size)
+
+    started = time.perf_counter()
+    first_items = len(first.get("results") or [])
+    accumulated = first_items
+    seq = 1
+    yield first
+    del first
+
+    pool = ThreadPoolExecutor(max_workers=concurrency) if concurrency > 1 else None
+    pending: Deque[Tuple[int, int, Future]] = deque()
+    next_offset = limit if complete else first_items
+    baselines: Dict[int, float] = {}  # size -> median per-item seconds of its first pages
+    samples: List[float] = []  # per-item seconds at `size` until its baseline is known
+    ewma = 0.0
+    slow = at_size = 0  # pages in a row over the factor / pages since the last resize
+    grown = False  # the current size was reached by doubling, and hasn't yet held
+    grow_after = AUTO_GROW_AFTER
+    target = size  # the size to switch to at the next offset aligned to it
+
+    def resize(new_size: int) -> None:
+        nonlocal size, samples, ewma, slow, at_size, grown
+        grown = new_size > size
+        size, samples, slow, at_size = new_size, [], 0, 0
+        ewma = baselines.get(new_size, 0.0)
+
+    try:
+        while pending or next_offset < limit:
+            if target != size and next_offset % target == 0:
+                resize(target)
+            if pool is None:
+                offset, page_size = next_offset, size
+                data, seconds, nbytes = fetch(size, next_offset // size + 1)
+                next_offset += size
+            else:
+                while next_offset < limit and len(pending) < concurrency:
+                    future = pool.submit(fetch, size, next_offset // size + 1)
+                    pending.append((next_offset, size, future))
+                    next_offset += size
+                offset, page_size, future = pending.popleft()
+                data, seconds, nbytes = future.result()
+
+            page_results = data.get("results") or []
+            accumulated += len(page_results)
+            seq += 1
+            if store is not None:
+                store.save(seq, data)
+            log(
+                f"Items {offset}-{offset + len(page_results)} fetched (pageSize={page_size}). "
+                f"{seconds:.2f}s {nbytes / 1024:.0f} KiB wire total_accumulated={accumulated}"
+            )
+
+            if page_size == size and target == size and page_results:
+                per_item = seconds / len(page_results)
+                if size not in baselines:
+                    samples.append(per_item)
+                    if len(samples) == AUTO_BASELINE_PAGES:
+                        baselines[size] = ewma = statistics.median(samples)
+                else:
+                    ewma = 0.7 * ewma + 0.3 * per_item
+                    slow = slow + 1 if ewma > AUTO_SLOWDOWN_FACTOR * baselines[size] else 0
+                    at_size += 1
+                    if slow >= AUTO_PATIENCE and size // 2 >= MIN_AUTO_PAGE_SIZE:
+                        if grown:  # doubling back was too soon
+                            grow_after *= 2
+                        target = size // 2
+                        resize(target)
+                        log(f"Page latency degraded; page size -> {size}")
+                    else:
+                        if grown and at_size >= grow_after:
+                            grown, grow_after = False, AUTO_GROW_AFTER
+                        if size < chosen and at_size >= grow_after:
+                            target = size * 2
+                            log(f"Page latency steady for {at_size} pages; page size -> {target}")
+
+            yield data
+            del data, page_results
+    finally:
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    if store is not None:
+        store.save_meta(seq, total_items)
+    elapsed = time.perf_counter() - started
+    fetched = accumulated - first_items
+    log(
+        f"Page size auto: chose {chosen}, finished at {size}; "
+        f"{fetched} items after page 1 in {elapsed:.1f}s ({fetched / elapsed if elapsed > 0 else 0:.0f} items/s)"
     )
 
-    for page in range(2, total_pages + 1):
+
+def iter_records(pages: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    for data in pages:
+        yield from data.get("results") or []
+
+
+def fetch_all(
+    base_payload: Dict[str, Any],
+    page_size: int,
+    max_pages: int = 0,
+    sleep_between: float = 0.0,
+    concurrency: int = 1,
+    raw_dir: Optional[str] = None,
+    resume: bool = False,
+    policy: Optional[RetryPolicy] = None,
+    api_url: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    return list(
+        iter_records(
+            iter_pages(
+                base_payload,
+                page_size,
+                max_pages,
+                sleep_between,
+                concurrency,
+                raw_dir,
+                resume,
+                policy,
+                api_url,
+            )
+        )
+    )
+
+
+def fetch_until_known(
+    base_payload: Dict[str, Any],
+    page_size: int,
+    known: Dict[Any, Optional[str]],
+    max_pages: int = 0,
+    sleep_between: float = 0.0,
+    policy: Optional[RetryPolicy] = None,
+    api_url: Optional[str] = None,
+    log_prefix: str = "",
+    breaker: Optional[CircuitBreaker] = None,
+) -> List[Dict[str, Any]]:
+    """Fetch newest-first pages until a page holds nothing new.
+
+    `known` maps licence id -> lastUpdatedDate from the previous run. Paging
+    stops after the first page whose non-RCV records are all known and
+    unchanged, so the query must be ordered newest-first (the default "id
+    desc"). Pages are fetched one at a time, since each decides whether
+    there is a next.
+    """
+    if requests is None:
+        raise RuntimeError("The 'requests' package is required for --fetch. Install with: pip install requests")
+
+    def log(msg: str) -> None:
+        print(f"{log_prefix}{msg}")
+
+    session = build_session()
+    headers = build_headers()
+    policy = policy or RetryPolicy()
+    breaker = breaker or CircuitBreaker(policy.max_consecutive_failures)
+
+    payload = dict(base_payload)
+    payload["pageSize"] = page_size
+
+    results: List[Dict[str, Any]] = []
+    page = 1
+    total_pages = 1
+    while page <= total_pages:
         payload["page"] = page
-        data = post_page(session, headers, payload)
+        data = post_page(session, headers, payload, policy=policy, breaker=breaker, api_url=api_url)
+        total_pages = int(data.get("totalPages", 1))
+        if max_pages and max_pages > 0:
+            total_pages = min(total_pages, max_pages)
+
         page_results = data.get("results") or []
-        results.extend(page_results)
-        print(
-            f"Page {page} fetched. items={len(page_results)} total_accumulated={len(results)}"
+        # RCV rows are never written out, so they can't be "known": a page of
+        # only RCV rows says nothing about whether older pages changed.
+        comparable = [r for r in page_results if (r.get("configType") or "").upper() != "RCV"]
+        changed = [
+            r
+            for r in comparable
+            if r.get("id") not in known or known[r.get("id")] != iso_date_or_none(r.get("lastUpdatedDate"))
+        ]
+        results.extend(changed)
+        log(
+            f"Page {page} fetched. items={len(page_results)} new_or_changed={len(changed)}"
         )
-        if sleep_between > 0:
+        if not page_results or (comparable and not changed):
+            break
+        page += 1
+        if sleep_between > 0 and page <= total_pages:
             time.sleep(sleep_between)
 
     return results
 
 
+# ---- Multi licence-type fetch ---------------------------------------------------
+
+T = TypeVar("T")
+
+
+def iter_in_background(items: Iterator[T], maxsize: int = 2) -> Iterator[T]:
+    """Drives `items` on a worker thread, buffering at most `maxsize` ahead.
+
+    Lets several result sets be fetched at once while one consumer reads
+    them; exceptions from the worker are re-raised in the consumer.
+    """
+    q: "queue.Queue[Tuple[str, Any]]" = queue.Queue(maxsize=maxsize)
+    stop = threading.Event()
+
+    def put(msg: Tuple[str, Any]) -> bool:
+        while not stop.is_set():
+            try:
+                q.put(msg, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def run() -> None:
+        try:
+            for item in items:
+                if not put(("item", item)):
+                    return
+            put(("done", None))
+        except BaseException as e:
+            put(("error", e))
+        finally:
+            close = getattr(items, "close", None)
+            if close is not None:
+                close()
+
+    def consume() -> Iterator[T]:
+        try:
+            while True:
+                kind, value = q.get()
+                if kind == "item":
+                    yield value
+                elif kind == "error":
+                    raise value
+                else:
+                    return
+        finally:
+            stop.set()
+
+    # Started here rather than on first next() so every stream begins at once.
+    threading.Thread(target=run, daemon=True).start()
+    return consume()
+
+
+def _tag(index: int, records: Iterable[Dict[str, Any]]) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    for r in records:
+        yield index, r
+
+
+def _id_desc_key(tagged: Tuple[int, Dict[str, Any]]) -> int:
+    try:
+        return -int(tagged[1].get("id"))
+    except (TypeError, ValueError):
+        return 0
+
+
+def merge_type_records(
+    streams: List[Iterable[Dict[str, Any]]], id_desc: bool = True
+) -> Iterator[Dict[str, Any]]:
+    """Merges per-licence-type record streams into one, de-duplicated by id.
+
+    With "id desc" ordering the streams are heap-merged so the output keeps
+    that order (and is the same whichever type's pages arrive first);
+    otherwise they are concatenated in the order given. Rows for an id are
+    taken only from the first stream that produced it.
+    """
+    tagged = [_tag(i, stream) for i, stream in enumerate(streams)]
+    merged = heapq.merge(*tagged, key=_id_desc_key) if id_desc else itertools.chain(*tagged)
+    owner: Dict[Any, int] = {}
+    for index, r in merged:
+        if owner.setdefault(r.get("id"), index) == index:
+            yield r
+
+
+# ---- Built-in transforms -----------------------------------------------------
+# Dependency-free stand-ins for the three pyproj transformers, so TM2000 sites
+# still map without pyproj (and startup skips importing it). They follow the
+# pipelines PROJ picks when no datum grids are installed:
+#   EPSG:2193 -> 4326: inverse NZTM2000 on GRS80 (NZGD2000 == WGS84, no shift)
+#   EPSG:4167 -> 4326: no-op
+#   EPSG:4272 -> 4326: NZGD49 to WGS 84 (2), 7-parameter Helmert
+# bench_transforms.py checks them against pyproj.
+
+GRS80 = (6378137.0, 1 / 298.257222101)
+WGS84 = (6378137.0, 1 / 298.257223563)
+INTL1924 = (6378388.0, 1 / 297.0)
+
+ARCSEC = math.pi / (180 * 3600)
+
+
+class TransverseMercatorInverse:
+    """Projected (easting, northing) -> (lon, lat) degrees, Krüger series.
+
+    Sixth-order series in n (Karney 2011), accurate to well under a
+    millimetre within a few thousand km of the central meridian.
+    """
+
+    def __init__(
+        self,
+        ellps: Tuple[float, float],
+        lon_0: float,
+        k_0: float,
+        x_0: float,
+        y_0: float,
+    ) -> None:
+        a, f = ellps
+        n = f / (2 - f)
+        n2, n3, n4, n5, n6 = n**2, n**3, n**4, n**5, n**6
+        self.e = math.sqrt(f * (2 - f))
+        self.e2m = 1 - self.e**2
+        self.scale = k_0 * a / (1 + n) * (1 + n2 / 4 + n4 / 64 + n6 / 256)
+        self.beta = (
+            n / 2 - 2 * n2 / 3 + 37 * n3 / 96 - n4 / 360 - 81 * n5 / 512 + 96199 * n6 / 604800,
+            n2 / 48 + n3 / 15 - 437 * n4 / 1440 + 46 * n5 / 105 - 1118711 * n6 / 3870720,
+            17 * n3 / 480 - 37 * n4 / 840 - 209 * n5 / 4480 + 5569 * n6 / 90720,
+            4397 * n4 / 161280 - 11 * n5 / 504 - 830251 * n6 / 7257600,
+            4583 * n5 / 161280 - 108847 * n6 / 3991680,
+            20648693 * n6 / 638668800,
+        )
+        self.lon_0 = lon_0
+        self.x_0 = x_0
+        self.y_0 = y_0
+
+    def point(self, x: float, y: float) -> Tuple[float, float]:
+        xi = (y - self.y_0) / self.scale
+        eta = (x - self.x_0) / self.scale
+        xi_p, eta_p = xi, eta
+        for j, b in enumerate(self.beta, 1):
+            xi_p -= b * math.sin(2 * j * xi) * math.cosh(2 * j * eta)
+            eta_p -= b * math.cos(2 * j * xi) * math.sinh(2 * j * eta)
+        sinh_eta = math.sinh(eta_p)
+        cos_xi = math.cos(xi_p)
+        lon = self.lon_0 + math.degrees(math.atan2(sinh_eta, cos_xi))
+        if lon > 180:
+            lon -= 360  # east of the antimeridian (Chathams), wrapped like PROJ
+        elif lon < -180:
+            lon += 360
+        # Conformal -> geodetic latitude by Newton's method on tau = tan(lat).
+        tau_p = math.sin(xi_p) / math.hypot(sinh_eta, cos_xi)
+        e, e2m = self.e, self.e2m
+        tau = tau_p / e2m
+        for _ in range(5):
+            tau1 = math.hypot(1.0, tau)
+            sig = math.sinh(e * math.atanh(e * tau / tau1))
+            tau_i = tau * math.hypot(1.0, sig) - sig * tau1
+            d = (tau_p - tau_i) / math.hypot(1.0, tau_i) * (1 + e2m * tau * tau) / (e2m * tau1)
+            tau += d
+            if abs(d) < 1e-13:
+                break
+        return lon, math.degrees(math.atan(tau))
+
+
+class HelmertDatumShift:
+    """Geographic (lon, lat) degrees between ellipsoids via a 7-parameter shift.
+
+    Coordinate-frame rotations in arc-seconds and scale in ppm, as in the
+    EPSG/PROJ parameters; heights are taken as 0 and dropped, like PROJ's
+    push/pop v_3 pipeline.
+    """
+
+    def __init__(
+        self,
+        src: Tuple[float, float],
+        dst: Tuple[float, float],
+        t: Tuple[float, float, float],
+        r: Tuple[float, float, float],
+        s_ppm: float,
+    ) -> None:
+        self.src_a, f = src
+        self.src_e2 = f * (2 - f)
+        self.dst_a, f = dst
+        self.dst_e2 = f * (2 - f)
+        self.t = t
+        self.r = tuple(v * ARCSEC for v in r)
+        self.m = 1 + s_ppm * 1e-6
+
+    def point(self, lon: float, lat: float) -> Tuple[float, float]:
+        phi, lam = math.radians(lat), math.radians(lon)
+        a, e2 = self.src_a, self.src_e2
+        sp, cp = math.sin(phi), math.cos(phi)
+        n = a / math.sqrt(1 - e2 * sp * sp)
+        x, y, z = n * cp * math.cos(lam), n * cp * math.sin(lam), n * (1 - e2) * sp
+
+        (tx, ty, tz), (rx, ry, rz), m = self.t, self.r, self.m
+        x, y, z = (
+            tx + m * (x + rz * y - ry * z),
+            ty + m * (-rz * x + y + rx * z),
+            tz + m * (ry * x - rx * y + z),
+        )
+
+        a, e2 = self.dst_a, self.dst_e2
+        p = math.hypot(x, y)
+        phi = math.atan2(z, p * (1 - e2))
+        for _ in range(5):
+            sp = math.sin(phi)
+            n = a / math.sqrt(1 - e2 * sp * sp)
+            h = p / math.cos(phi) - n
+            nxt = math.atan2(z, p * (1 - e2 * n / (n + h)))
+            if abs(nxt - phi) < 1e-14:
+                phi = nxt
+                break
+            phi = nxt
+        return math.degrees(math.atan2(y, x)), math.degrees(phi)
+
+
+class BuiltinTransformer:
+    """Transformer.transform() look-alike over a point function.
+
+    Takes scalars or equal-length buffers, like pyproj, and returns the same
+    shape: a float pair, or a pair of array('d').
+    """
+
+    def __init__(self, point: Optional[Callable[[float, float], Tuple[float, float]]] = None) -> None:
+        self.point = point
+
+    def transform(self, xx: Any, yy: Any) -> Tuple[Any, Any]:
+        point = self.point
+        if isinstance(xx, (int, float)):
+            return (float(xx), float(yy)) if point is None else point(xx, yy)
+        if point is None:
+            return array("d", xx), array("d", yy)
+        lons, lats = array("d"), array("d")
+        for x, y in zip(xx, yy):
+            lon, lat = point(x, y)
+            lons.append(lon)
+            lats.append(lat)
+        return lons, lats
+
+
+def builtin_transformers() -> Tuple[BuiltinTransformer, BuiltinTransformer, BuiltinTransformer]:
+    """Built-in (EPSG:2193, EPSG:4167, EPSG:4272) -> EPSG:4326, as build_transformers."""
+    nztm = TransverseMercatorInverse(GRS80, lon_0=173.0, k_0=0.9996, x_0=1600000.0, y_0=10000000.0)
+    nzgd49 = HelmertDatumShift(
+        INTL1924,
+        WGS84,
+        t=(59.47, -5.04, 187.44),
+        r=(-0.47, 0.1, -1.024),
+        s_ppm=-4.5993,
+    )
+    return BuiltinTransformer(nztm.point), BuiltinTransformer(), BuiltinTransformer(nzgd49.point)
+
+
 # ---- Geo handling ------------------------------------------------------------
 
 
@@ -202,6 +1494,145 @@ def pick_lat_lon(
     return None, None, "Unknown"
 
 
+# ---- Transform cache ---------------------------------------------------------
+# Licences share sites, so the same geo-reference comes up again and again;
+# CachedTransformer memoises points per CRS and TransformCache can persist them
+# between runs (--geo-cache) so a daily run only reprojects new sites. That
+# pays off with the built-in transforms; a pyproj transform costs about as
+# much as the lookup, so by default the cache is only used without pyproj.
+
+DEFAULT_GEO_CACHE = ".rrf_geo_cache.json.gz"
+
+
+class TransformCache:
+    """Bounded LRU of (crs, x, y) -> (lon, lat) with hit/miss counters."""
+
+    VERSION = 1
+
+    def __init__(self, maxsize: int = 200000) -> None:
+        self.maxsize = maxsize
+        self.entries: "OrderedDict[Tuple[str, float, float], Tuple[float, float]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.lookup_seconds = 0.0  # wall time inside CachedTransformer, lookups included
+        self.transform_seconds = 0.0  # of which spent transforming misses
+        self.loaded = 0
+        self.added: Optional[List[Tuple[Any, Any]]] = None  # new entries, when tracked (workers)
+
+    def wrap(self, transformer: Optional[Any], crs: str) -> Optional[Any]:
+        return None if transformer is None else CachedTransformer(transformer, crs, self)
+
+    def put(self, key: Tuple[str, float, float], value: Tuple[float, float]) -> None:
+        if key[1] != key[1] or key[2] != key[2]:
+            return  # NaN never matches itself; caching it would only leak
+        self.entries[key] = value
+        if self.added is not None:
+            self.added.append((key, value))
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+    def take_delta(self) -> Tuple[Any, ...]:
+        """New entries and counters since the last call, for merge_delta() elsewhere."""
+        delta = (self.added or [], self.hits, self.misses, self.lookup_seconds, self.transform_seconds)
+        self.added = []
+        self.hits = self.misses = 0
+        self.lookup_seconds = self.transform_seconds = 0.0
+        return delta
+
+    def merge_delta(self, delta: Tuple[Any, ...]) -> None:
+        added, hits, misses, lookup_seconds, transform_seconds = delta
+        for key, value in added:
+            self.put(key, value)
+        self.hits += hits
+        self.misses += misses
+        self.lookup_seconds += lookup_seconds
+        self.transform_seconds += transform_seconds
+
+    def summary(self) -> str:
+        lookups = self.hits + self.misses
+        if not lookups:
+            return "Geo cache: no lookups"
+        return (
+            f"Geo cache: {self.hits}/{lookups} hits ({100.0 * self.hits / lookups:.1f}%), "
+            f"{self.misses} reprojected, {self.loaded} loaded; "
+            f"{self.lookup_seconds:.2f}s in cached transforms, {self.transform_seconds:.2f}s of it reprojecting"
+        )
+
+    def load(self, path: str) -> None:
+        """Loads a cache saved by save(); a missing or stale file is ignored."""
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                obj = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            print(f"NOTE: ignoring unreadable geo cache {path} ({e})")
+            return
+        if obj.get("version") != self.VERSION or obj.get("proj") != _proj_version():
+            print(f"NOTE: geo cache {path} was built by another PROJ version; starting afresh")
+            return
+        for crs, points in (obj.get("entries") or {}).items():
+            for x, y, lon, lat in points:
+                self.put((crs, x, y), (lon, lat))
+        self.loaded = len(self.entries)
+
+    def save(self, path: str) -> None:
+        entries: Dict[str, List[List[float]]] = {}
+        for (crs, x, y), (lon, lat) in self.entries.items():  # oldest first
+            entries.setdefault(crs, []).append([x, y, lon, lat])
+        writer = RawPageWriter(path)
+        writer.write(
+            json.dumps(
+                {
+                    "version": self.VERSION,
+                    "proj": _proj_version(),
+                    "entries": entries,
+                },
+                separators=(",", ":"),
+            )
+        )
+        writer.commit()
+
+
+def _proj_version() -> Optional[str]:
+    # pyproj wheels bundle PROJ, so the package version pins both; read from
+    # metadata so --transform builtin runs never import pyproj.
+    try:
+        from importlib.metadata import version
+
+        return version("pyproj")
+    except Exception:
+        return None
+
+
+class CachedTransformer:
+    """Transformer.transform() of one point through a TransformCache."""
+
+    def __init__(self, transformer: Any, crs: str, cache: TransformCache) -> None:
+        self.transformer = transformer
+        self.crs = crs
+        self.cache = cache
+
+    def transform(self, x: float, y: float) -> Tuple[float, float]:
+        cache = self.cache
+        t0 = time.perf_counter()
+        try:
+            key = (self.crs, float(x), float(y))
+            hit = cache.entries.get(key)
+            if hit is not None:
+                cache.entries.move_to_end(key)
+                cache.hits += 1
+                return hit
+            t1 = time.perf_counter()
+            lon, lat = self.transformer.transform(x, y)
+            cache.transform_seconds += time.perf_counter() - t1
+            cache.misses += 1
+            cache.put(key, (lon, lat))
+            return lon, lat
+        finally:
+            cache.lookup_seconds += time.perf_counter() - t0
+
+
 # ---- Normalisation -----------------------------------------------------------
 
 
@@ -211,11 +1642,46 @@ def iso_date_or_none(s: Any) -> Optional[str]:
     return s
 
 
-def normalise_records(records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    transformer = None
-    transformer_4167 = None
-    transformer_4272 = None
-    if Transformer is not None:
+TRANSFORM_MODES = ("auto", "pyproj", "builtin")
+
+
+def pyproj_transformer_class() -> Optional[Any]:
+    """pyproj.Transformer, imported on first use (optional, and slow to import)."""
+    try:
+        from pyproj import Transformer  # type: ignore
+    except Exception:
+        return None  # pyproj is optional
+    return Transformer
+
+
+def resolve_transform_mode(mode: str) -> str:
+    """"pyproj", "builtin", or "none" (pyproj asked for but not installed).
+
+    "auto" means pyproj when it is installed, else the built-in transforms.
+    """
+    if mode == "builtin":
+        return "builtin"
+    if pyproj_transformer_class() is not None:
+        return "pyproj"
+    return "builtin" if mode == "auto" else "none"
+
+
+def build_transformers(
+    cache: Optional[TransformCache] = None, mode: str = "auto"
+) -> Tuple[Optional[Any], Optional[Any], Optional[Any]]:
+    """(EPSG:2193, EPSG:4167, EPSG:4272) -> EPSG:4326 transformers, or None each.
+
+    `mode` is one of TRANSFORM_MODES. With `cache`, each transformer is
+    wrapped in a CachedTransformer.
+    """
+    transformer: Optional[Any] = None
+    transformer_4167: Optional[Any] = None
+    transformer_4272: Optional[Any] = None
+    engine = resolve_transform_mode(mode)
+    if engine == "builtin":
+        transformer, transformer_4167, transformer_4272 = builtin_transformers()
+    elif engine == "pyproj":
+        Transformer = pyproj_transformer_class()
         try:
             transformer = Transformer.from_crs("EPSG:2193", "EPSG:4326", always_xy=True)
         except Exception:
@@ -228,69 +1694,1904 @@ def normalise_records(records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
             transformer_4272 = Transformer.from_crs("EPSG:4272", "EPSG:4326", always_xy=True)
         except Exception:
             transformer_4272 = None
+    if cache is not None:
+        # Engines differ in the last few decimals, so they don't share entries.
+        prefix = "builtin:" if engine == "builtin" else ""
+        transformer = cache.wrap(transformer, prefix + "EPSG:2193")
+        transformer_4167 = cache.wrap(transformer_4167, prefix + "EPSG:4167")
+        transformer_4272 = cache.wrap(transformer_4272, prefix + "EPSG:4272")
+    return transformer, transformer_4167, transformer_4272
+
+
+def normalise_record(
+    r: Dict[str, Any], transformers: Tuple[Optional[Any], Optional[Any], Optional[Any]]
+) -> Optional[Dict[str, Any]]:
+    """Normalised row for one raw API record, or None if it is skipped (RCV)."""
+    if (r.get("configType") or "").upper() == "RCV":
+        return None
 
-    out: List[Dict[str, Any]] = []
-    for r in records:
-        if (r.get("configType") or "").upper() == "RCV":
-            continue
+    geo = r.get("locationGeoReferences") or []
+    lat, lon, geo_src = pick_lat_lon(geo, *transformers)
+
+    lower = r.get("lowerBound")
+    upper = r.get("upperBound")
+    bandwidth = None
+    span: Tuple[Optional[float], Optional[float]] = (None, None)
+    try:
+        if lower is not None and upper is not None:
+            span = (float(lower), float(upper))
+            bandwidth = span[1] - span[0]
+    except Exception:
+        bandwidth = None
+
+    ref_mhz = None
+    try:
+        if r.get("refFrequency") is not None:
+            ref_mhz = float(r["refFrequency"])
+    except Exception:
+        ref_mhz = None
 
-        geo = r.get("locationGeoReferences") or []
-        lat, lon, geo_src = pick_lat_lon(geo, transformer, transformer_4167, transformer_4272)
+    band_codes = BAND_INDEX.classify(ref_mhz, *span)
 
-        lower = r.get("lowerBound")
-        upper = r.get("upperBound")
-        bandwidth = None
+    district_codes = r.get("locationDistrictCodes") or []
+    if isinstance(district_codes, str):
+        district_codes = [district_codes]
+
+    return {
+        "id": r.get("id"),
+        "licenceNo": r.get("licenceNo"),
+        "licensee": r.get("licensee"),
+        "location": r.get("location"),
+        "locationDistrictCodes": district_codes,
+        "refFrequencyMHz": ref_mhz,
+        "bandCode": classify_band(ref_mhz),
+        "bandCodes": band_codes,
+        "lowerBoundMHz": lower,
+        "upperBoundMHz": upper,
+        "bandwidthMHz": bandwidth,
+        "power": r.get("power"),
+        "configType": r.get("configType"),
+        "licenceTypeCode": r.get("licenceTypeCode"),
+        "licenceTypeDescription": r.get("licenceTypeDescription"),
+        "licenceStatus": r.get("licenceStatus"),
+        "suppressed": r.get("suppressed"),
+        "commencementDate": iso_date_or_none(r.get("commencementDate")),
+        "expiryDate": iso_date_or_none(r.get("expiryDate")),
+        "certificationDate": iso_date_or_none(r.get("certificationDate")),
+        "lastUpdatedDate": iso_date_or_none(r.get("lastUpdatedDate")),
+        "lat": lat,
+        "lon": lon,
+        "geoSource": geo_src,
+    }
+
+
+# Records normalised per chunk: large enough to amortise handing a chunk to a
+# worker process, small enough to keep streaming memory flat.
+NORMALISE_BATCH = 5000
+
+
+def normalise_chunk(
+    chunk: List[Dict[str, Any]], transformers: Tuple[Optional[Any], Optional[Any], Optional[Any]]
+) -> List[Dict[str, Any]]:
+    """Normalised rows for a chunk of raw records, RCV configurations dropped."""
+    rows = []
+    for r in chunk:
+        row = normalise_record(r, transformers)
+        if row is not None:
+            rows.append(row)
+    return rows
+
+
+# ---- Row reuse ----------------------------------------------------------------
+# A daily run sees mostly licences that haven't changed since the last one.
+# Their rows are copied from the previous --json-out instead of normalised
+# again: a record whose id and content match a previous row's record gets that
+# row's text as written. <json out>.digests holds a digest of each row's raw
+# record, one line per row in file order; lastUpdatedDate alone is not enough,
+# since a status, suppression, geo-reference or power change can leave it as
+# it was. Both the file and the records run in descending id order
+# (--order-by "id desc"), so the file and its digests are read alongside the
+# records a row at a time. <json out>.stamp ties the two files to the
+# normaliser that wrote them (this module's source and the transform engine);
+# rows are only reused when it matches, so a code or engine change
+# re-normalises everything once.
+
+ROWS_STAMP_SUFFIX = ".stamp"
+ROWS_DIGESTS_SUFFIX = ".digests"
+
+
+def normaliser_tag(engine: str) -> str:
+    """Identifies what normalises rows: this module's source and the transform engine."""
+    h = hashlib.blake2b(digest_size=8)
+    with open(__file__, "rb") as f:
+        h.update(f.read())
+    h.update(f"{engine}/{_proj_version() if engine == 'pyproj' else ''}".encode("utf-8"))
+    return h.hexdigest()
+
+
+def record_digest(record: Dict[str, Any]) -> str:
+    """Digest of a raw record's content, whatever the order of its keys."""
+    text = json.dumps(record, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def record_digests(chunk: List[Dict[str, Any]]) -> List[str]:
+    """record_digest of each non-RCV record in a chunk, i.e. one per row it normalises to."""
+    return [record_digest(r) for r in chunk if (r.get("configType") or "").upper() != "RCV"]
+
+
+class RowDigestWriter:
+    """Writes <json out>.digests as the rows stream out: one record digest per line, in row order.
+
+    The file goes to a temporary path, opened on the first add(), and
+    replaces the previous one on commit(), after the data file itself has
+    been written.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path + ROWS_DIGESTS_SUFFIX
+        self._tmp = self.path + ".tmp"
+        self._f: Optional[IO[str]] = None
+
+    def _open(self) -> IO[str]:
+        if self._f is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._f = open(self._tmp, "w", encoding="ascii", newline="\n")
+        return self._f
+
+    def add(self, digests: List[str]) -> None:
+        self._open().writelines(d + "\n" for d in digests)
+
+    def commit(self) -> None:
+        self._open().close()
+        os.replace(self._tmp, self.path)
+
+    def discard(self) -> None:
+        if self._f is not None:
+            self._f.close()
+            os.remove(self._tmp)
+
+
+def rows_stamp_matches(path: str, tag: str) -> bool:
+    """Whether the data file at `path` and its digests are unchanged since `tag`'s normaliser wrote them."""
+    try:
+        with open(path + ROWS_STAMP_SUFFIX, "r", encoding="utf-8") as f:
+            stamp = json.load(f)
+    except (OSError, ValueError):
+        return False
+    return (
+        isinstance(stamp, dict)
+        and stamp.get("normaliser") == tag
+        and stamp.get("version") == file_version(path)
+        and stamp.get("digests") is not None
+        and stamp.get("digests") == file_version(path + ROWS_DIGESTS_SUFFIX)
+    )
+
+
+def write_rows_stamp(path: str, tag: Optional[str]) -> None:
+    """Stamps the data file at `path` and its digests as written by `tag`'s normaliser.
+
+    None removes the stamp and the digests, which no longer describe the file.
+    """
+    stamp_path = path + ROWS_STAMP_SUFFIX
+    if tag is None:
+        for stale in (stamp_path, path + ROWS_DIGESTS_SUFFIX):
+            if os.path.exists(stale):
+                os.remove(stale)
+        return
+    stamp = {"version": file_version(path), "digests": file_version(path + ROWS_DIGESTS_SUFFIX), "normaliser": tag}
+    write_text_file(stamp_path, json.dumps(stamp) + "\n")
+
+
+class PreviousRows:
+    """The previous run's rows, matched against incoming records by id and record digest.
+
+    A record reuses a row with the same id whose raw record had the same
+    digest, so licences that share an id each find their own row.
+
+    Counts what it sees: records `added` (id not in the file), `changed`
+    (no row of the id has its digest), rows `reused` and rows `removed` (no
+    record came for them). If either side turns out not to be in descending
+    id order, or the digests don't line up with the rows, reuse stops for
+    the rest of the run and the counts are dropped.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.added = self.changed = self.reused = self.removed = 0
+        self.stopped = False
+        self._items = json_array_items(path)
+        self._ahead: Optional[Tuple[Dict[str, Any], str, str]] = None
+        self._group: List[Tuple[Dict[str, Any], str, str]] = []
+        self._group_id: Any = None
+        self._last_id: Any = None
         try:
-            if lower is not None and upper is not None:
-                bandwidth = float(upper) - float(lower)
-        except Exception:
-            bandwidth = None
+            self._digests: Optional[IO[str]] = open(path + ROWS_DIGESTS_SUFFIX, "r", encoding="ascii")
+        except OSError as e:
+            self._digests = None
+            self._stop(str(e))
+            return
+        self._read()
+
+    def _stop(self, why: str) -> None:
+        print(f"NOTE: not reusing rows from {self.path}: {why}")
+        self.stopped = True
+        self._ahead = None
+        self._group = []
+        self._close()
+
+    def _close(self) -> None:
+        self._items.close()
+        if self._digests is not None:
+            self._digests.close()
+
+    def _read(self) -> None:
+        previous = self._ahead
+        try:
+            item = next(self._items, None)
+        except ValueError as e:
+            self._stop(str(e))
+            return
+        assert self._digests is not None
+        digest = self._digests.readline().rstrip("\n")
+        if item is None:
+            self._ahead = None
+            if digest:
+                self._stop(f"{self.path}{ROWS_DIGESTS_SUFFIX} has more lines than the file has rows")
+            return
+        self._ahead = (item[0], item[1], digest)
+        rid = item[0].get("id") if isinstance(item[0], dict) else None
+        if not digest:
+            self._stop(f"{self.path}{ROWS_DIGESTS_SUFFIX} has fewer lines than the file has rows")
+        elif not isinstance(rid, (int, float)):
+            self._stop(f"a row has id {rid!r}")
+        elif previous is not None and rid > previous[0]["id"]:
+            self._stop("its ids are not in descending order")
+
+    def match(self, record: Dict[str, Any], digest: str) -> Optional[str]:
+        """Text of the row to reuse for `record` (whose record_digest is `digest`), or None if it must be normalised."""
+        if self.stopped:
+            return None
+        rid = record.get("id")
+        if not isinstance(rid, (int, float)) or (self._last_id is not None and rid > self._last_id):
+            self._stop("the records are not in descending id order")
+            return None
+        self._last_id = rid
+        if rid != self._group_id:
+            self.removed += len(self._group)
+            self._group, self._group_id = [], rid
+            while self._ahead is not None and self._ahead[0]["id"] > rid:
+                self.removed += 1
+                self._read()
+            while self._ahead is not None and self._ahead[0]["id"] == rid:
+                self._group.append(self._ahead)
+                self._read()
+            if self.stopped:
+                return None
+            if not self._group:
+                self.added += 1
+                return None
+        for i, (_, text, old) in enumerate(self._group):
+            if old == digest:
+                self.reused += 1
+                return self._group.pop(i)[1]
+        # A repeated id can have more records than the file had rows.
+        if self._group:
+            self._group.pop(0)
+            self.changed += 1
+        else:
+            self.added += 1
+        return None
 
-        ref_mhz = None
+    def split(
+        self, chunk: List[Dict[str, Any]], digests: List[str]
+    ) -> Tuple[List[Optional[str]], List[Dict[str, Any]]]:
+        """(a match() result per non-RCV record, the records left to normalise) for a chunk.
+
+        `digests` is record_digests(chunk).
+        """
+        found: List[Optional[str]] = []
+        fresh: List[Dict[str, Any]] = []
+        records = (r for r in chunk if (r.get("configType") or "").upper() != "RCV")
+        for r, digest in zip(records, digests):
+            hit = self.match(r, digest)
+            found.append(hit)
+            if hit is None:
+                fresh.append(r)
+        return found, fresh
+
+    def finish(self) -> None:
+        """Counts the rows no record came for and closes the file."""
+        if self.stopped:
+            return
+        self.removed += len(self._group)
+        while self._ahead is not None:
+            self.removed += 1
+            self._read()
+        self._group = []
+        self._close()
+
+    def summary(self) -> str:
+        return (
+            f"Normalised {self.added} added and {self.changed} changed licence(s); "
+            f"reused {self.reused} row(s) from {self.path}, {self.removed} removed"
+        )
+
+
+def _with_reused(found: List[Optional[str]], rows: Iterable[Any], render: bool) -> Iterator[Any]:
+    """Rows in record order: reused ones from `found`, the rest from `rows` in turn.
+
+    Reused rows are kept as text, which takes far less memory than a dict.
+    """
+    fresh = iter(rows)
+    for text in found:
+        if text is None:
+            yield next(fresh)
+        else:
+            yield text if render else json.loads(text)
+
+
+def _split_chunk(
+    chunk: List[Dict[str, Any]], previous: Optional[PreviousRows], digests: Optional[RowDigestWriter]
+) -> Tuple[Optional[List[Optional[str]]], List[Dict[str, Any]]]:
+    """(rows reused from `previous` or None, the records left to normalise), recording digests on the way."""
+    if previous is None and digests is None:
+        return None, chunk
+    keys = record_digests(chunk)
+    if digests is not None:
+        digests.add(keys)
+    return previous.split(chunk, keys) if previous is not None else (None, chunk)
+
+
+def iter_normalised(
+    records: Iterable[Dict[str, Any]],
+    batch_size: int = NORMALISE_BATCH,
+    cache: Optional[TransformCache] = None,
+    mode: str = "auto",
+    workers: int = 1,
+    render: bool = False,
+    previous: Optional[PreviousRows] = None,
+    digests: Optional[RowDigestWriter] = None,
+) -> Iterator[Any]:
+    """Normalised rows for raw records, in order, RCV configurations dropped.
+
+    workers > 1 normalises in a process pool (iter_normalised_parallel).
+    `render` yields render_row() text instead of dicts, for write_json_array.
+    With `previous`, rows it matches are reused instead of normalised;
+    `digests` is given each row's record digest as the rows go out.
+    """
+    if workers > 1:
+        yield from iter_normalised_parallel(records, workers, batch_size, cache, mode, render, previous, digests)
+        return
+    transformers = build_transformers(cache, mode)
+    it = iter(records)
+    while True:
+        chunk = list(itertools.islice(it, batch_size))
+        if not chunk:
+            if previous is not None:
+                previous.finish()
+            return
+        found, chunk = _split_chunk(chunk, previous, digests)
+        rows = normalise_chunk(chunk, transformers)
+        out = map(render_row, rows) if render else rows
+        yield from (out if found is None else _with_reused(found, out, render))
+
+
+# Per-process state for the --workers pool, set up once by _init_normalise_worker.
+_worker_state: Dict[str, Any] = {}
+
+
+def _init_normalise_worker(mode: str, cache_size: Optional[int], cache_entries: List[Any]) -> None:
+    cache = None
+    if cache_size is not None:
+        cache = TransformCache(cache_size)
+        cache.entries.update(cache_entries)
+        cache.added = []
+    _worker_state["cache"] = cache
+    _worker_state["transformers"] = build_transformers(cache, mode)
+
+
+def _normalise_in_worker(chunk: List[Dict[str, Any]], render: bool) -> Tuple[List[Any], Any]:
+    cache = _worker_state["cache"]
+    rows: List[Any] = normalise_chunk(chunk, _worker_state["transformers"])
+    if render:
+        rows = [render_row(row) for row in rows]
+    return rows, (cache.take_delta() if cache is not None else None)
+
+
+def iter_normalised_parallel(
+    records: Iterable[Dict[str, Any]],
+    workers: int,
+    batch_size: int = NORMALISE_BATCH,
+    cache: Optional[TransformCache] = None,
+    mode: str = "auto",
+    render: bool = False,
+    previous: Optional[PreviousRows] = None,
+    digests: Optional[RowDigestWriter] = None,
+) -> Iterator[Any]:
+    """iter_normalised across a process pool, same rows in the same order.
+
+    Chunks of `batch_size` records go to `workers` processes, each with its
+    own transformers (and a copy of `cache`, whose new entries and counters
+    come back with every chunk). At most two chunks per worker are in flight,
+    so memory stays bounded while records stream in.
+
+    With `render`, rows come back as render_row() text for write_json_array.
+    Rendering is most of the per-row cost, and a string is far cheaper to
+    ship between processes than a dict, so that is the mode that scales.
+
+    Workers start from a fresh interpreter (forkserver, or spawn where that
+    is missing) rather than fork: the fetch threads are running by then, and
+    a forked child can inherit a lock one of them holds.
+    """
+    initargs = (
+        mode,
+        cache.maxsize if cache is not None else None,
+        list(cache.entries.items()) if cache is not None else [],
+    )
+    method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    pool = ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context(method),
+        initializer=_init_normalise_worker,
+        initargs=initargs,
+    )
+    try:
+        # Matching against `previous` stays in this process; only the records
+        # left to normalise go to the workers.
+        pending: Deque[Tuple[Optional[List[Any]], Future]] = deque()
+        it = iter(records)
+        while True:
+            while len(pending) < 2 * workers:
+                chunk = list(itertools.islice(it, batch_size))
+                if not chunk:
+                    break
+                found, chunk = _split_chunk(chunk, previous, digests)
+                pending.append((found, pool.submit(_normalise_in_worker, chunk, render)))
+            if not pending:
+                if previous is not None:
+                    previous.finish()
+                return
+            found, future = pending.popleft()
+            rows, delta = future.result()
+            if delta is not None and cache is not None:
+                cache.merge_delta(delta)
+            yield from (rows if found is None else _with_reused(found, rows, render))
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def normalise_records(
+    records: List[Dict[str, Any]],
+    cache: Optional[TransformCache] = None,
+    mode: str = "auto",
+    workers: int = 1,
+) -> List[Dict[str, Any]]:
+    return list(iter_normalised(records, cache=cache, mode=mode, workers=workers))
+
+
+def merge_records(
+    existing: Iterable[Dict[str, Any]], updates: List[Dict[str, Any]]
+) -> Iterator[Dict[str, Any]]:
+    """Merge freshly normalised rows into a previous run's rows by licence id.
+
+    Rows for an updated id replace the old ones in place; unseen ids are
+    prepended in fetch order (newest first). `existing` is read twice and
+    the merge is streamed, so a LicenceTable never expands into a list.
+    """
+    by_id: Dict[Any, List[Dict[str, Any]]] = {}
+    for r in updates:
+        by_id.setdefault(r.get("id"), []).append(r)
+
+    existing_ids = {r.get("id") for r in existing}
+    for r in updates:
+        if r.get("id") not in existing_ids:
+            yield r
+    emitted = set()
+    for r in existing:
+        rid = r.get("id")
+        if rid not in by_id:
+            yield r
+        elif rid not in emitted:
+            emitted.add(rid)
+            yield from by_id[rid]
+
+
+# ---- Licence table -----------------------------------------------------------
+# A compact in-memory form of normalised rows for whole-dataset work: numeric
+# fields in array('d'), dates as epoch days, and every other field
+# dictionary-encoded (licensees, sites, bands and districts repeat a lot).
+# Rows read back exactly as they went in, key order included, so
+# write_json_array(path, table) writes the same bytes as the list of dicts.
+
+NUMBER_FIELDS = ("id", "lat", "lon", "refFrequencyMHz", "lowerBoundMHz", "upperBoundMHz", "bandwidthMHz")
+DATE_FIELDS = ("commencementDate", "expiryDate", "certificationDate", "lastUpdatedDate")
+
+# Per-row value kinds in _NumberColumn / _DateColumn.
+_FLOAT, _NULL, _INT, _OTHER = 0, 1, 2, 3
+_EPOCH_ORDINAL = 719163  # date(1970, 1, 1).toordinal()
+_NAN = float("nan")
+
+
+class _NumberColumn:
+    """Floats in array('d') (NaN where null); ints flagged, anything else kept aside."""
+
+    __slots__ = ("values", "kinds", "other")
+
+    def __init__(self) -> None:
+        self.values = array("d")
+        self.kinds = bytearray()
+        self.other: Dict[int, Any] = {}
+
+    def append(self, v: Any) -> None:
+        t = type(v)
+        if t is float:
+            self.values.append(v)
+            self.kinds.append(_FLOAT)
+        elif v is None:
+            self.values.append(_NAN)
+            self.kinds.append(_NULL)
+        elif t is int and -(2**53) <= v <= 2**53:
+            self.values.append(v)
+            self.kinds.append(_INT)
+        else:
+            self.other[len(self.kinds)] = v
+            self.values.append(_NAN)
+            self.kinds.append(_OTHER)
+
+    def get(self, i: int) -> Any:
+        k = self.kinds[i]
+        if k == _FLOAT:
+            return self.values[i]
+        if k == _INT:
+            return int(self.values[i])
+        return None if k == _NULL else self.other[i]
+
+
+class _DictColumn:
+    """Dictionary-encoded values; lists are stored as tuples and handed back as lists."""
+
+    __slots__ = ("codes", "values", "index", "other")
+
+    def __init__(self) -> None:
+        self.codes = array("I")
+        self.values: List[Any] = []
+        self.index: Dict[Any, int] = {}
+        self.other: Dict[int, Any] = {}  # unhashable values, by row
+
+    def encode(self, v: Any) -> int:
+        # Non-strings are keyed by type too: True, 1 and 1.0 are equal dict
+        # keys but not the same JSON.
+        t = type(v)
+        key = v if t is str else (t, tuple(v) if t is list else v)
+        code = self.index.get(key)
+        if code is None:
+            code = self.index[key] = len(self.values)
+            self.values.append(v if t is str else key[1])
+        return code
+
+    def append(self, v: Any) -> None:
         try:
-            if r.get("refFrequency") is not None:
-                ref_mhz = float(r["refFrequency"])
-        except Exception:
-            ref_mhz = None
+            self.codes.append(self.encode(v))
+        except TypeError:
+            self.other[len(self.codes)] = v
+            self.codes.append(0xFFFFFFFF)
+
+    def get(self, i: int) -> Any:
+        code = self.codes[i]
+        if code == 0xFFFFFFFF:
+            return self.other[i]
+        v = self.values[code]
+        return list(v) if type(v) is tuple else v
+
+
+class _DateColumn:
+    """ISO dates as epoch days in array('i') plus a dictionary-encoded remainder ("T09:30:00")."""
+
+    __slots__ = ("days", "kinds", "rest", "other")
+
+    def __init__(self) -> None:
+        self.days = array("i")
+        self.kinds = bytearray()
+        self.rest = _DictColumn()
+        self.other: Dict[int, Any] = {}
+
+    def append(self, v: Any) -> None:
+        day = None
+        if type(v) is str and len(v) >= 10 and v[4] == "-" and v[7] == "-":
+            try:
+                d = date(int(v[0:4]), int(v[5:7]), int(v[8:10]))
+                if d.isoformat() == v[:10]:
+                    day = d.toordinal() - _EPOCH_ORDINAL
+            except ValueError:
+                pass
+        if day is not None:
+            self.days.append(day)
+            self.kinds.append(_FLOAT)
+            self.rest.append(v[10:])
+            return
+        self.days.append(0)
+        self.rest.append("")
+        if v is None:
+            self.kinds.append(_NULL)
+        else:
+            self.other[len(self.kinds)] = v
+            self.kinds.append(_OTHER)
+
+    def get(self, i: int) -> Any:
+        k = self.kinds[i]
+        if k == _FLOAT:
+            return date.fromordinal(self.days[i] + _EPOCH_ORDINAL).isoformat() + self.rest.get(i)
+        return None if k == _NULL else self.other[i]
+
+
+def _new_column(name: str) -> Any:
+    if name in NUMBER_FIELDS:
+        return _NumberColumn()
+    if name in DATE_FIELDS:
+        return _DateColumn()
+    return _DictColumn()
+
+
+class LicenceRow(MappingABC):
+    """Read-only dict-shaped view of one LicenceTable row."""
+
+    __slots__ = ("_table", "_i")
+
+    def __init__(self, table: "LicenceTable", i: int) -> None:
+        self._table = table
+        self._i = i
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self._keys():
+            raise KeyError(key)
+        return self._table.columns[key].get(self._i)
+
+    def _keys(self) -> Tuple[str, ...]:
+        return self._table.shapes[self._table.row_shapes[self._i]]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._keys())
 
-        district_codes = r.get("locationDistrictCodes") or []
-        if isinstance(district_codes, str):
-            district_codes = [district_codes]
+    def __len__(self) -> int:
+        return len(self._keys())
 
-        out.append(
+    def to_dict(self) -> Dict[str, Any]:
+        return self._table.row_dict(self._i)
+
+
+class LicenceTable:
+    """Column store for normalised licence rows (see the section comment).
+
+    table[i] is a LicenceRow view; iterating yields plain dicts one at a time,
+    so anything that consumes a list of rows (write_json_array, merge_records)
+    takes a table as-is. column(name) exposes the raw column for fast scans.
+    """
+
+    __slots__ = ("columns", "shapes", "shape_index", "row_shapes")
+
+    def __init__(self) -> None:
+        self.columns: Dict[str, Any] = {}
+        self.shapes: List[Tuple[str, ...]] = []  # distinct key orders, usually one
+        self.shape_index: Dict[Tuple[str, ...], int] = {}
+        self.row_shapes = array("H")
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Dict[str, Any]]) -> "LicenceTable":
+        table = cls()
+        for row in rows:
+            table.append(row)
+        return table
+
+    def append(self, row: Dict[str, Any]) -> None:
+        keys = tuple(row)
+        shape = self.shape_index.get(keys)
+        if shape is None:
+            shape = self.shape_index[keys] = len(self.shapes)
+            self.shapes.append(keys)
+            n = len(self.row_shapes)
+            for key in keys:
+                if key not in self.columns:
+                    col = self.columns[key] = _new_column(key)
+                    for _ in range(n):
+                        col.append(None)  # earlier rows don't have it
+        self.row_shapes.append(shape)
+        for key, col in self.columns.items():
+            col.append(row.get(key))
+
+    def __len__(self) -> int:
+        return len(self.row_shapes)
+
+    def __getitem__(self, i: int) -> LicenceRow:
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        return LicenceRow(self, i)
+
+    def row_dict(self, i: int) -> Dict[str, Any]:
+        columns = self.columns
+        return {key: columns[key].get(i) for key in self.shapes[self.row_shapes[i]]}
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for i in range(len(self)):
+            yield self.row_dict(i)
+
+    def column(self, name: str) -> Any:
+        """The raw column: .values (array('d'), NaN = null) for numbers,
+        .days (epoch days) for dates, .codes/.values for everything else."""
+        return self.columns[name]
+
+    def floats(self, name: str) -> array:
+        return self.columns[name].values
+
+    def epoch_days(self, name: str) -> array:
+        return self.columns[name].days
+
+    def codes(self, name: str) -> Tuple[array, List[Any]]:
+        col = self.columns[name]
+        return col.codes, col.values
+
+
+# ---- Delta patches -----------------------------------------------------------
+# Returning browsers keep a patched copy of rrf_licences.json and read the small
+# <delta dir>/manifest.json first. Each delta file holds the rows added and
+# changed, and the ids removed, between two consecutive versions of the file;
+# a version is the first 16 hex digits of the file's SHA-256, which the
+# frontend recomputes when it downloads the full file.
+
+DELTA_FORMAT = 1
+_DELTA_NAME = re.compile(r"^[0-9a-f]{16}-[0-9a-f]{16}\.json$")
+
+
+def file_version(path: str) -> Optional[str]:
+    """Version id of a data file, or None if it does not exist."""
+    h = hashlib.sha256()
+    try:
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                h.update(block)
+    except FileNotFoundError:
+        return None
+    return h.hexdigest()[:16]
+
+
+def _row_digests(path: str) -> Tuple[Dict[Any, bytes], List[Any]]:
+    """id -> digest of the text of its rows, and each row's id in file order, read a chunk at a time."""
+    digests: Dict[Any, bytes] = {}
+    ids: List[Any] = []
+    for row, text in json_array_items(path):
+        rid = row.get("id")
+        # Hash the row's own text: write_json_array renders equal rows identically.
+        # A repeated id chains onto its previous digest (a hash object per id
+        # would cost far more than the 16 bytes kept).
+        h = hashlib.blake2b(digests.get(rid, b""), digest_size=16)
+        h.update(text.encode("utf-8"))
+        digests[rid] = h.digest()
+        ids.append(rid)
+    return digests, ids
+
+
+def snapshot_rows(path: str) -> Optional[Tuple[str, Dict[Any, bytes], List[Any]]]:
+    """(version, id -> digest of its rows, row ids in order) of a data file, read before it is replaced."""
+    version = file_version(path)
+    if version is None:
+        return None
+    try:
+        return (version, *_row_digests(path))
+    except ValueError as e:
+        print(f"NOTE: no delta from unreadable {path} ({e})")
+        return None
+
+
+def _outside_increasing_run(values: List[int]) -> List[int]:
+    """Indices of `values` not in one of its longest increasing runs (patience sorting)."""
+    tails: List[int] = []  # tails[k]: last index of the best run of length k + 1
+    tail_values: List[int] = []
+    back = [-1] * len(values)
+    for i, v in enumerate(values):
+        k = bisect.bisect_left(tail_values, v)
+        if k:
+            back[i] = tails[k - 1]
+        if k == len(tails):
+            tails.append(i)
+            tail_values.append(v)
+        else:
+            tails[k] = i
+            tail_values[k] = v
+    run = set()
+    i = tails[-1] if tails else -1
+    while i >= 0:
+        run.add(i)
+        i = back[i]
+    return [i for i in range(len(values)) if i not in run]
+
+
+def _patched_ids(before_ids: List[Any], delta: Dict[str, List[Any]]) -> Iterator[Any]:
+    """Row ids apply_delta would give `before_ids`' rows, skipping the added ones."""
+    removed = set(delta["removed"])
+    changed: Dict[Any, int] = {}
+    for row in delta["changed"]:
+        changed[row.get("id")] = changed.get(row.get("id"), 0) + 1
+    emitted = set()
+    for rid in before_ids:
+        if rid in removed:
+            continue
+        if rid not in changed:
+            yield rid
+        elif rid not in emitted:
+            emitted.add(rid)
+            yield from itertools.repeat(rid, changed[rid])
+
+
+def diff_rows(before: Dict[Any, bytes], before_ids: List[Any], path: str) -> Optional[Dict[str, List[Any]]]:
+    """Rows added and changed, and ids removed, going from `before` to the file at `path`.
+
+    `at` holds each added row's index in the new file, so patching keeps the
+    file's order. A row whose place among the other rows changed is sent as
+    removed and added again at its new index. The file is read twice,
+    digests first, so only the rows that differ are held.
+
+    The delta is checked against the new file's row ids. If apply_delta would
+    put them in another order, which repeated ids can cause, every repeated
+    id is sent again in full; None means even that did not reproduce it.
+    """
+    after, ids = _row_digests(path)
+    delta = _diff_rows(before, before_ids, after, ids, path, set())
+    if delta is None:
+        repeated = {rid for rid, n in Counter(before_ids).items() if n > 1}
+        repeated |= {rid for rid, n in Counter(ids).items() if n > 1}
+        delta = _diff_rows(before, before_ids, after, ids, path, repeated)
+    return delta
+
+
+def _diff_rows(
+    before: Dict[Any, bytes],
+    before_ids: List[Any],
+    after: Dict[Any, bytes],
+    ids: List[Any],
+    path: str,
+    resend: set,
+) -> Optional[Dict[str, List[Any]]]:
+    # Ids in both files, in new-file order; those outside the longest run
+    # still in old-file order moved.
+    rank = {rid: i for i, rid in enumerate(before)}
+    common = [rid for rid in after if rid in rank and rid not in resend]
+    moved = {common[i] for i in _outside_increasing_run([rank[rid] for rid in common])}
+    moved |= resend & before.keys() & after.keys()
+    picked = {rid for rid, digest in after.items() if before.get(rid) != digest} | moved
+    added: List[Dict[str, Any]] = []
+    at: List[int] = []
+    changed: List[Dict[str, Any]] = []
+    for i, (row, _) in enumerate(json_array_items(path)):
+        rid = row.get("id")
+        if rid not in picked:
+            continue
+        if rid in before and rid not in moved:
+            changed.append(row)
+        else:
+            added.append(row)
+            at.append(i)
+    removed = [rid for rid in before if rid not in after or rid in moved]
+    delta = {"added": added, "at": at, "changed": changed, "removed": removed}
+
+    skip = set(at)
+    expected = (rid for i, rid in enumerate(ids) if i not in skip)
+    end = object()
+    patched = _patched_ids(before_ids, delta)
+    if any(a != b for a, b in itertools.zip_longest(patched, expected, fillvalue=end)):
+        return None
+    return delta
+
+
+def apply_delta(rows: Iterable[Dict[str, Any]], delta: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Patches rows with a delta; the same steps as applyDelta in the page.
+
+    Removed ids are dropped and changed ids keep their place; added rows go
+    in at their `at` index, which reproduces the new file exactly when the
+    rows were its previous version.
+    """
+    removed = set(delta.get("removed") or [])
+    changed: Dict[Any, List[Dict[str, Any]]] = {}
+    for row in delta.get("changed") or []:
+        changed.setdefault(row.get("id"), []).append(row)
+
+    kept: List[Dict[str, Any]] = []
+    emitted = set()
+    for r in rows:
+        rid = r.get("id")
+        if rid in removed:
+            continue
+        if rid not in changed:
+            kept.append(r)
+        elif rid not in emitted:
+            emitted.add(rid)
+            kept.extend(changed[rid])
+
+    out: List[Dict[str, Any]] = []
+    rest = iter(kept)
+    for pos, row in zip(delta.get("at") or [], delta.get("added") or []):
+        out.extend(itertools.islice(rest, max(0, pos - len(out))))
+        out.append(row)
+    out.extend(rest)
+    return out
+
+
+def write_delta(
+    delta_dir: str,
+    json_path: str,
+    row_count: int,
+    before: Optional[Tuple[str, Dict[Any, bytes], List[Any]]],
+    keep: int = 30,
+) -> Optional[Dict[str, Any]]:
+    """Records the step from `before` to `json_path` in `delta_dir`.
+
+    Writes the delta file (when the version changed), then manifest.json
+    listing the newest `keep` deltas, then drops delta files the manifest no
+    longer lists. Returns the new manifest entry, or None if there is none.
+    """
+    version = file_version(json_path)
+    manifest_path = os.path.join(delta_dir, "manifest.json")
+    deltas: List[Dict[str, Any]] = []
+    try:
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            previous = json.load(f)
+        if previous.get("format") == DELTA_FORMAT:
+            deltas = list(previous.get("deltas") or [])
+    except FileNotFoundError:
+        pass
+    except (OSError, ValueError) as e:
+        print(f"NOTE: starting a new delta manifest ({manifest_path}: {e})")
+
+    entry = None
+    delta = None
+    if before is not None and before[0] != version:
+        delta = diff_rows(before[1], before[2], json_path)
+        if delta is None:
+            print(f"NOTE: no delta {before[0]} -> {version}: patching could not reproduce the row order")
+    if before is not None and delta is not None:
+        name = f"{before[0]}-{version}.json"
+        text = json.dumps(
+            {"format": DELTA_FORMAT, "from": before[0], "to": version, **delta},
+            ensure_ascii=False,
+            separators=(",", ":"),
+        )
+        write_text_file(os.path.join(delta_dir, name), text)
+        entry = {
+            "from": before[0],
+            "to": version,
+            "path": name,
+            "added": len(delta["added"]),
+            "changed": len(delta["changed"]),
+            "removed": len(delta["removed"]),
+            "bytes": len(text.encode("utf-8")),
+        }
+        deltas = [d for d in deltas if d.get("path") != name] + [entry]
+
+    deltas = deltas[-keep:] if keep > 0 else []
+    manifest = {"format": DELTA_FORMAT, "version": version, "rows": row_count, "deltas": deltas}
+    write_text_file(manifest_path, json.dumps(manifest, ensure_ascii=False, indent=2) + "\n")
+
+    listed = {d.get("path") for d in deltas}
+    for name in os.listdir(delta_dir):
+        if _DELTA_NAME.match(name) and name not in listed:
+            os.remove(os.path.join(delta_dir, name))
+    return entry
+
+
+# ---- Columnar output -----------------------------------------------------------
+# --columnar-out writes the rows of rrf_licences.json as one array per field:
+# numbers as-is (ids as differences), dates as epoch days, and repetitive
+# fields (licensee, location, bands, status, licence type, districts) as
+# codes into a dictionary of distinct values. The page decodes it straight
+# into row objects (decodeColumns); decode_columns here is the same in Python.
+
+COLUMNS_FORMAT = "rrf-columns/1"
+
+
+def _column_values(col: Any, n: int) -> List[Any]:
+    return [col.get(i) for i in range(n)]
+
+
+def _encode_column(col: Any, n: int) -> Dict[str, Any]:
+    if col.other:
+        # Values the compact column keeps aside (odd types); written as they are.
+        return {"type": "plain", "values": _column_values(col, n)}
+    if isinstance(col, _NumberColumn):
+        values = [None if k == _NULL else (int(v) if k == _INT else v) for v, k in zip(col.values, col.kinds)]
+        if values and all(k == _INT for k in col.kinds):
+            return {"type": "delta", "values": [values[0]] + [b - a for a, b in zip(values, values[1:])]}
+        return {"type": "number", "values": values}
+    if isinstance(col, _DateColumn):
+        out: Dict[str, Any] = {"type": "days", "days": [None if k == _NULL else d for d, k in zip(col.days, col.kinds)]}
+        if col.rest.values != [""]:
+            out["rest"] = _encode_column(col.rest, n)  # time of day, e.g. "T09:30:00"
+        return out
+    if len(col.values) * 2 > n:
+        # Mostly distinct (licenceNo): a dictionary would only add the codes.
+        return {"type": "plain", "values": _column_values(col, n)}
+    return {"type": "dict", "dict": [list(v) if type(v) is tuple else v for v in col.values], "codes": list(col.codes)}
+
+
+def encode_columns(table: LicenceTable, version: Optional[str] = None) -> Dict[str, Any]:
+    """The columnar document for a table; `version` is that of the rows file it mirrors."""
+    n = len(table)
+    doc: Dict[str, Any] = {
+        "format": COLUMNS_FORMAT,
+        "version": version,
+        "rows": n,
+        "shapes": [list(keys) for keys in table.shapes],
+        "columns": {name: _encode_column(col, n) for name, col in table.columns.items()},
+    }
+    if len(table.shapes) > 1:
+        doc["shape"] = list(table.row_shapes)
+    return doc
+
+
+def _decode_column(col: Dict[str, Any]) -> List[Any]:
+    kind = col["type"]
+    if kind == "dict":
+        values = col["dict"]
+        return [values[c] for c in col["codes"]]
+    if kind == "delta":
+        return list(itertools.accumulate(col["values"]))
+    if kind == "days":
+        rest = _decode_column(col["rest"]) if "rest" in col else itertools.repeat("")
+        return [
+            None if d is None else date.fromordinal(d + _EPOCH_ORDINAL).isoformat() + r
+            for d, r in zip(col["days"], rest)
+        ]
+    return col["values"]
+
+
+def decode_columns(doc: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """Rows of a columnar document, as they were in the rows file."""
+    if doc.get("format") != COLUMNS_FORMAT:
+        raise ValueError(f"Not a {COLUMNS_FORMAT} document")
+    n = doc["rows"]
+    columns = {name: _decode_column(col) for name, col in doc["columns"].items()}
+    shapes = doc["shapes"]
+    row_shapes = doc.get("shape") or itertools.repeat(0, n)
+    for i, shape in enumerate(row_shapes):
+        row = {}
+        for key in shapes[shape]:
+            v = columns[key][i]
+            row[key] = list(v) if type(v) is list else v  # a list per row, like json.load
+        yield row
+
+
+def write_columnar(path: str, table: LicenceTable, version: Optional[str] = None) -> int:
+    """Writes the columnar document for `table`; returns its size in bytes."""
+    text = json.dumps(encode_columns(table, version), ensure_ascii=False, separators=(",", ":"))
+    write_text_file(path, text)
+    return len(text.encode("utf-8"))
+
+
+# ---- Binary dataset ------------------------------------------------------------
+# --binary-out writes the table as one buffer the page wraps in typed arrays
+# instead of parsing: "RRFB", a uint32 format and a uint32 header length, a
+# JSON header describing the columns, then 8-byte aligned little-endian
+# columns and a UTF-8 string table (uint32 offsets + bytes). lat/lon are
+# float32 (about a metre at NZ longitudes); other numbers keep full float64
+# precision, or int32 when every value is an integer. Dictionary codes are
+# uint8/16/32 by dictionary size, dictionary values are JSON strings in the
+# table, and dates are int32 epoch days.
+
+BINARY_MAGIC = b"RRFB"
+BINARY_FORMAT = 1
+FLOAT32_FIELDS = ("lat", "lon")
+_BINARY_DAY_NULL = -(2**31)
+_BINARY_NO_STRING = 0xFFFFFFFF
+_BINARY_ARRAYS = {"u8": "B", "u16": "H", "u32": "I", "i32": "i", "f32": "f", "f64": "d"}
+
+
+def array_bytes(kind: str, values: Iterable[Any]) -> bytes:
+    """Little-endian bytes of an array of `kind` (array module typecode)."""
+    data = array(kind, values)
+    if sys.byteorder == "big":
+        data.byteswap()
+    return data.tobytes()
+
+
+class _BinaryWriter:
+    """Aligned column blobs and the string table, laid out after the header."""
+
+    def __init__(self) -> None:
+        self.body = bytearray()
+        self.strings = array("I", [0])
+        self.string_data = bytearray()
+
+    def string(self, text: str) -> int:
+        self.string_data += text.encode("utf-8")
+        self.strings.append(len(self.string_data))
+        return len(self.strings) - 2
+
+    def put(self, kind: str, values: Iterable[Any]) -> Dict[str, Any]:
+        self.body += b"\0" * (-len(self.body) % 8)
+        offset = len(self.body)
+        self.body += array_bytes(_BINARY_ARRAYS[kind], values)
+        return {"array": kind, "offset": offset}
+
+    def put_strings(self) -> Dict[str, Any]:
+        table = self.put("u32", self.strings)
+        data = self.put("u8", self.string_data)
+        return {
+            "count": len(self.strings) - 1,
+            "offsets": table["offset"],
+            "data": data["offset"],
+            "length": len(self.string_data),
+        }
+
+
+def _code_array(count: int) -> str:
+    return "u8" if count <= 0xFF else "u16" if count <= 0xFFFF else "u32"
+
+
+def _binary_column(out: _BinaryWriter, name: str, col: Any, n: int) -> Dict[str, Any]:
+    if col.other:
+        # Values the compact column keeps aside (odd types): one JSON string per row.
+        codes = [out.string(json.dumps(v, ensure_ascii=False)) for v in _column_values(col, n)]
+        return {"type": "json", **out.put("u32", codes)}
+    if isinstance(col, _NumberColumn):
+        if name in FLOAT32_FIELDS:
+            return {"type": "number", **out.put("f32", col.values)}
+        if all(k == _INT for k in col.kinds) and all(-(2**31) < v < 2**31 for v in col.values):
+            return {"type": "number", **out.put("i32", (int(v) for v in col.values))}
+        return {"type": "number", **out.put("f64", col.values)}  # NaN = null
+    if isinstance(col, _DateColumn):
+        days = (_BINARY_DAY_NULL if k == _NULL else d for d, k in zip(col.days, col.kinds))
+        desc = {"type": "days", **out.put("i32", days)}
+        if col.rest.values != [""]:
+            desc["rest"] = _binary_column(out, name, col.rest, n)
+        return desc
+    if len(col.values) * 2 > n and all(v is None or type(v) is str for v in col.values):
+        # Mostly distinct strings (licenceNo): one table entry per row.
+        entries = [_BINARY_NO_STRING if v is None else out.string(v) for v in col.values]
+        return {"type": "str", **out.put("u32", (entries[c] for c in col.codes))}
+    first = len(out.strings) - 1
+    for v in col.values:
+        out.string(json.dumps(list(v) if type(v) is tuple else v, ensure_ascii=False))
+    desc = {"type": "dict", **out.put(_code_array(len(col.values)), col.codes)}
+    desc["dict"] = [first, len(col.values)]
+    return desc
+
+
+def encode_binary(table: LicenceTable, version: Optional[str] = None) -> bytes:
+    """The binary dataset for a table; `version` is that of the rows file it mirrors."""
+    n = len(table)
+    out = _BinaryWriter()
+    header: Dict[str, Any] = {
+        "version": version,
+        "rows": n,
+        "shapes": [list(keys) for keys in table.shapes],
+        "columns": {name: _binary_column(out, name, col, n) for name, col in table.columns.items()},
+    }
+    if len(table.shapes) > 1:
+        header["shape"] = out.put(_code_array(len(table.shapes)), table.row_shapes)
+    header["strings"] = out.put_strings()
+
+    head = json.dumps(header, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    prefix = BINARY_MAGIC + array_bytes("I", [BINARY_FORMAT, len(head)]) + head
+    return bytes(prefix + b"\0" * (-len(prefix) % 8) + out.body)
+
+
+def write_binary(path: str, table: LicenceTable, version: Optional[str] = None) -> int:
+    """Writes the binary dataset for `table`; returns its size in bytes."""
+    data = encode_binary(table, version)
+    tmp = f"{path}.tmp"
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+    return len(data)
+
+
+# ---- District shards -----------------------------------------------------------
+# --shard-dir splits the rows by district so the page can fetch only the part
+# of the country it is showing: one columnar document (encode_columns) per
+# shard and a manifest.json listing each shard's file, row count, bounding
+# box and the district codes its rows carry. A row goes in the shard of its
+# first district code (rows without one in "other"), so no row is sent twice.
+# The manifest also lists every district, band and licensee, for the filter
+# controls the page builds before any shard has arrived.
+
+SHARDS_FORMAT = "rrf-shards/1"
+SHARD_OTHER = "other"
+SHARD_MANIFEST = "manifest.json"
+_SHARD_NAME = re.compile(r"^[A-Za-z0-9_-]+\.json$")
+
+
+def _district_codes(row: Dict[str, Any]) -> List[str]:
+    codes = row.get("locationDistrictCodes") or []
+    return [str(c) for c in ([codes] if isinstance(codes, str) else codes)]
+
+
+def _row_bands(row: Dict[str, Any]) -> List[str]:
+    # Same fallback as the page: rows from before bandCodes only have bandCode.
+    return list(row.get("bandCodes") or [row.get("bandCode") or "unknown"])
+
+
+class _Catalogue:
+    """Every district, band and licensee in the rows, for the page's filter controls."""
+
+    def __init__(self) -> None:
+        self.districts: set = set()
+        self.bands: set = set()
+        self.licensees: set = set()
+
+    def add(self, row: Dict[str, Any]) -> None:
+        self.districts.update(_district_codes(row))
+        self.bands.update(_row_bands(row))
+        if row.get("licensee"):
+            self.licensees.add(str(row["licensee"]))
+
+    def fields(self) -> Dict[str, List[str]]:
+        return {
+            "districts": sorted(self.districts),
+            "bands": sorted(self.bands),
+            "licensees": sorted(self.licensees),
+        }
+
+
+def shard_key(row: Dict[str, Any]) -> str:
+    """The shard a row is written to: its first district code, or SHARD_OTHER."""
+    codes = _district_codes(row)
+    return codes[0] if codes else SHARD_OTHER
+
+
+def _shard_bbox(table: LicenceTable) -> Optional[List[float]]:
+    """[south, west, north, east] of the rows with coordinates, or None."""
+    if "lat" not in table.columns or "lon" not in table.columns:
+        return None
+    points = [
+        (lat, lon)
+        for lat, lon in zip(table.floats("lat"), table.floats("lon"))
+        if math.isfinite(lat) and math.isfinite(lon)
+    ]
+    if not points:
+        return None
+    lats, lons = [p[0] for p in points], [p[1] for p in points]
+    return [min(lats), min(lons), max(lats), max(lons)]
+
+
+def _remove_with_siblings(path: str) -> None:
+    for p in (path, f"{path}.gz", f"{path}.br"):
+        if os.path.exists(p):
+            os.remove(p)
+
+
+def _previous_manifest(path: str, fmt: str) -> Dict[str, Any]:
+    """The manifest a previous run left at `path`, or {} if there is none of format `fmt`."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        print(f"NOTE: ignoring unreadable {path} ({e})")
+        return {}
+    return manifest if isinstance(manifest, dict) and manifest.get("format") == fmt else {}
+
+
+def write_shards(
+    shard_dir: str, table: LicenceTable, version: Optional[str] = None, precompress: bool = True
+) -> Dict[str, Any]:
+    """Writes one shard per district and the manifest; returns the manifest.
+
+    Shards keep the order of `table`. Each manifest entry carries the shard's
+    own version (a digest of its file) so unchanged shards stay byte-identical
+    between runs. Shards the previous manifest listed and this one doesn't
+    are deleted; no other file in `shard_dir` is touched.
+    """
+    manifest_path = os.path.join(shard_dir, SHARD_MANIFEST)
+    previous = _previous_manifest(manifest_path, SHARDS_FORMAT)
+    parts: Dict[str, LicenceTable] = {}
+    districts: Dict[str, set] = {}
+    catalogue = _Catalogue()
+    for row in table:
+        key = shard_key(row)
+        part = parts.get(key)
+        if part is None:
+            part = parts[key] = LicenceTable()
+            districts[key] = set()
+        part.append(row)
+        districts[key].update(_district_codes(row))
+        catalogue.add(row)
+
+    shards = []
+    for key in sorted(parts):
+        part = parts[key]
+        name = re.sub(r"[^A-Za-z0-9_-]", "_", key) + ".json"
+        path = os.path.join(shard_dir, name)
+        text = json.dumps(encode_columns(part), ensure_ascii=False, separators=(",", ":"))
+        data = text.encode("utf-8")
+        write_text_file(path, text)
+        write_precompressed(path, precompress)
+        shards.append(
             {
-                "id": r.get("id"),
-                "licenceNo": r.get("licenceNo"),
-                "licensee": r.get("licensee"),
-                "location": r.get("location"),
-                "locationDistrictCodes": district_codes,
-                "refFrequencyMHz": ref_mhz,
-                "bandCode": classify_band(ref_mhz),
-                "lowerBoundMHz": lower,
-                "upperBoundMHz": upper,
-                "bandwidthMHz": bandwidth,
-                "power": r.get("power"),
-                "configType": r.get("configType"),
-                "licenceTypeCode": r.get("licenceTypeCode"),
-                "licenceTypeDescription": r.get("licenceTypeDescription"),
-                "licenceStatus": r.get("licenceStatus"),
-                "suppressed": r.get("suppressed"),
-                "commencementDate": iso_date_or_none(r.get("commencementDate")),
-                "expiryDate": iso_date_or_none(r.get("expiryDate")),
-                "certificationDate": iso_date_or_none(r.get("certificationDate")),
-                "lastUpdatedDate": iso_date_or_none(r.get("lastUpdatedDate")),
-                "lat": lat,
-                "lon": lon,
-                "geoSource": geo_src,
+                "key": key,
+                "path": name,
+                "rows": len(part),
+                "bbox": _shard_bbox(part),
+                "districts": sorted(districts[key]),
+                "version": hashlib.sha256(data).hexdigest()[:16],
+                "bytes": len(data),
             }
         )
-    return out
+
+    manifest = {
+        "format": SHARDS_FORMAT,
+        "version": version,
+        "rows": len(table),
+        **catalogue.fields(),
+        "shards": shards,
+    }
+    write_text_file(manifest_path, json.dumps(manifest, ensure_ascii=False, separators=(",", ":")))
+    write_precompressed(manifest_path, precompress, BROTLI_QUALITY_SMALL)
+
+    # Only after the new manifest is in place, so no listed shard goes missing.
+    listed = {s["path"] for s in shards} | {SHARD_MANIFEST}
+    for entry in previous.get("shards") or []:
+        name = entry.get("path") if isinstance(entry, dict) else None
+        if isinstance(name, str) and _SHARD_NAME.match(name) and name not in listed:
+            _remove_with_siblings(os.path.join(shard_dir, name))
+    return manifest
+
+
+# ---- Tile pyramid --------------------------------------------------------------
+# --tile-dir writes the rows with coordinates as Web Mercator z/x/y tiles for
+# the page's tile layer. At TILE_DETAIL_ZOOM a tile holds its rows (a columnar
+# document, like a shard), which the page also uses when zoomed in further.
+# Below it, from TILE_MIN_ZOOM, a tile holds one entry per TILE_CELL-pixel
+# cell: the mean position of its rows and their counts by licensee and band
+# set, enough to draw the cell and filter it by carrier and band without the
+# rows. Empty tiles are not written; manifest.json lists the ones that are.
+
+TILES_FORMAT = "rrf-tiles/1"
+TILE_MANIFEST = "manifest.json"
+TILE_MIN_ZOOM = 5
+TILE_DETAIL_ZOOM = 10
+TILE_SIZE = 256
+TILE_CELL = 32
+_TILE_ZOOM = re.compile(r"^[0-9]{1,2}$")
+_TILE_NAME = re.compile(r"^[0-9]+/[0-9]+$")
+
+
+def tile_position(lat: float, lon: float, zoom: int) -> Tuple[float, float]:
+    """(x, y) of a point in tiles at `zoom`; the integer parts name its tile."""
+    n = 2**zoom
+    s = math.sin(math.radians(max(-85.0511, min(85.0511, lat))))
+    x = (lon + 180.0) / 360.0 * n % n
+    y = (0.5 - math.log((1 + s) / (1 - s)) / (4 * math.pi)) * n
+    return x, y
+
+
+class _TileCell:
+    """Running totals for one overview cell."""
+
+    __slots__ = ("rows", "lat", "lon", "counts")
+
+    def __init__(self) -> None:
+        self.rows = 0
+        self.lat = 0.0
+        self.lon = 0.0
+        self.counts: Dict[Tuple[str, Tuple[str, ...]], int] = {}
+
+    def add(self, lat: float, lon: float, key: Tuple[str, Tuple[str, ...]]) -> None:
+        self.rows += 1
+        self.lat += lat
+        self.lon += lon
+        self.counts[key] = self.counts.get(key, 0) + 1
+
+    def entry(self) -> Dict[str, Any]:
+        return {
+            "lat": round(self.lat / self.rows, 5),
+            "lon": round(self.lon / self.rows, 5),
+            "rows": self.rows,
+            "counts": [[licensee or None, list(bands), n] for (licensee, bands), n in sorted(self.counts.items())],
+        }
+
+
+def write_tiles(
+    tile_dir: str, table: LicenceTable, version: Optional[str] = None, precompress: bool = True
+) -> Dict[str, Any]:
+    """Writes the tile pyramid and its manifest; returns the manifest.
+
+    Detail tiles keep the order of `table`. Tiles the previous manifest
+    listed and this one doesn't are deleted, with any <z>/<x> directory that
+    leaves empty; nothing outside the <z>/ subdirectories is touched.
+    """
+    manifest_path = os.path.join(tile_dir, TILE_MANIFEST)
+    previous = _previous_manifest(manifest_path, TILES_FORMAT)
+    cells_per_tile = TILE_SIZE // TILE_CELL
+    overview: Dict[Tuple[int, int, int], Dict[Tuple[int, int], _TileCell]] = {}
+    detail: Dict[Tuple[int, int], LicenceTable] = {}
+    catalogue = _Catalogue()
+    for row in table:
+        catalogue.add(row)
+        lat, lon = row.get("lat"), row.get("lon")
+        if not isinstance(lat, (int, float)) or not isinstance(lon, (int, float)):
+            continue
+        if not (math.isfinite(lat) and math.isfinite(lon)):
+            continue
+        x, y = tile_position(lat, lon, TILE_DETAIL_ZOOM)
+        detail.setdefault((int(x), int(y)), LicenceTable()).append(row)
+        key = (str(row.get("licensee") or ""), tuple(sorted(_row_bands(row))))
+        for zoom in range(TILE_MIN_ZOOM, TILE_DETAIL_ZOOM):
+            scale = 2 ** (TILE_DETAIL_ZOOM - zoom)
+            zx, zy = x / scale, y / scale
+            tile = (zoom, int(zx), int(zy))
+            cell = (int((zx % 1) * cells_per_tile), int((zy % 1) * cells_per_tile))
+            cells = overview.setdefault(tile, {})
+            if cell not in cells:
+                cells[cell] = _TileCell()
+            cells[cell].add(lat, lon, key)
+
+    listed: Dict[str, List[str]] = {str(z): [] for z in range(TILE_MIN_ZOOM, TILE_DETAIL_ZOOM + 1)}
+
+    def put(zoom: int, x: int, y: int, doc: Dict[str, Any]) -> None:
+        path = os.path.join(tile_dir, str(zoom), str(x), f"{y}.json")
+        write_text_file(path, json.dumps(doc, ensure_ascii=False, separators=(",", ":")))
+        write_precompressed(path, precompress)
+        listed[str(zoom)].append(f"{x}/{y}")
+
+    for (zoom, x, y), cells in sorted(overview.items()):
+        entries = [cells[c].entry() for c in sorted(cells, key=lambda c: (c[1], c[0]))]
+        put(zoom, x, y, {"z": zoom, "x": x, "y": y, "cells": entries})
+    for (x, y), part in sorted(detail.items()):
+        put(TILE_DETAIL_ZOOM, x, y, encode_columns(part))
+
+    manifest = {
+        "format": TILES_FORMAT,
+        "version": version,
+        "rows": len(table),
+        "minZoom": TILE_MIN_ZOOM,
+        "detailZoom": TILE_DETAIL_ZOOM,
+        "tileSize": TILE_SIZE,
+        "cellSize": TILE_CELL,
+        **catalogue.fields(),
+        "tiles": listed,
+    }
+    write_text_file(manifest_path, json.dumps(manifest, ensure_ascii=False, separators=(",", ":")))
+    write_precompressed(manifest_path, precompress, BROTLI_QUALITY_SMALL)
+
+    # Only after the new manifest is in place, so no listed tile goes missing.
+    old_tiles = previous.get("tiles")
+    for zoom, names in (old_tiles.items() if isinstance(old_tiles, dict) else ()):
+        if not _TILE_ZOOM.match(zoom) or not isinstance(names, list):
+            continue
+        current = set(listed.get(zoom, ()))
+        for name in names:
+            if not isinstance(name, str) or not _TILE_NAME.match(name) or name in current:
+                continue
+            x, y = name.split("/")
+            _remove_with_siblings(os.path.join(tile_dir, zoom, x, f"{y}.json"))
+            for d in (os.path.join(tile_dir, zoom, x), os.path.join(tile_dir, zoom)):
+                if os.path.isdir(d) and not os.listdir(d):
+                    os.rmdir(d)
+    return manifest
+
+
+# ---- Site clusters -------------------------------------------------------------
+# The page draws the licences at one spot (coordinates to 6 dp) as a marker
+# and joins markers within CLUSTER_RADIUS_METERS of each other, transitively,
+# into one site (buildClusters: a grid of radius-sized cells, then a flood
+# fill with a haversine check against the neighbouring cells). Over all
+# licences that is the same for every visitor, so --clusters-out works it out
+# once: site_clusters is buildClusters in Python, and the file lists the
+# licence ids of each cluster spanning more than one spot. The page reuses
+# those clusters, keeping only the licences that pass its filters.
+
+CLUSTERS_FORMAT = "rrf-clusters/1"
+CLUSTER_RADIUS_METERS = 50.0
+GRID_REF_LAT = -41.2
+GRID_METERS_PER_DEG_LAT = 111320.0
+GRID_METERS_PER_DEG_LON = 111320.0 * math.cos(GRID_REF_LAT * math.pi / 180)
+# The page's carrierKeyFromLicensee: the first carrier with a name in the
+# (upper-cased) licensee wins. "uber" licences are left off the map.
+CARRIER_LICENSEES = (
+    ("2degrees", ("TWO DEGREES",)),
+    ("spark", ("SPARK",)),
+    ("one", ("ONE NEW ZEALAND", "ONE NZ", "VODAFONE")),
+    ("rcg", ("RURAL",)),
+    ("tuatea", ("TŪ ĀTEA", "TU ATEA")),
+    ("uber", ("UBER",)),
+)
+
+
+def carrier_key(licensee: Any) -> str:
+    """The carrier the page files a licensee under ("unknown" if none)."""
+    if not licensee:
+        return "unknown"
+    name = str(licensee).upper()
+    for key, needles in CARRIER_LICENSEES:
+        if any(needle in name for needle in needles):
+            return key
+    return "unknown"
+
+
+def distance_meters(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Haversine distance, as the page's distanceMeters computes it."""
+    to_rad = math.pi / 180
+    d_lat = (lat2 - lat1) * to_rad
+    d_lon = (lon2 - lon1) * to_rad
+    a = math.sin(d_lat / 2) ** 2 + math.cos(lat1 * to_rad) * math.cos(lat2 * to_rad) * math.sin(d_lon / 2) ** 2
+    return 2 * 6371000 * math.asin(math.sqrt(a))
+
+
+def site_clusters(rows: Iterable[Dict[str, Any]]) -> List[List[Any]]:
+    """Licence ids per site cluster, in order of first appearance.
+
+    Spots take the position of their first row, as the page's marker groups
+    do; rows without coordinates are left out.
+    """
+    spot_index: Dict[str, int] = {}
+    lats: List[float] = []
+    lons: List[float] = []
+    members: List[List[Any]] = []
+    for row in rows:
+        if carrier_key(row.get("licensee")) == "uber":
+            continue
+        lat, lon = row.get("lat"), row.get("lon")
+        if not isinstance(lat, (int, float)) or not isinstance(lon, (int, float)):
+            continue
+        if not (math.isfinite(lat) and math.isfinite(lon)):
+            continue
+        key = f"{lat:.6f}|{lon:.6f}"
+        spot = spot_index.get(key)
+        if spot is None:
+            spot = spot_index[key] = len(lats)
+            lats.append(lat)
+            lons.append(lon)
+            members.append([])
+        members[spot].append(row.get("id"))
+
+    cells = [
+        (
+            math.floor(lon * GRID_METERS_PER_DEG_LON / CLUSTER_RADIUS_METERS),
+            math.floor(lat * GRID_METERS_PER_DEG_LAT / CLUSTER_RADIUS_METERS),
+        )
+        for lat, lon in zip(lats, lons)
+    ]
+    grid: Dict[Tuple[int, int], List[int]] = {}
+    for spot, cell in enumerate(cells):
+        grid.setdefault(cell, []).append(spot)
+
+    assigned = [False] * len(lats)
+    clusters: List[List[Any]] = []
+    for seed in range(len(lats)):
+        if assigned[seed]:
+            continue
+        assigned[seed] = True
+        spots = [seed]
+        stack = [seed]
+        while stack:
+            current = stack.pop()
+            cx, cy = cells[current]
+            lat, lon = lats[current], lons[current]
+            for dx in (-1, 0, 1):
+                for dy in (-1, 0, 1):
+                    for other in grid.get((cx + dx, cy + dy), ()):
+                        if not assigned[other] and distance_meters(lat, lon, lats[other], lons[other]) <= CLUSTER_RADIUS_METERS:
+                            assigned[other] = True
+                            spots.append(other)
+                            stack.append(other)
+        clusters.append([i for spot in sorted(spots) for i in members[spot]])
+    return clusters
+
+
+def write_clusters(path: str, table: LicenceTable, version: Optional[str] = None) -> Dict[str, Any]:
+    """Writes the clusters spanning more than one spot; returns the document.
+
+    Single-spot clusters are left out: the page forms those on its own.
+    """
+    spot_of: Dict[Any, str] = {}
+    for row in table:
+        lat, lon = row.get("lat"), row.get("lon")
+        if isinstance(lat, (int, float)) and isinstance(lon, (int, float)):
+            spot_of[row.get("id")] = f"{lat:.6f}|{lon:.6f}"
+    clusters = [ids for ids in site_clusters(table) if len({spot_of[i] for i in ids}) > 1]
+    doc = {
+        "format": CLUSTERS_FORMAT,
+        "version": version,
+        "radius": CLUSTER_RADIUS_METERS,
+        "clusters": clusters,
+    }
+    write_text_file(path, json.dumps(doc, ensure_ascii=False, separators=(",", ":")))
+    return doc
+
+
+# ---- SQLite export -------------------------------------------------------------
+# --sqlite-out keeps a database for ad-hoc queries (sqlite3, pandas.read_sql,
+# Datasette) next to the published files. Every run upserts the rows by
+# licence id into `licences`, with the JSON field names as column names, and
+# records a row in `snapshots`; a licence keeps the snapshot it first and last
+# appeared in, so licences that drop out of the register stay queryable. An id
+# can have several rows (one licence type's results repeat ids); they are
+# replaced together when any of them changes, and an id whose rows are
+# unchanged since the last run is only marked as seen.
+#
+#   licences           one row per row of rrf_licences.json (rowId), id indexed
+#   licence_bands      (licence_row, band) for every band code of a row
+#   licence_districts  (licence_row, district) for every district code
+#   licences_rtree     R*Tree over lat/lon: bounding-box and nearest-site queries
+#   licences_fts       FTS5 over location and licensee (external content)
+#
+# For example, licences within a box, then the closest (R*Tree boxes are
+# float32, so pad the box slightly and test the exact coordinates after):
+#   SELECT l.* FROM licences_rtree r JOIN licences l ON l.rowId = r.id
+#   WHERE r.min_lat >= -36.9 AND r.max_lat <= -36.8 AND r.min_lon >= 174.7 AND r.max_lon <= 174.8
+#   SELECT l.* FROM licences_fts f JOIN licences l ON l.rowId = f.rowid WHERE licences_fts MATCH 'spark AND auckland'
+
+SQLITE_SCHEMA_VERSION = 2
+SQLITE_BATCH = 5000
+
+SQLITE_COLUMNS = (
+    ("licenceNo", "TEXT"),
+    ("licensee", "TEXT"),
+    ("carrier", "TEXT"),
+    ("location", "TEXT"),
+    ("locationDistrictCodes", "TEXT"),  # JSON array text, as in rrf_licences.json
+    ("refFrequencyMHz", "REAL"),
+    ("bandCode", "TEXT"),
+    ("bandCodes", "TEXT"),  # JSON array text
+    ("lowerBoundMHz", "REAL"),
+    ("upperBoundMHz", "REAL"),
+    ("bandwidthMHz", "REAL"),
+    ("power", "TEXT"),
+    ("configType", "TEXT"),
+    ("licenceTypeCode", "TEXT"),
+    ("licenceTypeDescription", "TEXT"),
+    ("licenceStatus", "TEXT"),
+    ("suppressed", "INTEGER"),
+    ("commencementDate", "TEXT"),
+    ("expiryDate", "TEXT"),
+    ("certificationDate", "TEXT"),
+    ("lastUpdatedDate", "TEXT"),
+    ("lat", "REAL"),
+    ("lon", "REAL"),
+    ("geoSource", "TEXT"),
+)
+
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+  id INTEGER PRIMARY KEY,
+  version TEXT,
+  takenAt TEXT NOT NULL,
+  rows INTEGER NOT NULL DEFAULT 0,
+  added INTEGER NOT NULL DEFAULT 0,
+  changed INTEGER NOT NULL DEFAULT 0,
+  removed INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS licences (
+  rowId INTEGER PRIMARY KEY,
+  id INTEGER NOT NULL,
+  %(columns)s,
+  firstSeen INTEGER NOT NULL REFERENCES snapshots(id),
+  lastSeen INTEGER NOT NULL REFERENCES snapshots(id),
+  digest BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS licence_bands (
+  licence_row INTEGER NOT NULL REFERENCES licences(rowId),
+  band TEXT NOT NULL,
+  PRIMARY KEY (licence_row, band)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS licence_districts (
+  licence_row INTEGER NOT NULL REFERENCES licences(rowId),
+  district TEXT NOT NULL,
+  PRIMARY KEY (licence_row, district)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS licences_id ON licences (id);
+CREATE INDEX IF NOT EXISTS licence_bands_band ON licence_bands (band, licence_row);
+CREATE INDEX IF NOT EXISTS licence_districts_district ON licence_districts (district, licence_row);
+CREATE INDEX IF NOT EXISTS licences_carrier ON licences (carrier);
+CREATE INDEX IF NOT EXISTS licences_band_code ON licences (bandCode);
+CREATE INDEX IF NOT EXISTS licences_commencement ON licences (commencementDate);
+CREATE INDEX IF NOT EXISTS licences_expiry ON licences (expiryDate);
+CREATE INDEX IF NOT EXISTS licences_last_updated ON licences (lastUpdatedDate);
+CREATE INDEX IF NOT EXISTS licences_last_seen ON licences (lastSeen);
+CREATE VIRTUAL TABLE IF NOT EXISTS licences_rtree USING rtree (id, min_lat, max_lat, min_lon, max_lon);
+CREATE VIRTUAL TABLE IF NOT EXISTS licences_fts USING fts5 (
+  location, licensee, content='licences', content_rowid='rowId', tokenize='unicode61 remove_diacritics 2'
+);
+""" % {"columns": ",\n  ".join(f"{name} {kind}" for name, kind in SQLITE_COLUMNS)}
+
+
+def _sqlite_values(row: Dict[str, Any]) -> List[Any]:
+    """The licences columns of a row, in SQLITE_COLUMNS order (without id)."""
+    values: List[Any] = []
+    for name, _ in SQLITE_COLUMNS:
+        if name == "carrier":
+            values.append(carrier_key(row.get("licensee")))
+        elif name in ("locationDistrictCodes", "bandCodes"):
+            value = row.get(name)
+            values.append(None if value is None else json.dumps(value, ensure_ascii=False, separators=(",", ":")))
+        elif name == "suppressed":
+            value = row.get(name)
+            values.append(None if value is None else int(bool(value)))
+        else:
+            values.append(row.get(name))
+    return values
+
+
+def open_sqlite(path: str) -> sqlite3.Connection:
+    """Opens (creating if needed) an --sqlite-out database."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    con = sqlite3.connect(path)
+    found = con.execute("PRAGMA user_version").fetchone()[0]
+    tables = con.execute("SELECT count(*) FROM sqlite_master WHERE name = 'licences'").fetchone()[0]
+    if tables and found != SQLITE_SCHEMA_VERSION:
+        con.close()
+        raise ValueError(f"{path} has schema version {found}, not {SQLITE_SCHEMA_VERSION}; move it aside to rebuild it")
+    con.executescript(SQLITE_SCHEMA)
+    con.execute(f"PRAGMA user_version = {SQLITE_SCHEMA_VERSION}")
+    return con
+
+
+def _sqlite_drop(con: sqlite3.Connection, ids: List[Tuple[Any]]) -> Dict[Any, int]:
+    """Deletes the rows of `ids` and their index entries; returns id -> the snapshot it was first seen in."""
+    first_seen: Dict[Any, int] = {}
+    for rid, first in con.execute(
+        f"SELECT id, min(firstSeen) FROM licences WHERE id IN ({', '.join('?' * len(ids))}) GROUP BY id",
+        [rid for (rid,) in ids],
+    ):
+        first_seen[rid] = first
+    # The FTS delete needs the old text, so it goes before the rows.
+    con.executemany(
+        "INSERT INTO licences_fts (licences_fts, rowid, location, licensee) "
+        "SELECT 'delete', rowId, location, licensee FROM licences WHERE id = ?",
+        ids,
+    )
+    rows = "SELECT rowId FROM licences WHERE id = ?"
+    con.executemany(f"DELETE FROM licences_rtree WHERE id IN ({rows})", ids)
+    con.executemany(f"DELETE FROM licence_bands WHERE licence_row IN ({rows})", ids)
+    con.executemany(f"DELETE FROM licence_districts WHERE licence_row IN ({rows})", ids)
+    con.executemany("DELETE FROM licences WHERE id = ?", ids)
+    return first_seen
+
+
+def write_sqlite(path: str, json_path: str, version: Optional[str] = None) -> Dict[str, Any]:
+    """Upserts the rows of the data file at `json_path` into the database at `path` as a new snapshot.
+
+    Returns the snapshot's counts: rows, and licence ids added, changed and
+    removed. A version already recorded as the latest snapshot is not
+    recorded again. The file is read twice, a row at a time: first for a
+    digest of each id's rows (as for the delta patches), then to write the
+    rows of the ids whose digest changed, SQLITE_BATCH at a time.
+    """
+    con = open_sqlite(path)
+    try:
+        latest = con.execute("SELECT id, version FROM snapshots ORDER BY id DESC LIMIT 1").fetchone()
+        if latest is not None and version is not None and latest[1] == version:
+            snap = con.execute("SELECT id, rows, added, changed, removed FROM snapshots WHERE id = ?", latest[:1]).fetchone()
+            return dict(zip(("snapshot", "rows", "added", "changed", "removed"), snap), unchanged=True)
+        digests, row_ids = _row_digests(json_path)
+        digests.pop(None, None)
+        names = [name for name, _ in SQLITE_COLUMNS]
+        insert = (
+            f"INSERT INTO licences (rowId, id, {', '.join(names)}, firstSeen, lastSeen, digest) "
+            f"VALUES ({', '.join('?' * (len(names) + 5))})"
+        )
+        with con:
+            taken_at = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+            snap = con.execute("INSERT INTO snapshots (version, takenAt) VALUES (?, ?)", (version, taken_at)).lastrowid
+            # Every row of an id carries the digest of all of them.
+            known: Dict[Any, bytes] = dict(con.execute("SELECT DISTINCT id, digest FROM licences"))
+            stale = [rid for rid, digest in digests.items() if known.get(rid) != digest]
+            added = sum(1 for rid in stale if rid not in known)
+            con.executemany(
+                "UPDATE licences SET lastSeen = ? WHERE id = ?",
+                ((snap, rid) for rid, digest in digests.items() if known.get(rid) == digest),
+            )
+            del known
+
+            first_seen: Dict[Any, int] = {}
+            for i in range(0, len(stale), SQLITE_BATCH):
+                first_seen.update(_sqlite_drop(con, [(rid,) for rid in stale[i : i + SQLITE_BATCH]]))
+            next_row = con.execute("SELECT coalesce(max(rowId), 0) FROM licences").fetchone()[0] + 1
+            pending = set(stale)
+            upserts: List[List[Any]] = []
+            texts: List[Tuple[Any, Any, Any]] = []
+            points: List[Tuple[Any, float, float, float, float]] = []
+            bands: List[Tuple[Any, str]] = []
+            districts: List[Tuple[Any, str]] = []
+
+            def flush() -> None:
+                con.executemany(insert, upserts)
+                con.executemany("INSERT INTO licences_fts (rowid, location, licensee) VALUES (?, ?, ?)", texts)
+                con.executemany("INSERT INTO licences_rtree VALUES (?, ?, ?, ?, ?)", points)
+                con.executemany("INSERT OR IGNORE INTO licence_bands VALUES (?, ?)", bands)
+                con.executemany("INSERT OR IGNORE INTO licence_districts VALUES (?, ?)", districts)
+                for batch in (upserts, texts, points, bands, districts):
+                    batch.clear()
+
+            for row in iter_json_array(json_path):
+                rid = row.get("id")
+                if rid not in pending:
+                    continue
+                key = next_row
+                next_row += 1
+                upserts.append([key, rid, *_sqlite_values(row), first_seen.get(rid, snap), snap, digests[rid]])
+                texts.append((key, row.get("location"), row.get("licensee")))
+                lat, lon = row.get("lat"), row.get("lon")
+                if isinstance(lat, (int, float)) and isinstance(lon, (int, float)):
+                    points.append((key, lat, lat, lon, lon))
+                bands.extend((key, b) for b in _row_bands(row))
+                districts.extend((key, d) for d in _district_codes(row))
+                if len(upserts) >= SQLITE_BATCH:
+                    flush()
+            flush()
+
+            removed = 0
+            if latest is not None:
+                removed = con.execute(
+                    "SELECT count(DISTINCT id) FROM licences WHERE lastSeen = ?", latest[:1]
+                ).fetchone()[0]
+            count = sum(1 for rid in row_ids if rid is not None)
+            con.execute(
+                "UPDATE snapshots SET rows = ?, added = ?, changed = ?, removed = ? WHERE id = ?",
+                (count, added, len(stale) - added, removed, snap),
+            )
+        con.execute("PRAGMA optimize")
+        return {"snapshot": snap, "rows": count, "added": added, "changed": len(stale) - added, "removed": removed}
+    finally:
+        con.close()
+
+
+# ---- NDJSON stream -------------------------------------------------------------
+# --ndjson-out writes the rows one JSON object per line, so the page can draw
+# markers while the file is still arriving instead of after the last byte.
+# The first line is a header: format, the version of rrf_licences.json (for
+# the cached copy and its deltas), the row count, and every district, band
+# and licensee for the filter controls. Rows follow as [index, row], index
+# being the row's place in rrf_licences.json, grouped by their first
+# district, most-viewed regions first. The page puts them back in file
+# order for the cached copy, so delta patches (which insert rows by index)
+# reproduce the new file exactly.
+
+NDJSON_FORMAT = "rrf-ndjson/2"
+# There are no page analytics; districts by population stand in for where
+# people look. Districts not listed, then rows without one, come last.
+NDJSON_DISTRICT_ORDER = (
+    "AK", "CB", "WN", "WK", "BP", "MW", "OT", "NL", "HB", "TK", "NT", "SL", "TP", "GS", "MB", "WC", "NZ",
+)
+
+
+def ndjson_order(rows: Iterable[Dict[str, Any]]) -> List[int]:
+    """Indexes of `rows` in stream order (see NDJSON_DISTRICT_ORDER)."""
+    rank = {code: i for i, code in enumerate(NDJSON_DISTRICT_ORDER)}
+    keys: List[Tuple[int, Any, int]] = []
+    for i, row in enumerate(rows):
+        codes = _district_codes(row)
+        if not codes:
+            keys.append((2, "", i))
+        elif codes[0] in rank:
+            keys.append((0, rank[codes[0]], i))
+        else:
+            keys.append((1, codes[0], i))
+    return [i for _, _, i in sorted(keys)]
+
+
+def write_ndjson(path: str, table: LicenceTable, version: Optional[str] = None) -> int:
+    """Writes the header line and one [index, row] line per row; returns the bytes written."""
+    catalogue = _Catalogue()
+    for row in table:
+        catalogue.add(row)
+    header = {"format": NDJSON_FORMAT, "version": version, "rows": len(table), **catalogue.fields()}
+    lines = [json.dumps(header, ensure_ascii=False, separators=(",", ":"))]
+    lines.extend(
+        json.dumps([i, table.row_dict(i)], ensure_ascii=False, separators=(",", ":")) for i in ndjson_order(table)
+    )
+    text = "\n".join(lines) + "\n"
+    write_text_file(path, text)
+    return len(text.encode("utf-8"))
 
 
 # ---- HTML generation (Bootstrap-first, minimal custom CSS) ------------------
 
 
-def build_html(data: List[Dict[str, Any]]) -> str:
+def build_html(data: Optional[Iterable[Dict[str, Any]]] = None) -> str:
+    """The page loads its data at runtime, so `data` is not embedded."""
     bands_json = json.dumps(BAND_DEFS, ensure_ascii=False)
 
     # NOTE: placeholders + replace, so JS `${...}` doesn't conflict with Python.
@@ -493,7 +3794,12 @@ def build_html(data: List[Dict[str, Any]]) -> str:
   ></script>
 
   <script>
+    // The binary and columnar files (rrf.py --binary-out / --columnar-out) are
+    // tried first: same rows, a fraction of the bytes and parse time. A
+    // missing file falls through to the next.
     const DATA_URLS = [
+      "./rrf_licences.bin",
+      "./rrf_licences.columns.json",
       "./rrf_licences.json",
       "https://raw.githubusercontent.com/codenui/rrf.codenui.co.nz/refs/heads/main/rrf_licences.json",
     ];
@@ -508,39 +3814,510 @@ def build_html(data: List[Dict[str, Any]]) -> str:
       document.documentElement.setAttribute("data-bs-theme", theme);
     }
 
-    applySystemTheme();
-    if (typeof prefersDarkMedia.addEventListener === "function") {
-      prefersDarkMedia.addEventListener("change", applySystemTheme);
-    } else if (typeof prefersDarkMedia.addListener === "function") {
-      prefersDarkMedia.addListener(applySystemTheme);
+    applySystemTheme();
+    if (typeof prefersDarkMedia.addEventListener === "function") {
+      prefersDarkMedia.addEventListener("change", applySystemTheme);
+    } else if (typeof prefersDarkMedia.addListener === "function") {
+      prefersDarkMedia.addListener(applySystemTheme);
+    }
+
+    if (standaloneMode) {
+      document.body.classList.add("standalone-mode");
+    }
+
+    // Returning visitors patch the copy they stored last time with the deltas
+    // listed in rrf_delta/manifest.json (written by rrf.py next to the data).
+    const DELTA_MANIFEST = "rrf_delta/manifest.json";
+    const DATA_CACHE = "rrf-data-v1";
+
+    async function dataVersion(buffer) {
+      const digest = await crypto.subtle.digest("SHA-256", buffer);
+      return Array.from(new Uint8Array(digest), b => b.toString(16).padStart(2, "0")).join("").slice(0, 16);
+    }
+
+    async function openDataCache() {
+      // Cache Storage and SubtleCrypto only exist in secure contexts.
+      if (!window.caches || !window.crypto?.subtle) return null;
+      try {
+        return await caches.open(DATA_CACHE);
+      } catch {
+        return null;
+      }
+    }
+
+    function cacheKey(dataUrl) {
+      const key = new URL(dataUrl);
+      key.searchParams.set("rrf-cache", "patched");
+      return key.href;
+    }
+
+    function storeCachedData(cache, dataUrl, version, rows) {
+      // Serialised straight away: init() decorates the rows in place afterwards.
+      const body = typeof rows === "string" ? rows : JSON.stringify(rows);
+      return Promise.resolve(version)
+        .then(v => cache.put(cacheKey(dataUrl), new Response(body, {
+          headers: { "Content-Type": "application/json", "X-Data-Version": v },
+        })))
+        .catch(err => console.warn(`Could not cache data: ${err?.message || err}`));
+    }
+
+    // Same steps as apply_delta in rrf.py: removed ids are dropped, changed ids
+    // keep their place and added rows go in at their index in the new file.
+    function applyDelta(rows, delta) {
+      const removed = new Set(delta.removed || []);
+      const changed = new Map();
+      for (const row of delta.changed || []) {
+        if (!changed.has(row.id)) changed.set(row.id, []);
+        changed.get(row.id).push(row);
+      }
+      const kept = [];
+      const emitted = new Set();
+      for (const r of rows) {
+        if (removed.has(r.id)) continue;
+        const group = changed.get(r.id);
+        if (!group) {
+          kept.push(r);
+        } else if (!emitted.has(r.id)) {
+          emitted.add(r.id);
+          kept.push(...group);
+        }
+      }
+      const added = delta.added || [];
+      const at = delta.at || [];
+      const out = [];
+      let next = 0;
+      for (let i = 0; i < added.length && i < at.length; i++) {
+        while (out.length < at[i] && next < kept.length) out.push(kept[next++]);
+        out.push(added[i]);
+      }
+      while (next < kept.length) out.push(kept[next++]);
+      return out;
+    }
+
+    // Rows for the manifest's version from the cached copy plus deltas, or null
+    // when there is no usable copy or chain (the caller downloads the full file).
+    async function loadPatchedData(cache, dataUrl) {
+      const hit = await cache.match(cacheKey(dataUrl));
+      const cachedVersion = hit?.headers.get("X-Data-Version");
+      if (!cachedVersion) return null;
+      const manifestUrl = new URL(DELTA_MANIFEST, dataUrl);
+      const response = await fetch(manifestUrl, { cache: "no-store" });
+      if (!response.ok) return null;
+      const manifest = await response.json();
+      const byFrom = new Map((manifest.deltas || []).map(d => [d.from, d]));
+      const chain = [];
+      let version = cachedVersion;
+      while (version !== manifest.version) {
+        const step = byFrom.get(version);
+        if (!step || chain.length >= byFrom.size) return null;
+        chain.push(step);
+        version = step.to;
+      }
+
+      let rows = await hit.json();
+      for (const step of chain) {
+        const patch = await fetch(new URL(step.path, manifestUrl));
+        if (!patch.ok) return null;
+        rows = applyDelta(rows, await patch.json());
+      }
+      if (rows.length !== manifest.rows) return null;
+      if (chain.length) storeCachedData(cache, dataUrl, manifest.version, rows);
+      return { rows, version: manifest.version, steps: chain.length };
+    }
+
+    // Epoch days -> "YYYY-MM-DD", memoised (dates repeat a lot).
+    const ISO_DAYS = new Map();
+    function isoDay(d) {
+      let s = ISO_DAYS.get(d);
+      if (s === undefined) {
+        s = new Date(d * 86400000).toISOString().slice(0, 10);
+        ISO_DAYS.set(d, s);
+      }
+      return s;
+    }
+
+    // One array per field (see encode_columns in rrf.py), decoded column by
+    // column and then zipped into row objects that match rrf_licences.json.
+    function decodeColumn(col, n) {
+      const out = new Array(n);
+      switch (col.type) {
+        case "dict":
+          for (let i = 0; i < n; i++) {
+            const v = col.dict[col.codes[i]];
+            out[i] = Array.isArray(v) ? v.slice() : v;
+          }
+          return out;
+        case "delta": {
+          let id = 0;
+          for (let i = 0; i < n; i++) out[i] = id += col.values[i];
+          return out;
+        }
+        case "days": {
+          const rest = col.rest ? decodeColumn(col.rest, n) : null;
+          for (let i = 0; i < n; i++) {
+            const d = col.days[i];
+            out[i] = d === null ? null : isoDay(d) + (rest ? rest[i] : "");
+          }
+          return out;
+        }
+        default:
+          return col.values;
+      }
+    }
+
+    function rowBuilder(keys, columns) {
+      // An object literal per key order builds rows several times faster than
+      // assigning key by key; the loop is the fallback where eval is blocked.
+      try {
+        const body = `return {${keys.map((k, j) => `${JSON.stringify(k)}: c[${j}][i]`).join(", ")}};`;
+        const make = new Function("c", "i", body);
+        return i => make(columns, i);
+      } catch {
+        return i => {
+          const row = {};
+          keys.forEach((k, j) => { row[k] = columns[j][i]; });
+          return row;
+        };
+      }
+    }
+
+    function decodeColumns(doc) {
+      if (doc?.format !== "rrf-columns/1") throw new Error("unrecognised data format");
+      const n = doc.rows;
+      const columns = {};
+      for (const [name, col] of Object.entries(doc.columns)) columns[name] = decodeColumn(col, n);
+      const builders = doc.shapes.map(keys => rowBuilder(keys, keys.map(k => columns[k])));
+      const rows = new Array(n);
+      for (let i = 0; i < n; i++) rows[i] = builders[doc.shape ? doc.shape[i] : 0](i);
+      return rows;
+    }
+
+    // rrf_licences.bin (rrf.py --binary-out): typed-array views over the
+    // fetched buffer, no parsing. Rows are small objects whose fields are read
+    // from the columns on first use; assigning a field stores it on the row.
+    const BINARY_ARRAYS = {
+      u8: Uint8Array, u16: Uint16Array, u32: Uint32Array, i32: Int32Array, f32: Float32Array, f64: Float64Array,
+    };
+    const BINARY_DAY_NULL = -2147483648;
+    const BINARY_NO_STRING = 0xFFFFFFFF;
+
+    function isBinaryDataset(buffer) {
+      const magic = new Uint8Array(buffer, 0, Math.min(4, buffer.byteLength));
+      return String.fromCharCode(...magic) === "RRFB";
+    }
+
+    function binaryReader(col, column, entry) {
+      const values = column(col);
+      switch (col.type) {
+        case "dict": {
+          const [first, count] = col.dict;
+          const dict = new Array(count);
+          return i => {
+            const code = values[i];
+            if (dict[code] === undefined) dict[code] = JSON.parse(entry(first + code));
+            const v = dict[code];
+            return Array.isArray(v) ? v.slice() : v;
+          };
+        }
+        case "days": {
+          const rest = col.rest ? binaryReader(col.rest, column, entry) : () => "";
+          return i => (values[i] === BINARY_DAY_NULL ? null : isoDay(values[i]) + rest(i));
+        }
+        case "str":
+          return i => (values[i] === BINARY_NO_STRING ? null : entry(values[i]));
+        case "json":
+          return i => JSON.parse(entry(values[i]));
+        default:
+          return values instanceof Float32Array || values instanceof Float64Array
+            ? i => (Number.isNaN(values[i]) ? null : values[i])
+            : i => values[i];
+      }
+    }
+
+    function binaryRowClass(keys, readers) {
+      class BinaryRow {
+        constructor(index) {
+          this._binaryIndex = index;
+        }
+        toJSON() {
+          const row = {};
+          for (const key of keys) row[key] = readers[key](this._binaryIndex);
+          return row;
+        }
+      }
+      for (const key of keys) {
+        Object.defineProperty(BinaryRow.prototype, key, {
+          get() {
+            return readers[key](this._binaryIndex);
+          },
+          set(value) {
+            Object.defineProperty(this, key, { value, writable: true, enumerable: true, configurable: true });
+          },
+          enumerable: true,
+          configurable: true,
+        });
+      }
+      return BinaryRow;
+    }
+
+    function decodeBinary(buffer) {
+      const view = new DataView(buffer);
+      if (view.getUint32(4, true) !== 1) throw new Error("unsupported binary dataset format");
+      const headerLength = view.getUint32(8, true);
+      const header = JSON.parse(new TextDecoder().decode(new Uint8Array(buffer, 12, headerLength)));
+      const base = (12 + headerLength + 7) & ~7;
+      const n = header.rows;
+      const column = col => new BINARY_ARRAYS[col.array](buffer, base + col.offset, n);
+
+      const s = header.strings;
+      const offsets = new Uint32Array(buffer, base + s.offsets, s.count + 1);
+      const bytes = new Uint8Array(buffer, base + s.data, s.length);
+      const utf8 = new TextDecoder();
+      const entry = k => utf8.decode(bytes.subarray(offsets[k], offsets[k + 1]));
+
+      const readers = {};
+      for (const [name, col] of Object.entries(header.columns)) readers[name] = binaryReader(col, column, entry);
+      const classes = header.shapes.map(keys => binaryRowClass(keys, readers));
+      const shapes = header.shape ? column(header.shape) : null;
+      const rows = new Array(n);
+      for (let i = 0; i < n; i++) rows[i] = new classes[shapes ? shapes[i] : 0](i);
+      return { rows, version: header.version };
+    }
+
+    // rrf.py writes <file>.gz next to each data file. Hosts that negotiate
+    // encodings serve it (or .br) for the plain URL by themselves; elsewhere
+    // (GitHub Pages) the page fetches the .gz and inflates it if the host
+    // hands over the gzip bytes as they are.
+    async function fetchDataBuffer(url, { cache = "no-store" } = {}) {
+      if (window.DecompressionStream) {
+        try {
+          const response = await fetch(`${url}.gz`, { cache });
+          if (response.ok) {
+            const buffer = await response.arrayBuffer();
+            const head = new Uint8Array(buffer, 0, Math.min(2, buffer.byteLength));
+            if (head[0] !== 0x1f || head[1] !== 0x8b) return buffer; // already decoded (Content-Encoding: gzip)
+            const inflated = new Blob([buffer]).stream().pipeThrough(new DecompressionStream("gzip"));
+            return await new Response(inflated).arrayBuffer();
+          }
+        } catch (err) {
+          console.warn(`${url}.gz unusable, fetching ${url}: ${err?.message || err}`);
+        }
+      }
+      const response = await fetch(url, { cache });
+      if (!response.ok) throw new Error(`HTTP ${response.status}`);
+      return response.arrayBuffer();
+    }
+
+    // With rrf.py --tile-dir / --shard-dir the rows are also split into
+    // tiles or by district. The page then starts from that manifest alone and
+    // fetches the parts the map needs (see the tile layer and loadShards in
+    // init); tiles are preferred.
+    const TILE_MANIFEST = "rrf_tiles/manifest.json";
+    const SHARD_MANIFEST = "rrf_shards/manifest.json";
+
+    async function loadManifest(path, format) {
+      const url = new URL(path, window.location.href).href;
+      const manifest = JSON.parse(new TextDecoder().decode(await fetchDataBuffer(url)));
+      if (manifest.format !== format) throw new Error(`unknown format ${manifest.format}`);
+      return { ...manifest, url };
+    }
+
+    // Site clusters from rrf.py --clusters-out, as licence id -> cluster; null
+    // without the file (refresh() then clusters the markers itself).
+    const CLUSTERS_URL = "./rrf_clusters.json";
+
+    async function loadSiteClusters() {
+      try {
+        const doc = JSON.parse(new TextDecoder().decode(await fetchDataBuffer(CLUSTERS_URL)));
+        if (doc.format !== "rrf-clusters/1") throw new Error(`unknown format ${doc.format}`);
+        const clusterById = new Map();
+        doc.clusters.forEach((ids, index) => ids.forEach(id => clusterById.set(id, index)));
+        return clusterById;
+      } catch (err) {
+        console.info(`No precomputed site clusters (${err?.message || err})`);
+        return null;
+      }
+    }
+
+    // rrf.py --ndjson-out: a header line, then one [index, row] per line,
+    // busiest regions first. openNdjson resolves once the header is in;
+    // batches() then yields the rows of the complete lines as they arrive,
+    // and once the last is in caches them back in file order (index), the
+    // order the delta patches assume.
+    const NDJSON_URL = "./rrf_licences.ndjson";
+
+    function withFirstChunk(first, reader) {
+      return new ReadableStream({
+        start(controller) {
+          if (first.byteLength) controller.enqueue(first);
+        },
+        async pull(controller) {
+          const { done, value } = await reader.read();
+          if (done) controller.close();
+          else controller.enqueue(value);
+        },
+        cancel(reason) {
+          return reader.cancel(reason);
+        },
+      });
+    }
+
+    // fetchDataBuffer as a byte stream: the .gz is inflated as it arrives.
+    async function fetchDataStream(url) {
+      if (window.DecompressionStream) {
+        try {
+          const response = await fetch(`${url}.gz`, { cache: "no-store" });
+          if (response.ok && response.body) {
+            const reader = response.body.getReader();
+            const { done, value } = await reader.read();
+            const first = done ? new Uint8Array(0) : value;
+            const body = withFirstChunk(first, reader);
+            if (first[0] !== 0x1f || first[1] !== 0x8b) return body; // already decoded (Content-Encoding: gzip)
+            return body.pipeThrough(new DecompressionStream("gzip"));
+          }
+        } catch (err) {
+          console.warn(`${url}.gz unusable, fetching ${url}: ${err?.message || err}`);
+        }
+      }
+      const response = await fetch(url, { cache: "no-store" });
+      if (!response.ok) throw new Error(`HTTP ${response.status}`);
+      if (!response.body) throw new Error("no response body to stream");
+      return response.body;
     }
 
-    if (standaloneMode) {
-      document.body.classList.add("standalone-mode");
+    async function openNdjson(url, cache) {
+      const reader = (await fetchDataStream(url)).getReader();
+      const decoder = new TextDecoder();
+      let pending = "";
+      let finished = false;
+
+      async function nextLines() {
+        while (!finished) {
+          const { done, value } = await reader.read();
+          finished = done;
+          pending += decoder.decode(value || new Uint8Array(0), { stream: !done });
+          const end = done ? pending.length : pending.lastIndexOf("\\n") + 1;
+          if (end > 0) {
+            const lines = pending.slice(0, end).split("\\n").filter(line => line.trim());
+            pending = pending.slice(end);
+            if (lines.length) return lines;
+          }
+        }
+        return null;
+      }
+
+      let lines = await nextLines();
+      const header = lines ? JSON.parse(lines.shift()) : null;
+      if (header?.format !== "rrf-ndjson/2") {
+        reader.cancel().catch(() => {});
+        throw new Error(`unknown format ${header?.format}`);
+      }
+      async function* batches() {
+        const ordered = new Array(header.rows); // row text by index
+        let count = 0;
+        for (; lines; lines = await nextLines()) {
+          const rows = lines.map(line => {
+            const [index, row] = JSON.parse(line);
+            if (ordered[index] === undefined) count++;
+            ordered[index] = line.slice(line.indexOf(",") + 1, -1);
+            return row;
+          });
+          if (rows.length) yield rows;
+        }
+        if (cache && header.version && count === header.rows && ordered.length === header.rows) {
+          storeCachedData(cache, url, header.version, `[${ordered.join(",")}]`);
+        }
+      }
+      return { ...header, url, batches };
     }
 
-    async function loadDataWithFallback() {
+    // The first of DATA_URLS that loads, stored as the cached copy.
+    async function loadWholeDataset(cache) {
       const failures = [];
       for (const url of DATA_URLS) {
+        const dataUrl = new URL(url, window.location.href).href;
         try {
-          const response = await fetch(url, { cache: "no-store" });
-          if (!response.ok) {
-            failures.push(`${url} -> HTTP ${response.status}`);
-            continue;
+          const buffer = await fetchDataBuffer(url);
+          if (isBinaryDataset(buffer)) {
+            const { rows, version } = decodeBinary(buffer);
+            // Serialising for the cache reads every field: leave it until the map is up.
+            const idle = window.requestIdleCallback ? fn => window.requestIdleCallback(fn) : fn => setTimeout(fn, 2000);
+            if (cache && version) idle(() => storeCachedData(cache, dataUrl, version, rows));
+            return { rows, url };
           }
-          const rows = await response.json();
+          const parsed = JSON.parse(new TextDecoder().decode(buffer));
+          // The columnar file carries the version of the rows file it mirrors.
+          const rows = Array.isArray(parsed) ? parsed : decodeColumns(parsed);
+          const version = Array.isArray(parsed) ? dataVersion(buffer) : parsed.version;
+          if (cache && version) storeCachedData(cache, dataUrl, version, rows);
           return { rows, url };
         } catch (err) {
           failures.push(`${url} -> ${err?.message || err}`);
         }
       }
+      throw new Error(failures.join(" | "));
+    }
+
+    async function loadDataWithFallback() {
+      const failures = [];
+      const cache = await openDataCache();
+      // A cached copy is complete and only needs the day's deltas, so it
+      // beats fetching tiles or shards; without one (a first visit), those
+      // beat the NDJSON stream, which beats waiting for a whole file. After
+      // tiles or shards init() still fetches the whole file in the
+      // background, so the next visit has a copy to patch.
+      for (const url of cache ? [NDJSON_URL, ...DATA_URLS] : []) {
+        const dataUrl = new URL(url, window.location.href).href;
+        try {
+          const patched = await loadPatchedData(cache, dataUrl);
+          if (patched) {
+            return { rows: patched.rows, cache, url: `${url} (cached ${patched.version}, ${patched.steps} delta(s))` };
+          }
+        } catch (err) {
+          console.warn(`Delta update from ${url} failed, downloading in full: ${err?.message || err}`);
+        }
+      }
+      try {
+        return { rows: [], tiles: await loadManifest(TILE_MANIFEST, "rrf-tiles/1"), cache, url: TILE_MANIFEST };
+      } catch (err) {
+        failures.push(`${TILE_MANIFEST} -> ${err?.message || err}`);
+      }
+      try {
+        return { rows: [], shards: await loadManifest(SHARD_MANIFEST, "rrf-shards/1"), cache, url: SHARD_MANIFEST };
+      } catch (err) {
+        failures.push(`${SHARD_MANIFEST} -> ${err?.message || err}`);
+      }
+      try {
+        const stream = await openNdjson(new URL(NDJSON_URL, window.location.href).href, cache);
+        return { rows: [], stream, cache, url: NDJSON_URL };
+      } catch (err) {
+        failures.push(`${NDJSON_URL} -> ${err?.message || err}`);
+      }
+      try {
+        return { ...(await loadWholeDataset(cache)), cache };
+      } catch (err) {
+        failures.push(err.message);
+      }
       throw new Error(`Failed to load data. Tried: ${failures.join(" | ")}`);
     }
 
     async function init() {
+      const siteClusters = loadSiteClusters(); // alongside the data
       const loaded = await loadDataWithFallback();
+      const SITE_CLUSTERS = await siteClusters;
       DATA = loaded.rows;
-      console.info(`Loaded ${DATA.length} records from ${loaded.url}`);
+      // With tiles or shards, rows arrive as the map needs them; with the
+      // NDJSON stream, as the download goes on.
+      const TILES = loaded.tiles || null;
+      const SHARDS = loaded.shards || null;
+      const STREAM = loaded.stream || null;
+      const CATALOGUE = TILES || SHARDS || STREAM; // every district, band and licensee
+      let partialData = Boolean(TILES || SHARDS); // until the whole dataset replaces them
+      console.info(TILES || SHARDS
+        ? `${CATALOGUE.rows} records in ${TILES ? "map tiles" : `${SHARDS.shards.length} district shards`} (${loaded.url})`
+        : STREAM
+          ? `Streaming ${STREAM.rows} records from ${loaded.url}`
+          : `Loaded ${DATA.length} records from ${loaded.url}`);
       DATA = DATA.filter(record => carrierKeyFromLicensee(record.licensee) !== "uber");
 
     // UI-only transforms (do not store in JSON)
@@ -592,7 +4369,7 @@ def build_html(data: List[Dict[str, Any]]) -> str:
     }
 
     // Decorate records UI-side (still not changing the JSON file on disk)
-    DATA.forEach(r => {
+    function decorateRecord(r) {
       const ck = carrierKeyFromLicensee(r.licensee);
       const meta = CARRIERS[ck] || CARRIERS.unknown;
 
@@ -603,13 +4380,20 @@ def build_html(data: List[Dict[str, Any]]) -> str:
 
       r.locationDistrictNames = districtNamesFromCodes(r.locationDistrictCodes);
 
+      // Every band the licence falls in (overlapping bands, wide spans);
+      // JSON from before bandCodes existed only has the single bandCode.
+      r.bandCodes = Array.isArray(r.bandCodes) && r.bandCodes.length
+        ? r.bandCodes
+        : [r.bandCode || "unknown"];
+
       // Cache frequently re-used derived values for faster filtering/search.
       r._commDate = parseISO(r.commencementDate);
       r._expDate = r.expiryDate ? parseISO(r.expiryDate + "T00:00:00") : null;
       r._lat = Number(r.lat);
       r._lon = Number(r.lon);
       r._hasCoords = Number.isFinite(r._lat) && Number.isFinite(r._lon);
-    });
+    }
+    DATA.forEach(decorateRecord);
 
     function parseDate(value) {
       if (!value) return null;
@@ -660,7 +4444,25 @@ def build_html(data: List[Dict[str, Any]]) -> str:
     };
     const defaultLayerName = prefersDarkMedia.matches ? "Dark" : "OpenStreetMap";
     baseLayers[defaultLayerName].addTo(map);
-    map.setView([-41.2, 174.7], 5);
+
+    // The view is kept in the URL (#zoom/lat/lon), so a link or a reload opens
+    // where the user was looking; with shards, only that part gets fetched.
+    function viewFromHash() {
+      const parts = window.location.hash.slice(1).split("/");
+      if (parts.length !== 3 || parts.some(p => p === "")) return null;
+      const [zoom, lat, lon] = parts.map(Number);
+      return [zoom, lat, lon].every(Number.isFinite) ? { zoom, lat, lon } : null;
+    }
+    const initialView = viewFromHash();
+    if (initialView) {
+      map.setView([initialView.lat, initialView.lon], initialView.zoom);
+    } else {
+      map.setView([-41.2, 174.7], 5);
+    }
+    map.on("moveend", () => {
+      const center = map.getCenter();
+      history.replaceState(null, "", `#${map.getZoom()}/${center.lat.toFixed(4)}/${center.lng.toFixed(4)}`);
+    });
 
     const MapStyleControl = L.Control.extend({
       onAdd() {
@@ -697,6 +4499,7 @@ def build_html(data: List[Dict[str, Any]]) -> str:
     let markersLayer = L.layerGroup().addTo(map);
     let addressLineLayer = L.layerGroup().addTo(map);
     let addressMarker = null;
+    let nearestLinesPoint = null; // where drawNearestCarrierLines last drew from
     let addressSuggestTimer = null;
     let addressSuggestController = null;
     let addressSuggestionsCache = [];
@@ -717,6 +4520,7 @@ def build_html(data: List[Dict[str, Any]]) -> str:
 
     function clearAddressLines() {
       addressLineLayer.clearLayers();
+      nearestLinesPoint = null;
     }
 
     function formatDistanceLabel(meters) {
@@ -764,9 +4568,10 @@ def build_html(data: List[Dict[str, Any]]) -> str:
       return uniqueByName.slice(0, limit);
     }
 
-    function drawNearestCarrierLines(lat, lon) {
+    function drawNearestCarrierLines(lat, lon, { fitView = true } = {}) {
       if (!Number.isFinite(lat) || !Number.isFinite(lon)) return;
       clearAddressLines();
+      nearestLinesPoint = { lat, lon };
       const start = L.latLng(lat, lon);
       const linePoints = [start];
 
@@ -820,7 +4625,7 @@ def build_html(data: List[Dict[str, Any]]) -> str:
           });
         }
         linePoints.push(end);
-        if (linePoints.length > 1) {
+        if (fitView && linePoints.length > 1) {
           map.fitBounds(L.latLngBounds(linePoints).pad(0.2), { maxZoom: 15 });
         }
         return;
@@ -850,7 +4655,7 @@ def build_html(data: List[Dict[str, Any]]) -> str:
         linePoints.push(end);
       });
 
-      if (linePoints.length > 1) {
+      if (fitView && linePoints.length > 1) {
         map.fitBounds(L.latLngBounds(linePoints).pad(0.2), { maxZoom: 15 });
       }
     }
@@ -1038,6 +4843,7 @@ def build_html(data: List[Dict[str, Any]]) -> str:
     // District dropdown options
     function populateDistricts() {
       const mapD = new Map(); // code -> name
+      (CATALOGUE?.districts || []).forEach(code => mapD.set(code, DISTRICT_NAMES[code] || code));
       DATA.forEach(r => {
         const codes = r.locationDistrictCodes || [];
         const names = r.locationDistrictNames || [];
@@ -1118,6 +4924,11 @@ def build_html(data: List[Dict[str, Any]]) -> str:
 
     function uniqueCarriers() {
       const m = new Map(); // key -> {friendly,color}
+      (CATALOGUE?.licensees || []).forEach(licensee => {
+        const k = carrierKeyFromLicensee(licensee);
+        const meta = CARRIERS[k] || CARRIERS.unknown;
+        if (k !== "uber" && !m.has(k)) m.set(k, { friendly: meta.friendly, color: meta.color });
+      });
       DATA.forEach(r => {
         const k = r.carrierKey || "unknown";
         if (k === "uber") return;
@@ -1133,7 +4944,7 @@ def build_html(data: List[Dict[str, Any]]) -> str:
       // Carriers that still have matches given current BAND selection
       const availCarriers = new Set(
         baseFiltered
-          .filter(r => bandSelected.size === 0 || bandSelected.has(r.bandCode || "unknown"))
+          .filter(r => inSelectedBands(r))
           .map(r => r.carrierKey || "unknown")
           .filter(k => k !== "uber") // keep your existing exclusion consistent
       );
@@ -1142,7 +4953,7 @@ def build_html(data: List[Dict[str, Any]]) -> str:
       const availBands = new Set(
         baseFiltered
           .filter(r => carrierSelected.size === 0 || carrierSelected.has(r.carrierKey || "unknown"))
-          .map(r => r.bandCode || "unknown")
+          .flatMap(r => r.bandCodes)
       );
 
       // Disable carrier buttons that would yield zero results,
@@ -1237,6 +5048,11 @@ def build_html(data: List[Dict[str, Any]]) -> str:
     const bandSelected = new Set(); // empty => all
     let bandAllCodes = [];
 
+    // A licence matches when any of its bands is selected.
+    function inSelectedBands(r) {
+      return bandSelected.size === 0 || r.bandCodes.some(code => bandSelected.has(code));
+    }
+
     function syncBandButtons() {
       const allMode = bandSelected.size === 0;
       bandBtns.querySelectorAll("button").forEach(b => {
@@ -1251,7 +5067,7 @@ def build_html(data: List[Dict[str, Any]]) -> str:
 
     function buildBandUI() {
       bandBtns.innerHTML = "";
-      const present = new Set(DATA.map(r => r.bandCode || "unknown"));
+      const present = new Set([...(CATALOGUE?.bands || []), ...DATA.flatMap(r => r.bandCodes)]);
       const defs = BAND_DEFS
         .filter(([code]) => present.has(code))
         .map(([code, label]) => ({ code, label }));
@@ -1403,7 +5219,7 @@ def build_html(data: List[Dict[str, Any]]) -> str:
 
         const compact = `
           <div class="d-flex flex-wrap gap-2 align-items-center">
-            <span class="badge text-bg-dark">${safe(r.bandCode)}</span>
+            <span class="badge text-bg-dark">${safe(r.bandCodes.join(" / "))}</span>
             <span class="badge text-bg-light">${safe(r.refFrequencyMHz)} MHz</span>
             <span class="badge text-bg-light">${Math.round(safe(r.bandwidthMHz))} MHz</span>
             <span class="ms-auto text-secondary small">${fmtDate(r.commencementDate)}</span>
@@ -1415,7 +5231,7 @@ def build_html(data: List[Dict[str, Any]]) -> str:
             <dt class="col-5 text-secondary">Licence #</dt><dd class="col-7">${safe(r.licenceNo)}</dd>
             <dt class="col-5 text-secondary">Record ID</dt><dd class="col-7"><a href="${href}" target="_blank" rel="noreferrer">${rid}</a></dd>
             <dt class="col-5 text-secondary">Ref (MHz)</dt><dd class="col-7">${safe(r.refFrequencyMHz)}</dd>
-            <dt class="col-5 text-secondary">Band</dt><dd class="col-7">${safe(r.bandCode)}</dd>
+            <dt class="col-5 text-secondary">Band</dt><dd class="col-7">${safe(r.bandCodes.join(", "))}</dd>
             <dt class="col-5 text-secondary">Bounds (MHz)</dt><dd class="col-7">${safe(r.lowerBoundMHz)} – ${safe(r.upperBoundMHz)}</dd>
             <dt class="col-5 text-secondary">Bandwidth</dt><dd class="col-7">${safe(r.bandwidthMHz)}</dd>
             <dt class="col-5 text-secondary">Power</dt><dd class="col-7">${safe(r.power)}</dd>
@@ -1646,8 +5462,7 @@ def build_html(data: List[Dict[str, Any]]) -> str:
       if (carrierSelected.size > 0 && !carrierSelected.has(k)) return false;
 
       // Bands: selected empty => show all
-      const b = r.bandCode || "unknown";
-      if (bandSelected.size > 0 && !bandSelected.has(b)) return false;
+      if (!inSelectedBands(r)) return false;
 
       return true;
     }
@@ -1707,7 +5522,7 @@ def build_html(data: List[Dict[str, Any]]) -> str:
           <div class="d-flex align-items-center gap-2">
             <span class="swatch-dot" style="background:${safe(r.carrierColor)}"></span>
             <div class="fw-semibold text-truncate">${safe(r.location)}</div>
-            <span class="ms-auto badge text-bg-light">${safe(r.bandCode)}</span>
+            <span class="ms-auto badge text-bg-light">${safe(r.bandCodes.join(" / "))}</span>
           </div>
           <div class="text-secondary small">${fmtDate(r.commencementDate)} • ${safe(r.refFrequencyMHz)} MHz</div>
         `;
@@ -1853,30 +5668,7 @@ def build_html(data: List[Dict[str, Any]]) -> str:
           });
         }
 
-        const carrierMap = new Map();
-        clusterGroups.forEach(group => {
-          const carrierKey = group.carrierKey || "unknown";
-          if (!carrierMap.has(carrierKey)) {
-            carrierMap.set(carrierKey, {
-              carrierKey,
-              carrierFriendly: group.carrierFriendly,
-              carrierColor: group.carrierColor,
-              items: []
-            });
-          }
-          carrierMap.get(carrierKey).items.push(...group.items);
-        });
-        const carrierGroups = [...carrierMap.values()].sort((a, b) => {
-          const aLabel = safe(a.carrierFriendly || a.carrierKey);
-          const bLabel = safe(b.carrierFriendly || b.carrierKey);
-          return aLabel.localeCompare(bLabel);
-        });
-        const items = clusterGroups.flatMap(group => group.items);
-        const cluster = {
-          groups: clusterGroups,
-          items,
-          carrierGroups
-        };
+        const cluster = makeCluster(clusterGroups);
         clusterGroups.forEach(group => clusterByGroupKey.set(group.key, cluster));
         clusters.push(cluster);
       }
@@ -1888,6 +5680,55 @@ def build_html(data: List[Dict[str, Any]]) -> str:
       return { clusters, clusterByGroupKey };
     }
 
+    function makeCluster(clusterGroups) {
+      const carrierMap = new Map();
+      clusterGroups.forEach(group => {
+        const carrierKey = group.carrierKey || "unknown";
+        if (!carrierMap.has(carrierKey)) {
+          carrierMap.set(carrierKey, {
+            carrierKey,
+            carrierFriendly: group.carrierFriendly,
+            carrierColor: group.carrierColor,
+            items: []
+          });
+        }
+        carrierMap.get(carrierKey).items.push(...group.items);
+      });
+      const carrierGroups = [...carrierMap.values()].sort((a, b) => {
+        const aLabel = safe(a.carrierFriendly || a.carrierKey);
+        const bLabel = safe(b.carrierFriendly || b.carrierKey);
+        return aLabel.localeCompare(bLabel);
+      });
+      const items = clusterGroups.flatMap(group => group.items);
+      return {
+        groups: clusterGroups,
+        items,
+        carrierGroups
+      };
+    }
+
+    // The clusters rrf.py --clusters-out worked out from all licences, by
+    // licence id; spots it doesn't list are clusters of their own. With
+    // filters on, a cluster keeps the groups that pass (it isn't split where
+    // a filtered-out site joined it, as buildClusters would).
+    function clustersFromSiteIds(groupList) {
+      const clusterByGroupKey = new Map();
+      const clusters = [];
+      const groupsByCluster = new Map();
+      groupList.forEach(group => {
+        const id = SITE_CLUSTERS.get(group.items[0].id);
+        const key = id === undefined ? `${group.lat.toFixed(6)}|${group.lon.toFixed(6)}` : id;
+        if (!groupsByCluster.has(key)) groupsByCluster.set(key, []);
+        groupsByCluster.get(key).push(group);
+      });
+      groupsByCluster.forEach(clusterGroups => {
+        const cluster = makeCluster(clusterGroups);
+        clusterGroups.forEach(group => clusterByGroupKey.set(group.key, cluster));
+        clusters.push(cluster);
+      });
+      return { clusters, clusterByGroupKey };
+    }
+
     function renderActiveFilters(filters, districtLabel) {
       if (!activeFilters) return;
       const labels = [];
@@ -1940,10 +5781,8 @@ def build_html(data: List[Dict[str, Any]]) -> str:
       // Now apply carrier + band selections
       const filtered = baseFiltered.filter(r => {
         const k = r.carrierKey || "unknown";
-        const b = r.bandCode || "unknown";
         if (carrierSelected.size > 0 && !carrierSelected.has(k)) return false;
-        if (bandSelected.size > 0 && !bandSelected.has(b)) return false;
-        return true;
+        return inSelectedBands(r);
       });
 
       /*
@@ -1970,6 +5809,13 @@ def build_html(data: List[Dict[str, Any]]) -> str:
       refreshRecentList();
       // group markers by carrier + coordinate so one marker can represent multiple licences
       markersLayer.clearLayers();
+      if (showingOverview()) {
+        // Zoomed out over map tiles: their per-cell counts stand in for the rows.
+        currentGroups = new Map();
+        renderActiveFilters(f, districtLabel);
+        drawOverview();
+        return;
+      }
       const withCoords = filtered.filter(r => r._hasCoords);
 
       const groups = new Map();
@@ -2002,7 +5848,7 @@ def build_html(data: List[Dict[str, Any]]) -> str:
 
       const groupList = [...groups.values()];
 
-      const { clusterByGroupKey } = buildClusters(groupList);
+      const { clusterByGroupKey } = SITE_CLUSTERS ? clustersFromSiteIds(groupList) : buildClusters(groupList);
       currentClustersByGroupKey = clusterByGroupKey;
 
       groupList.forEach((g) => {
@@ -2067,8 +5913,257 @@ def build_html(data: List[Dict[str, Any]]) -> str:
       refreshImmediate();
     });
 
+    // Rows from shards and detail tiles join DATA as they arrive; the map then
+    // redraws where it is, keeping any nearest-carrier lines.
+    let redrawPending = false;
+    let redrawMs = 0; // how long the last one took
+
+    function redrawWithNewRows() {
+      redrawPending = false;
+      const started = performance.now();
+      const point = nearestLinesPoint;
+      refresh({ preserveView: true });
+      if (point) drawNearestCarrierLines(point.lat, point.lon, { fitView: false });
+      redrawMs = performance.now() - started;
+    }
+
+    function scheduleRedraw() {
+      if (!redrawPending) {
+        redrawPending = true;
+        requestAnimationFrame(redrawWithNewRows);
+      }
+    }
+
+    function addLoadedRows(rows) {
+      rows.forEach(r => {
+        if (carrierKeyFromLicensee(r.licensee) === "uber") return;
+        decorateRecord(r);
+        DATA.push(r);
+      });
+      scheduleRedraw();
+    }
+
+    // The NDJSON stream: rows join DATA as their lines arrive. The map draws
+    // the first batch at once, then with the filters as they are then, at
+    // most every STREAM_REDRAW_MS and never more than a quarter of the time
+    // (a redraw covers every row so far), so drawing doesn't hold up the rest.
+    const STREAM_REDRAW_MS = 250;
+
+    async function streamRows(stream) {
+      let count = 0;
+      let batch = [];
+      let lastDraw = -Infinity;
+      try {
+        for await (const rows of stream.batches()) {
+          rows.forEach(row => batch.push(row));
+          count += rows.length;
+          if (performance.now() - lastDraw >= Math.max(STREAM_REDRAW_MS, 3 * redrawMs)) {
+            addLoadedRows(batch);
+            batch = [];
+            lastDraw = performance.now();
+          }
+        }
+      } catch (err) {
+        console.warn(`${stream.url} broke off after ${count} of ${stream.rows} records: ${err?.message || err}`);
+      }
+      addLoadedRows(batch);
+      if (count === stream.rows) console.info(`Streamed ${count} records from ${stream.url}`);
+    }
+
+    async function fetchPart(url) {
+      // Revalidated each visit; unchanged files come back as 304s.
+      const buffer = await fetchDataBuffer(url, { cache: "no-cache" });
+      return JSON.parse(new TextDecoder().decode(buffer));
+    }
+
+    // District shards: fetched when their box meets the map view (with a
+    // margin) or they hold the selected district, nearest first. Searches
+    // and dates wait for the whole dataset instead (needsAllRows).
+    const shardsRequested = new Set();
+
+    function shardBoxContains(shard, view) {
+      const [south, west, north, east] = shard.bbox;
+      return view.intersects(L.latLngBounds([south, west], [north, east]));
+    }
+
+    function shardDistance(shard, center) {
+      if (!shard.bbox) return Number.MAX_VALUE; // (Infinity - Infinity would upset the sort)
+      const [south, west, north, east] = shard.bbox;
+      return center.distanceTo([(south + north) / 2, (west + east) / 2]);
+    }
+
+    function loadShards() {
+      if (!SHARDS || !partialData) return;
+      const view = map.getBounds().pad(0.25);
+      const district = qDistrict.value;
+      const center = map.getCenter();
+      SHARDS.shards
+        .filter(shard => !shardsRequested.has(shard.key) && (
+          (district && shard.districts.includes(district)) ||
+          (shard.bbox && shardBoxContains(shard, view))
+        ))
+        .sort((a, b) => shardDistance(a, center) - shardDistance(b, center))
+        .forEach(shard => {
+          shardsRequested.add(shard.key);
+          fetchPart(new URL(shard.path, SHARDS.url).href)
+            .then(doc => partialData && addLoadedRows(decodeColumns(doc)))
+            .catch(err => {
+              shardsRequested.delete(shard.key); // tried again on the next move
+              console.warn(`Shard ${shard.path} failed: ${err?.message || err}`);
+            });
+        });
+    }
+
+    // Map tiles: below the detail zoom the map draws the tiles' cells (counts
+    // by licensee and bands) instead of rows; from it on, the rows of the
+    // visible detail tiles join DATA. Cells can't apply the location, district
+    // or date filters, so with any of those set the map shows the rows it has
+    // while the whole dataset loads (see needsAllRows).
+    const tileIndex = new Map(Object.entries(TILES?.tiles || {}).map(([z, keys]) => [Number(z), new Set(keys)]));
+    const detailTilesRequested = new Set();
+    const overviewCells = new Map(); // "z/x/y" -> cells, for the tiles the layer holds
+
+    function showingOverview() {
+      if (!TILES || !partialData || map.getZoom() >= TILES.detailZoom) return false;
+      return !needsAllRows();
+    }
+
+    function loadDetailTile(x, y) {
+      const key = `${x}/${y}`;
+      if (detailTilesRequested.has(key) || !tileIndex.get(TILES.detailZoom)?.has(key)) return Promise.resolve();
+      detailTilesRequested.add(key);
+      return fetchPart(new URL(`${TILES.detailZoom}/${key}.json`, TILES.url).href)
+        .then(doc => partialData && addLoadedRows(decodeColumns(doc)))
+        .catch(err => {
+          detailTilesRequested.delete(key);
+          console.warn(`Tile ${TILES.detailZoom}/${key} failed: ${err?.message || err}`);
+        });
+    }
+
+    async function loadOverviewTile({ x, y, z }) {
+      const key = `${z}/${x}/${y}`;
+      if (!tileIndex.get(z)?.has(`${x}/${y}`)) return;
+      const doc = await fetchPart(new URL(`${key}.json`, TILES.url).href);
+      overviewCells.set(key, doc.cells);
+      scheduleRedraw();
+    }
+
+    function drawOverview() {
+      const zoom = Math.max(TILES.minZoom, Math.min(map.getZoom(), TILES.detailZoom - 1));
+      overviewCells.forEach((cells, key) => {
+        if (!key.startsWith(`${zoom}/`)) return; // tiles of the zoom being left
+        cells.forEach(cell => {
+          const byCarrier = new Map();
+          let total = 0;
+          cell.counts.forEach(([licensee, bandCodes, n]) => {
+            const k = carrierKeyFromLicensee(licensee);
+            if (k === "uber") return;
+            if (carrierSelected.size > 0 && !carrierSelected.has(k)) return;
+            if (!inSelectedBands({ bandCodes })) return;
+            byCarrier.set(k, (byCarrier.get(k) || 0) + n);
+            total += n;
+          });
+          if (!total) return;
+          const carriers = [...byCarrier.entries()].sort((a, b) => b[1] - a[1]);
+          const lines = carriers.map(([k, n]) => `${safe((CARRIERS[k] || CARRIERS.unknown).friendly)}: ${n}`);
+          L.circleMarker([cell.lat, cell.lon], {
+            radius: 6 + 2 * Math.log2(total),
+            color: "#000000",
+            fillColor: (CARRIERS[carriers[0][0]] || CARRIERS.unknown).color,
+            fillOpacity: 0.8,
+            opacity: 1,
+            weight: 2,
+            renderer: markerRenderer
+          })
+            .bindTooltip(`<strong>${total} licence(s)</strong><br>${lines.join("<br>")}`)
+            .on("click", () => map.setView([cell.lat, cell.lon], Math.min(map.getZoom() + 2, TILES.detailZoom)))
+            .addTo(markersLayer);
+        });
+      });
+    }
+
+    // Leaflet only works out which tiles the view needs (over-zooming the
+    // detail tiles) and drops those scrolled away; the tiles draw nothing.
+    const RrfTileLayer = L.GridLayer.extend({
+      createTile(coords, done) {
+        const tile = document.createElement("div");
+        if (!partialData) {
+          done(null, tile); // (the layer is removed once the whole dataset is in)
+          return tile;
+        }
+        const loading = coords.z >= TILES.detailZoom ? loadDetailTile(coords.x, coords.y) : loadOverviewTile(coords);
+        loading.then(() => done(null, tile), err => {
+          console.warn(`Tile ${coords.z}/${coords.x}/${coords.y} failed: ${err?.message || err}`);
+          done(err, tile);
+        });
+        return tile;
+      }
+    });
+    let tileLayer = null;
+    if (TILES) {
+      tileLayer = new RrfTileLayer({
+        tileSize: TILES.tileSize,
+        minNativeZoom: TILES.minZoom,
+        maxNativeZoom: TILES.detailZoom,
+        updateWhenZooming: false,
+      })
+        .on("tileunload", ({ coords }) => {
+          if (overviewCells.delete(`${coords.z}/${coords.x}/${coords.y}`)) scheduleRedraw();
+        })
+        .addTo(map);
+      map.on("zoomend", scheduleRedraw); // cells of another zoom, or rows instead of cells
+    }
+
+    // Tiles and shards only ever hold part of the rows. The whole dataset is
+    // fetched only when a filter needs rows from anywhere (a location search,
+    // dates, or with tiles a district) or the visitor asks for it with "Load
+    // all licences"; otherwise a visit costs what its viewport needs. Once
+    // loaded it replaces them, fills the recent-updates list and the
+    // nearest-carrier lines, and becomes the cached copy later visits patch.
+    let wholeData = null;
+    const wholeDataNote = document.getElementById("wholeDataNote");
+    wholeDataNote?.classList.toggle("d-none", !partialData);
+
+    function needsAllRows() {
+      const f = getFilters();
+      return Boolean(f.locationText || f.commFrom || f.commTo || f.expFrom || f.expTo || (TILES && f.district));
+    }
+
+    function useWholeData({ rows, url }) {
+      partialData = false;
+      wholeDataNote?.classList.add("d-none");
+      DATA = rows.filter(r => carrierKeyFromLicensee(r.licensee) !== "uber");
+      DATA.forEach(decorateRecord);
+      overviewCells.clear();
+      if (tileLayer) tileLayer.remove();
+      console.info(`Loaded ${DATA.length} records from ${url}`);
+      scheduleRedraw();
+    }
+
+    function loadWholeData() {
+      if (!partialData || wholeData) return;
+      wholeData = loadWholeDataset(loaded.cache)
+        .then(useWholeData)
+        .catch(err => {
+          wholeData = null; // tried again on the next filter change
+          console.warn(`Whole dataset unavailable, staying on ${loaded.url}: ${err?.message || err}`);
+        });
+    }
+
+    function loadForView() {
+      if (partialData && needsAllRows()) loadWholeData();
+      loadShards();
+    }
+
+    map.on("moveend", loadForView);
+    document.getElementById("loadAllButton")?.addEventListener("click", loadWholeData);
+    [qDistrict, qCommFrom, qCommTo, qExpFrom, qExpTo].forEach(el => el.addEventListener("change", loadForView));
+    qLocation?.addEventListener("input", loadForView);
+
     renderDetailSelection(null);
-    refresh();
+    refresh({ preserveView: Boolean(initialView) });
+    loadForView();
+    if (STREAM) streamRows(STREAM);
   }
 
   init().catch(err => {
@@ -2180,6 +6275,10 @@ def build_html(data: List[Dict[str, Any]]) -> str:
         <button class="btn btn-sm btn-outline-primary" id="recentUpdateButton" type="button">Update</button>
       </div>
       <div class="list-group" id="recentList"></div>
+      <div class="small text-secondary mt-2 d-none" id="wholeDataNote">
+        Only licences around the map view are loaded.
+        <button class="btn btn-link btn-sm p-0 align-baseline" id="loadAllButton" type="button">Load all licences</button>
+      </div>
     </div>
   </div>
 
@@ -2209,22 +6308,237 @@ def read_json(path: str) -> List[Dict[str, Any]]:
     return obj
 
 
+def iter_json_array(path: str) -> Iterator[Any]:
+    """Elements of the JSON array in `path`, decoded one at a time.
+
+    The file is read a chunk at a time (json_array_items), so neither its
+    text nor the list of parsed rows is ever held whole.
+    """
+    for value, _ in json_array_items(path):
+        yield value
+
+
+def json_array_items(path: str, chunk_size: int = 1 << 20) -> Iterator[Tuple[Any, str]]:
+    """(value, text) for each element of the JSON array in `path`.
+
+    Reads `chunk_size` characters at a time; an element that runs past the
+    end of the buffer is decoded again once more text has been read.
+    """
+    decoder = json.JSONDecoder()
+    ws = re.compile(r"[ \t\n\r]*")
+    with open(path, "r", encoding="utf-8") as f:
+        buf, pos = "", 0
+
+        def fill() -> bool:
+            nonlocal buf, pos
+            more = f.read(chunk_size)
+            if not more:
+                return False
+            buf, pos = buf[pos:] + more, 0
+            return True
+
+        def peek() -> str:
+            nonlocal pos
+            while True:
+                pos = ws.match(buf, pos).end()
+                if pos < len(buf) or not fill():
+                    return buf[pos : pos + 1]
+
+        if peek() != "[":
+            raise ValueError(f"Expected a JSON array in {path}")
+        pos += 1
+        if peek() == "]":
+            return
+        while True:
+            while True:
+                try:
+                    value, end = decoder.raw_decode(buf, pos)
+                except json.JSONDecodeError:
+                    if not fill():
+                        raise
+                    continue
+                # A number cut off by the buffer ("1.5" of "1.5e3") decodes too,
+                # so an element only counts as whole once its separator is in.
+                after = ws.match(buf, end).end()
+                if buf[after : after + 1] in (",", "]") or not fill():
+                    break
+            yield value, buf[pos:end]
+            pos = end
+            sep = peek()
+            pos += 1
+            if sep == "]":
+                return
+            if sep != ",":
+                raise ValueError(f"Malformed JSON array in {path}")
+            peek()
+
+
+def read_table(path: str) -> LicenceTable:
+    """A normalised JSON file (e.g. rrf_licences.json) as a LicenceTable."""
+    return LicenceTable.from_rows(iter_json_array(path))
+
+
+def render_row(row: Dict[str, Any]) -> str:
+    """One row as it appears inside write_json_array's output."""
+    # JSON strings never contain raw newlines, so this only re-indents.
+    return json.dumps(row, ensure_ascii=False, indent=2).replace("\n", "\n  ")
+
+
+def write_json_array(path: str, rows: Iterable[Any]) -> int:
+    """Streams `rows` to `path` as a JSON array and returns the row count.
+
+    Output is byte-identical to json.dump(rows, f, ensure_ascii=False, indent=2).
+    Rows may also come pre-rendered, as render_row() strings. The file is
+    written to `<path>.tmp` and renamed into place once complete, so readers
+    never see a partial file.
+    """
+    tmp = f"{path}.tmp"
+    count = 0
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            for row in rows:
+                f.write("[\n  " if count == 0 else ",\n  ")
+                f.write(row if isinstance(row, str) else render_row(row))
+                count += 1
+            f.write("\n]" if count else "[]")
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+    return count
+
+
+def write_text_file(path: str, text: str) -> None:
+    """Writes `path` via `<path>.tmp` and a rename, creating its directory."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+
+PRECOMPRESS_CHUNK = 1 << 20
+
+# Brotli quality for the .br siblings. 11 runs at under 1 MB/s, which is
+# minutes over the data files, tiles and shards; 9 is ~60x faster for ~15%
+# more bytes. 11 is kept for the page and manifests: small, and fetched first.
+BROTLI_QUALITY = 9
+BROTLI_QUALITY_SMALL = 11
+
+
+def _gzip_into(src: Any, dst: Any) -> None:
+    # Same bytes as gzip.compress(data, 9, mtime=0), which wraps zlib the same way.
+    compressor = zlib.compressobj(9, zlib.DEFLATED, 31)
+    for chunk in iter(lambda: src.read(PRECOMPRESS_CHUNK), b""):
+        dst.write(compressor.compress(chunk))
+    dst.write(compressor.flush())
+
+
+def _brotli_into(src: Any, dst: Any, quality: int = BROTLI_QUALITY) -> None:
+    compressor = brotli.Compressor(quality=quality)
+    for chunk in iter(lambda: src.read(PRECOMPRESS_CHUNK), b""):
+        dst.write(compressor.process(chunk))
+    dst.write(compressor.finish())
+
+
+def write_precompressed(
+    path: str, enabled: bool = True, brotli_quality: int = BROTLI_QUALITY
+) -> List[str]:
+    """Writes `<path>.gz`, and `<path>.br` when brotli is importable; returns what changed.
+
+    Both are deterministic (gzip: no file name, mtime 0), and a sibling whose
+    bytes would not change is left alone, so unchanged data never shows up as
+    a change. A sibling that can no longer be written (disabled, or no brotli)
+    is removed rather than left stale, since the page prefers it. Files are
+    compressed a chunk at a time, so memory stays flat however big `path` is.
+    Any fixed `brotli_quality` is deterministic; see BROTLI_QUALITY.
+    """
+    siblings: Dict[str, Optional[Callable[[Any, Any], None]]] = {
+        ".gz": _gzip_into if enabled else None,
+        ".br": (
+            (lambda src, dst: _brotli_into(src, dst, brotli_quality))
+            if enabled and brotli is not None
+            else None
+        ),
+    }
+    changed = []
+    for suffix, compress in siblings.items():
+        target = path + suffix
+        if compress is None:
+            if os.path.exists(target):
+                os.remove(target)
+                changed.append(target)
+            continue
+        tmp = f"{target}.tmp"
+        with open(path, "rb") as src, open(tmp, "wb") as dst:
+            compress(src, dst)
+        if os.path.exists(target) and filecmp.cmp(tmp, target, shallow=False):
+            os.remove(tmp)
+            continue
+        os.replace(tmp, target)
+        changed.append(target)
+    return changed
+
+
+def page_size_arg(value: str) -> int:
+    """argparse type for --page-size: a positive int, or 'auto' (returned as 0)."""
+    if value.strip().lower() == "auto":
+        return 0
+    size = int(value)
+    if size <= 0:
+        raise argparse.ArgumentTypeError("page size must be positive or 'auto'")
+    return size
+
+
 def main() -> int:
     ap = argparse.ArgumentParser()
 
     ap.add_argument(
         "--page-size",
-        type=int,
+        type=page_size_arg,
         default=5000,
-        help="Items per page (try 200; server may cap)",
+        help="Items per page, or 'auto' to probe the server cap and pick the fastest size",
     )
     ap.add_argument(
         "--max-pages", type=int, default=0, help="0 = all pages; else limit for testing"
     )
     ap.add_argument("--sleep", type=float, default=0.0, help="Sleep between page requests (seconds)")
-    ap.add_argument("--licence-type", type=int, default=178, help="licenceType filter (default 178)")
+    ap.add_argument(
+        "--api-url",
+        default=API_URL,
+        help="Licence search endpoint (default: $RRF_API_URL or the public RRF API)",
+    )
+    ap.add_argument("--retries", type=int, default=5, help="Attempts per page for transient errors (default 5)")
+    ap.add_argument(
+        "--max-consecutive-failures",
+        type=int,
+        default=10,
+        help="Abort the fetch after this many failed requests in a row across all pages and licence types (0 = never)",
+    )
+    ap.add_argument(
+        "--concurrency",
+        type=int,
+        default=1,
+        help="Pages fetched in parallel after page 1, per licence type (default 1 = sequential)",
+    )
+    ap.add_argument(
+        "--licence-type",
+        type=int,
+        nargs="+",
+        default=[178],
+        help="licenceType filter(s) (default 178); several types are fetched concurrently and merged by id",
+    )
     ap.add_argument("--order-by", default="id desc", help="orderBy")
     ap.add_argument("--suppressed", action="store_true", help="Set suppressed=true (default false)")
+    ap.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only fetch pages until one holds no new/changed ids, then merge into existing --json-out "
+        "(sequential; not with --concurrency)",
+    )
 
     # HTML-only is the default. Use --fetch to run the API call.
     mode = ap.add_mutually_exclusive_group()
@@ -2238,6 +6552,46 @@ def main() -> int:
         action="store_true",
         help="Fetch API data and regenerate JSON + HTML",
     )
+    mode.add_argument(
+        "--from-raw",
+        action="store_true",
+        help="Regenerate JSON + HTML from pages in --raw-dir (no API calls)",
+    )
+    ap.add_argument(
+        "--raw-dir",
+        default=".rrf_raw",
+        help="Where raw API pages are stored while fetching ('' disables; default: ./.rrf_raw)",
+    )
+    ap.add_argument(
+        "--resume",
+        action="store_true",
+        help="With --fetch, continue an interrupted fetch from the pages it left in --raw-dir",
+    )
+    ap.add_argument(
+        "--transform",
+        choices=TRANSFORM_MODES,
+        default="auto",
+        help="Coordinate transforms: pyproj, the built-in NZTM2000/NZGD49 formulas, "
+        "or auto (pyproj when installed; default)",
+    )
+    ap.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Processes used to normalise records (default 1 = in-process); output is identical",
+    )
+    ap.add_argument(
+        "--geo-cache",
+        default="auto",
+        help="Cache reprojected coordinates, kept between runs in this file ('' disables; default auto: "
+        f"./{DEFAULT_GEO_CACHE} with the built-in transforms, off with pyproj, where it doesn't pay)",
+    )
+    ap.add_argument(
+        "--geo-cache-size",
+        type=int,
+        default=200000,
+        help="Most coordinates the geo cache holds, least recently used dropped first (default 200000)",
+    )
     ap.add_argument(
         "--json-in",
         default="rrf_licences.json",
@@ -2253,61 +6607,353 @@ def main() -> int:
         default="rrf_licences.json",
         help="JSON output path when fetching (default: ./rrf_licences.json)",
     )
+    ap.add_argument(
+        "--columnar-out",
+        default="",
+        help="Also write the rows in the columnar format the page loads first "
+        "(e.g. rrf_licences.columns.json; default: off)",
+    )
+    ap.add_argument(
+        "--binary-out",
+        default="",
+        help="Also write the rows as the typed-array dataset the page loads first "
+        "(e.g. rrf_licences.bin; default: off)",
+    )
+    ap.add_argument(
+        "--shard-dir",
+        default="",
+        help="Also write the rows split by district, which the page loads for the map view only "
+        "(e.g. rrf_shards; default: off)",
+    )
+    ap.add_argument(
+        "--tile-dir",
+        default="",
+        help="Also write a z/x/y tile pyramid: counts per cell when zoomed out, rows when zoomed in; "
+        "the page then loads only the visible tiles (e.g. rrf_tiles; default: off)",
+    )
+    ap.add_argument(
+        "--clusters-out",
+        default="",
+        help="Also write the site clusters of all licences, which the page reuses instead of "
+        "clustering markers itself (e.g. rrf_clusters.json; default: off)",
+    )
+    ap.add_argument(
+        "--ndjson-out",
+        default="",
+        help="Also write the rows as newline-delimited JSON, busiest regions first, which the "
+        "page draws while it downloads (e.g. rrf_licences.ndjson; default: off)",
+    )
+    ap.add_argument(
+        "--sqlite-out",
+        default="",
+        help="Also upsert the licences into this SQLite database, one snapshot per run, with "
+        "spatial, full-text and field indexes for ad-hoc queries (e.g. rrf_licences.sqlite; default: off)",
+    )
+    ap.add_argument(
+        "--no-reuse",
+        action="store_true",
+        help="Normalise every record, instead of reusing the rows of the previous --json-out for "
+        "licences whose raw record hasn't changed",
+    )
+    ap.add_argument(
+        "--no-precompress",
+        action="store_true",
+        help="Don't write .gz/.br siblings of the HTML and data files (existing ones are removed)",
+    )
+    ap.add_argument(
+        "--delta-dir",
+        default="",
+        help="Also write a delta manifest and patch from the previous --json-out here "
+        "(e.g. rrf_delta; default: off)",
+    )
+    ap.add_argument(
+        "--delta-keep",
+        type=int,
+        default=30,
+        help="Deltas listed in the manifest, newest first; older ones are deleted (default 30)",
+    )
 
     args = ap.parse_args()
 
-    html_only = args.html_only or not args.fetch
+    if args.fetch and args.incremental and args.concurrency > 1:
+        print(
+            "ERROR: --incremental fetches one page at a time (each decides whether there is a next); "
+            "drop --concurrency",
+            file=sys.stderr,
+        )
+        return 2
+
+    html_only = args.html_only or not (args.fetch or args.from_raw)
 
     # HTML-only fast path
     if html_only:
+        # The page loads the rows at runtime; they are only counted (one at a
+        # time) to check --json-in is there and well-formed.
         try:
-            data = read_json(args.json_in)
+            count = sum(1 for _ in iter_json_array(args.json_in))
         except Exception as e:
             print(f"ERROR: --html-only failed to read {args.json_in}: {e}", file=sys.stderr)
             return 2
 
-        html = build_html(data)
+        html = build_html()
         with open(args.html_out, "w", encoding="utf-8") as f:
             f.write(html)
+        write_precompressed(args.html_out, not args.no_precompress, BROTLI_QUALITY_SMALL)
 
-        print(f"Read {args.json_in} ({len(data)} records)")
+        print(f"Read {args.json_in} ({count} records)")
         print(f"Wrote {args.html_out}")
         print("Tip: if Playwright/browser-container shows a generic 'Not Found' on port 8000, serve this folder on another port such as 4173.")
         return 0
 
     # Normal fetch path
+    json_dir = os.path.abspath(os.path.dirname(args.json_out) or ".")
+    if args.shard_dir and os.path.abspath(args.shard_dir) == json_dir:
+        print(
+            f"ERROR: --shard-dir {args.shard_dir} also holds --json-out; give the shards a directory of their own",
+            file=sys.stderr,
+        )
+        return 2
+    # Each of these writes its own manifest.json.
+    out_dirs = [
+        (flag, d)
+        for flag, d in (("--shard-dir", args.shard_dir), ("--tile-dir", args.tile_dir), ("--delta-dir", args.delta_dir))
+        if d
+    ]
+    for i, (flag, d) in enumerate(out_dirs):
+        for other_flag, other in out_dirs[i + 1 :]:
+            if os.path.abspath(d) == os.path.abspath(other):
+                print(f"ERROR: {flag} and {other_flag} must be different directories", file=sys.stderr)
+                return 2
+
     base_payload: Dict[str, Any] = {
         "searchText": "",
         "suppressed": bool(args.suppressed),
         "mapVisible": "false",
         "displayGeorefType": "T",
         "orderBy": args.order_by,
-        "licenceType": [args.licence_type],
+        "licenceType": list(args.licence_type),
         "isSearchVisible": "true",
         "isRelevanceSort": "false",
     }
 
-    raw = fetch_all(
-        base_payload=base_payload,
-        page_size=args.page_size,
-        max_pages=args.max_pages,
-        sleep_between=args.sleep,
-    )
+    policy = RetryPolicy(retries=args.retries, max_consecutive_failures=args.max_consecutive_failures)
+    # One breaker for every licence type: an outage trips it once, not per type.
+    breaker = CircuitBreaker(policy.max_consecutive_failures)
 
-    normalised = normalise_records(raw)
+    existing: Optional[LicenceTable] = None
+    if args.incremental and not args.from_raw:
+        try:
+            existing = read_table(args.json_out)
+        except Exception as e:
+            print(f"NOTE: --incremental could not read {args.json_out} ({e}); doing a full fetch.")
+
+    # One query per licence type; a single type keeps the original payload.
+    licence_types: List[int] = list(dict.fromkeys(args.licence_type))
+    type_payloads = [dict(base_payload, licenceType=[t]) for t in licence_types]
+    id_desc = args.order_by.strip().lower() == "id desc"
+    multi = len(type_payloads) > 1
+
+    engine = resolve_transform_mode(args.transform)
+    geo_cache_path = args.geo_cache
+    if geo_cache_path == "auto":
+        geo_cache_path = DEFAULT_GEO_CACHE if engine == "builtin" else ""
+    geo_cache: Optional[TransformCache] = None
+    if geo_cache_path:
+        geo_cache = TransformCache(args.geo_cache_size)
+        geo_cache.load(geo_cache_path)
+
+    # Rows of the previous output can stand in for unchanged licences when
+    # this normaliser wrote it and the records arrive in id order. A full run
+    # records each row's record digest for the next one to match against.
+    tag = normaliser_tag(engine)
+    stamped = rows_stamp_matches(args.json_out, tag)
+    previous: Optional[PreviousRows] = None
+    if stamped and id_desc and not args.no_reuse and existing is None:
+        previous = PreviousRows(args.json_out)
+    digests = RowDigestWriter(args.json_out) if existing is None else None
+
+    def normalise_stream(records: Iterable[Dict[str, Any]]) -> Iterator[Any]:
+        return iter_normalised(
+            records,
+            cache=geo_cache,
+            mode=args.transform,
+            workers=args.workers,
+            render=True,
+            previous=previous,
+            digests=digests,
+        )
 
-    with open(args.json_out, "w", encoding="utf-8") as f:
-        json.dump(normalised, f, ensure_ascii=False, indent=2)
+    rows: Iterable[Any]
+    if args.from_raw:
+        if not args.raw_dir:
+            print("ERROR: --from-raw needs --raw-dir", file=sys.stderr)
+            return 2
+        try:
+            streams = [
+                iter_records(
+                    open_raw_pages(
+                        RawPageStore(args.raw_dir, dict(tp, pageSize=args.page_size or "auto")),
+                        args.max_pages,
+                    )
+                )
+                for tp in type_payloads
+            ]
+        except Exception as e:
+            print(f"ERROR: --from-raw failed: {e}", file=sys.stderr)
+            return 2
+        rows = normalise_stream(merge_type_records(streams, id_desc) if multi else streams[0])
+    elif existing is not None:
+        known = {r.get("id"): r.get("lastUpdatedDate") for r in existing}
+
+        def fetch_changed(tp: Dict[str, Any]) -> List[Dict[str, Any]]:
+            return fetch_until_known(
+                base_payload=tp,
+                # Incremental runs usually stop on page 1-2, so small pages win.
+                page_size=args.page_size or AUTO_PAGE_SIZES[0],
+                known=known,
+                max_pages=args.max_pages,
+                sleep_between=args.sleep,
+                policy=policy,
+                api_url=args.api_url,
+                log_prefix=f"[type {tp['licenceType'][0]}] " if multi else "",
+                breaker=breaker,
+            )
 
-    html = build_html(normalised)
+        with ThreadPoolExecutor(max_workers=len(type_payloads)) as pool:
+            changed = list(pool.map(fetch_changed, type_payloads))
+        updates = normalise_records(
+            list(merge_type_records(changed, id_desc)),
+            cache=geo_cache,
+            mode=args.transform,
+            workers=args.workers,
+        )
+        rows = merge_records(existing, updates)
+        print(f"Incremental: {len(updates)} new/changed record(s) merged into {len(existing)} existing")
+    else:
+        def type_pages(tp: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+            pages = iter_pages(
+                base_payload=tp,
+                page_size=args.page_size,
+                max_pages=args.max_pages,
+                sleep_between=args.sleep,
+                concurrency=args.concurrency,
+                raw_dir=args.raw_dir or None,
+                resume=args.resume,
+                policy=policy,
+                api_url=args.api_url,
+                log_prefix=f"[type {tp['licenceType'][0]}] " if multi else "",
+                # A worker thread moves on before this thread reads a page.
+                lazy=not multi,
+                breaker=breaker,
+            )
+            # With several types, each result set downloads on its own thread.
+            return iter_in_background(pages) if multi else pages
+
+        # Pages stream straight through normalisation into the JSON writer.
+        streams = [iter_records(type_pages(tp)) for tp in type_payloads]
+        rows = normalise_stream(merge_type_records(streams, id_desc) if multi else streams[0])
+
+    # Digest the previous output before it is replaced, for the delta patch.
+    before = snapshot_rows(args.json_out) if args.delta_dir else None
+    try:
+        count = write_json_array(args.json_out, rows)
+    except BaseException:
+        if digests is not None:
+            digests.discard()
+        raise
+    # An incremental run merges rows without their records' digests, so the
+    # next run normalises everything again.
+    if digests is not None:
+        digests.commit()
+    write_rows_stamp(args.json_out, tag if digests is not None else None)
+    delta = None
+    if args.delta_dir:
+        delta = write_delta(args.delta_dir, args.json_out, count, before, args.delta_keep)
+    columnar_bytes = binary_bytes = ndjson_bytes = 0
+    shards: Optional[Dict[str, Any]] = None
+    tiles: Optional[Dict[str, Any]] = None
+    clusters: Optional[Dict[str, Any]] = None
+    if args.columnar_out or args.binary_out or args.ndjson_out or args.shard_dir or args.tile_dir or args.clusters_out:
+        # These outputs need every row at once (whole columns, or rows grouped
+        # by place), so unlike the JSON above their peak memory grows with the
+        # data: the file is read back once as a LicenceTable, the compact form.
+        table, version = read_table(args.json_out), file_version(args.json_out)
+        if args.columnar_out:
+            columnar_bytes = write_columnar(args.columnar_out, table, version)
+        if args.binary_out:
+            binary_bytes = write_binary(args.binary_out, table, version)
+        if args.ndjson_out:
+            ndjson_bytes = write_ndjson(args.ndjson_out, table, version)
+        if args.shard_dir:
+            shards = write_shards(args.shard_dir, table, version, not args.no_precompress)
+        if args.tile_dir:
+            tiles = write_tiles(args.tile_dir, table, version, not args.no_precompress)
+        if args.clusters_out:
+            clusters = write_clusters(args.clusters_out, table, version)
+        del table
+    sqlite: Optional[Dict[str, Any]] = None
+    if args.sqlite_out:
+        sqlite = write_sqlite(args.sqlite_out, args.json_out, file_version(args.json_out))
+
+    html = build_html()
     with open(args.html_out, "w", encoding="utf-8") as f:
         f.write(html)
 
-    print(f"\nWrote {args.json_out} ({len(normalised)} records)")
+    artifacts = [
+        p
+        for p in (args.json_out, args.columnar_out, args.binary_out, args.ndjson_out, args.clusters_out, args.html_out)
+        if p
+    ]
+    precompressed = [
+        out
+        for p in artifacts
+        for out in write_precompressed(
+            p,
+            not args.no_precompress,
+            BROTLI_QUALITY_SMALL if p == args.html_out else BROTLI_QUALITY,
+        )
+    ]
+
+    if geo_cache is not None and geo_cache.misses:
+        geo_cache.save(geo_cache_path)
+
+    print(f"\nWrote {args.json_out} ({count} records)")
+    if previous is not None and not previous.stopped:
+        print(previous.summary())
+    if args.columnar_out:
+        print(f"Wrote {args.columnar_out} ({columnar_bytes} bytes)")
+    if args.binary_out:
+        print(f"Wrote {args.binary_out} ({binary_bytes} bytes)")
+    if args.ndjson_out:
+        print(f"Wrote {args.ndjson_out} ({ndjson_bytes} bytes)")
+    if shards is not None:
+        print(f"Wrote {len(shards['shards'])} district shard(s) to {args.shard_dir}")
+    if clusters is not None:
+        print(f"Wrote {args.clusters_out} ({len(clusters['clusters'])} multi-spot site clusters)")
+    if sqlite is not None:
+        print(
+            f"Upserted {sqlite['rows']} licence(s) into {args.sqlite_out} as snapshot {sqlite['snapshot']}: "
+            f"{sqlite['added']} added, {sqlite['changed']} changed, {sqlite['removed']} gone"
+        )
+    if tiles is not None:
+        count_tiles = sum(len(t) for t in tiles["tiles"].values())
+        print(f"Wrote {count_tiles} tile(s), zoom {TILE_MIN_ZOOM}-{TILE_DETAIL_ZOOM}, to {args.tile_dir}")
+    if not args.no_precompress:
+        kinds = ".gz/.br" if brotli is not None else ".gz (pip install brotli for .br)"
+        print(f"Precompressed {len(artifacts)} file(s) as {kinds}; {len(precompressed)} changed")
     print(f"Wrote {args.html_out}")
+    if delta is not None:
+        print(
+            f"Delta {delta['from']} -> {delta['to']}: {delta['added']} added, {delta['changed']} changed, "
+            f"{delta['removed']} removed ({delta['bytes']} bytes) in {args.delta_dir}"
+        )
+    if geo_cache is not None:
+        print(geo_cache.summary())
 
-    if Transformer is None:
+    if engine == "none":
         print("\nNOTE: pyproj not installed, so TM2000-only records won't map. Install with: pip install pyproj")
+    elif engine == "builtin" and args.transform == "auto":
+        print("\nNOTE: pyproj not installed; coordinates used the built-in transforms (--transform builtin)")
 
     return 0
 
@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+"""Local stand-in for the RRF licence search API (offline fetch benchmarking).
+
+Serves POST /api/public_search/licence with the same paging shape as the
+real endpoint (page, pageSize -> results, totalPages, totalItems), from
+either synthetic licences or pages recorded by `rrf.py --fetch` (.rrf_raw).
+
+Run:
+  python rrf_stub.py --port 8765 --items 50000
+  python rrf_stub.py --raw-dir .rrf_raw          # replay a recorded fetch
+  python rrf_stub.py --latency 0.2 --error-rate 0.05 --error-statuses 429,503
+
+Then point the scraper at it:
+  RRF_API_URL=http://127.0.0.1:8765/api/public_search/licence python rrf.py --fetch
+  python rrf.py --fetch --api-url http://127.0.0.1:8765/api/public_search/licence
+"""
+
+from __future__ import annotations
+
+import argparse
+import glob
+import gzip
+import json
+import os
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+
+API_PATH = "/api/public_search/licence"
+
+
+# ---- Synthetic data ------------------------------------------------------------
+# Rough NZTM2000 centres for the districts the real data uses.
+DISTRICT_CENTRES = {
+    "NL": (1690000, 6060000),
+    "AK": (1757000, 5920000),
+    "WK": (1800000, 5815000),
+    "BP": (1880000, 5825000),
+    "GS": (2038000, 5712000),
+    "TK": (1695000, 5676000),
+    "TP": (1860000, 5710000),
+    "HB": (1935000, 5620000),
+    "MW": (1820000, 5535000),
+    "WN": (1749000, 5428000),
+    "MB": (1680000, 5405000),
+    "NT": (1620000, 5430000),
+    "WC": (1460000, 5290000),
+    "CB": (1570000, 5180000),
+    "OT": (1405000, 4915000),
+    "SL": (1240000, 4850000),
+}
+
+LICENSEES = [
+    "SPARK NEW ZEALAND TRADING LIMITED",
+    "TWO DEGREES MOBILE LIMITED",
+    "ONE NEW ZEALAND GROUP LIMITED",
+    "RURAL CONNECTIVITY GROUP LIMITED",
+    "TŪ ĀTEA LIMITED",
+]
+
+# (refFrequency, bandwidth) pairs in MHz, spread across the BAND_DEFS bands.
+CARRIERS = [
+    (758.0, 10.0), (778.0, 10.0), (881.5, 5.0), (887.0, 5.0), (947.5, 5.0),
+    (1815.0, 15.0), (1860.0, 20.0), (2135.0, 15.0), (2350.0, 20.0),
+    (2650.0, 20.0), (3450.0, 60.0), (3650.0, 80.0), (26000.0, 400.0),
+]
+
+
+def synthetic_records(count: int, licence_type: int = 178, seed: int = 1) -> List[Dict[str, Any]]:
+    """`count` raw-API-shaped licences, newest id first.
+
+    Licences share sites (about 8 per site) and geo-references come in the
+    same TM2000/D2000 mix as the real feed, so normalisation and the
+    coordinate caches see realistic repetition.
+    """
+    rnd = random.Random(seed * 1000003 + licence_type)
+    districts = list(DISTRICT_CENTRES)
+    sites = []
+    for s in range(max(1, count // 8)):
+        code = rnd.choice(districts)
+        ce, cn = DISTRICT_CENTRES[code]
+        e = ce + rnd.gauss(0, 25000)
+        n = cn + rnd.gauss(0, 25000)
+        sites.append((f"SITE {s} {code}", code, round(e), round(n)))
+
+    base_id = licence_type * 1_000_000
+    out: List[Dict[str, Any]] = []
+    for i in range(count):
+        name, code, e, n = sites[rnd.randrange(len(sites))]
+        ref, bw = rnd.choice(CARRIERS)
+        kind = rnd.random()
+        geo = [{"type": "TM2000", "easting": e, "northing": n}]
+        if kind < 0.15:
+            # Degrees stored as easting=lon / northing=lat, like the real D2000 refs.
+            lon = 173.0 + (e - 1600000) / 80000.0
+            lat = -(10000000 - n) / 111000.0
+            geo.insert(0, {"type": "D2000", "easting": round(lon, 6), "northing": round(lat, 6)})
+        year = 2005 + rnd.randrange(20)
+        out.append(
+            {
+                "id": base_id + count - i,
+                "licenceNo": str(200000 + i),
+                "licensee": rnd.choice(LICENSEES),
+                "location": name,
+                "locationDistrictCodes": [code],
+                "refFrequency": ref,
+                "lowerBound": ref - bw / 2,
+                "upperBound": ref + bw / 2,
+                "power": f"{rnd.randrange(30, 65)}.0 dBW eirp",
+                "configType": "RCV" if rnd.random() < 0.05 else "TRN",
+                "licenceTypeCode": "H1",
+                "licenceTypeDescription": "Cellular Telephone",
+                "licenceStatus": "Current",
+                "suppressed": False,
+                "commencementDate": f"{year}-{rnd.randrange(1, 13):02d}-01T00:00:00",
+                "expiryDate": f"{year + 20}-{rnd.randrange(1, 13):02d}-01",
+                "certificationDate": f"{year}-01-15T00:00:00",
+                "lastUpdatedDate": f"{year + 1}-06-{rnd.randrange(1, 29):02d}T09:30:00",
+                "locationGeoReferences": geo,
+            }
+        )
+    return out
+
+
+def recorded_records(path: str) -> List[Dict[str, Any]]:
+    """Records from a raw page store directory (one query) or a JSON file.
+
+    A JSON file may hold an array of raw records or a single API page.
+    """
+    if os.path.isdir(path):
+        pages = sorted(glob.glob(os.path.join(path, "page-*.json.gz")))
+        if not pages:
+            # A --raw-dir root: use the first (only) query directory in it.
+            pages = sorted(glob.glob(os.path.join(path, "*", "page-*.json.gz")))
+        out: List[Dict[str, Any]] = []
+        for p in pages:
+            with gzip.open(p, "rt", encoding="utf-8") as f:
+                out.extend(json.load(f).get("results") or [])
+        return out
+    with open(path, "r", encoding="utf-8") as f:
+        obj = json.load(f)
+    return obj.get("results", []) if isinstance(obj, dict) else obj
+
+
+# ---- Server ----------------------------------------------------------------------
+
+
+class StubConfig:
+    def __init__(
+        self,
+        records: Optional[List[Dict[str, Any]]],
+        items: int,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        error_statuses: Tuple[int, ...] = (500,),
+        retry_after: Optional[float] = None,
+        max_page_size: int = 0,
+        seed: int = 1,
+        compress: bool = True,
+    ) -> None:
+        self.records = records
+        self.items = items
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_statuses = error_statuses
+        self.retry_after = retry_after
+        self.max_page_size = max_page_size
+        self.seed = seed
+        self.compress = compress
+        self.rng = random.Random(seed)
+        self._by_type: Dict[int, List[Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+        self.requests = 0
+
+    def dataset(self, licence_types: List[int]) -> List[Dict[str, Any]]:
+        if self.records is not None:
+            return self.records
+        with self._lock:
+            out: List[Dict[str, Any]] = []
+            for t in licence_types or [178]:
+                if t not in self._by_type:
+                    self._by_type[t] = synthetic_records(self.items, t, self.seed)
+                out.extend(self._by_type[t])
+        return out
+
+
+def make_handler(cfg: StubConfig) -> type:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, fmt: str, *args: Any) -> None:
+            pass
+
+        def _send(self, status: int, body: bytes, headers: Optional[Dict[str, str]] = None) -> None:
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            for k, v in (headers or {}).items():
+                self.send_header(k, v)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_POST(self) -> None:
+            length = int(self.headers.get("Content-Length") or 0)
+            raw = self.rfile.read(length)
+            if self.path.split("?")[0] != API_PATH:
+                self._send(404, b'{"error":"not found"}')
+                return
+            try:
+                payload = json.loads(raw or b"{}")
+            except ValueError:
+                self._send(400, b'{"error":"bad json"}')
+                return
+
+            with cfg._lock:
+                cfg.requests += 1
+                delay = cfg.latency + (cfg.rng.uniform(0, cfg.jitter) if cfg.jitter else 0.0)
+                fail = cfg.error_rate > 0 and cfg.rng.random() < cfg.error_rate
+                status = cfg.rng.choice(cfg.error_statuses) if fail else 200
+            if delay > 0:
+                time.sleep(delay)
+            if fail:
+                headers = {}
+                if status in (429, 503) and cfg.retry_after is not None:
+                    headers["Retry-After"] = f"{cfg.retry_after:g}"
+                self._send(status, json.dumps({"error": f"injected {status}"}).encode(), headers)
+                return
+
+            page = max(1, int(payload.get("page") or 1))
+            page_size = max(1, int(payload.get("pageSize") or 20))
+            if cfg.max_page_size:
+                page_size = min(page_size, cfg.max_page_size)
+            types = [int(t) for t in payload.get("licenceType") or []]
+            data = cfg.dataset(types)
+            total = len(data)
+            start = (page - 1) * page_size
+            body = json.dumps(
+                {
+                    "results": data[start : start + page_size],
+                    "page": page,
+                    "pageSize": page_size,
+                    "totalPages": max(1, -(-total // page_size)),
+                    "totalItems": total,
+                },
+                ensure_ascii=False,
+            ).encode("utf-8")
+            headers = {}
+            if cfg.compress and "gzip" in (self.headers.get("Accept-Encoding") or ""):
+                body = gzip.compress(body, compresslevel=6, mtime=0)
+                headers["Content-Encoding"] = "gzip"
+            self._send(200, body, headers)
+
+    return Handler
+
+
+def serve(cfg: StubConfig, host: str = "127.0.0.1", port: int = 8765) -> ThreadingHTTPServer:
+    """Starts the stub on a background thread and returns the server (port 0 = any)."""
+    server = ThreadingHTTPServer((host, port), make_handler(cfg))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--items", type=int, default=20000, help="Synthetic licences per licence type")
+    ap.add_argument(
+        "--raw-dir",
+        default="",
+        help="Replay recorded pages (a .rrf_raw query dir) or a JSON file of raw records",
+    )
+    ap.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response")
+    ap.add_argument("--jitter", type=float, default=0.0, help="Extra random latency, 0..N seconds")
+    ap.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests that fail")
+    ap.add_argument(
+        "--error-statuses",
+        default="500",
+        help="Comma-separated statuses used for injected failures (e.g. 401,429,503)",
+    )
+    ap.add_argument("--retry-after", type=float, default=None, help="Retry-After seconds on 429/503")
+    ap.add_argument("--max-page-size", type=int, default=0, help="Cap pageSize like a real server (0 = none)")
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--no-gzip", action="store_true", help="Never gzip responses")
+    args = ap.parse_args()
+
+    records = recorded_records(args.raw_dir) if args.raw_dir else None
+    cfg = StubConfig(
+        records=records,
+        items=args.items,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        error_statuses=tuple(int(s) for s in args.error_statuses.split(",") if s.strip()),
+        retry_after=args.retry_after,
+        max_page_size=args.max_page_size,
+        seed=args.seed,
+        compress=not args.no_gzip,
+    )
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(cfg))
+    server.daemon_threads = True
+    source = f"{len(records)} recorded records" if records is not None else f"{args.items} synthetic/type"
+    print(f"Serving {source} on http://{args.host}:{args.port}{API_PATH}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())